@@ -0,0 +1,107 @@
+"""
+Benchmark: per-iteration latency of running generated chart code.
+
+Compares
+  - cold exec:     a fresh interpreter importing pandas/matplotlib, loading the CSV and
+                   running the code (the first `exec` of a new kernel);
+  - in-process:    `exec(code, {"df": df})` again in an already warm process (later iterations);
+  - sandbox:       ChartSandbox.run on a preloaded, warmed worker;
+and checks that hung code (`while True: pass`) comes back as a timeout error and the
+pool keeps working afterwards.
+
+Usage (from this folder):
+    python bench_chart_sandbox.py
+    python bench_chart_sandbox.py --runs 20 --workers 2 --dpi 300
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from chart_sandbox import ChartSandbox
+
+CHART_CODE = """
+import matplotlib.pyplot as plt
+q1 = df[(df["quarter"] == 1) & (df["year"].isin([2024, 2025]))]
+sales = q1.groupby(["coffee_name", "year"])["price"].sum().unstack(fill_value=0)
+ax = sales.plot(kind="bar", figsize=(10, 6))
+ax.set_title("Q1 coffee sales: 2024 vs 2025")
+ax.set_xlabel("Coffee")
+ax.set_ylabel("Sales ($)")
+plt.xticks(rotation=45, ha="right")
+plt.tight_layout()
+plt.savefig(OUT_PATH, dpi=DPI)
+plt.close()
+"""
+
+COLD_SCRIPT = """
+import sys, time
+start = time.perf_counter()
+import matplotlib
+matplotlib.use("Agg")
+import utils
+df = utils.load_and_prepare_data(sys.argv[1])
+exec(sys.argv[2], {"df": df})
+print(time.perf_counter() - start)
+"""
+
+
+def summary(label: str, seconds: list[float]) -> None:
+    ms = sorted(s * 1000 for s in seconds)
+    print(f"{label:28s} median {statistics.median(ms):8.1f} ms   min {ms[0]:8.1f} ms   max {ms[-1]:8.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--csv", default="coffee_sales.csv")
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--cold-runs", type=int, default=3)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--dpi", type=int, default=150)
+    args = parser.parse_args()
+
+    out_dir = tempfile.mkdtemp(prefix="chart_bench_")
+    out_path = os.path.join(out_dir, "chart.png")
+    code = CHART_CODE.replace("OUT_PATH", repr(out_path)).replace("DPI", str(args.dpi))
+
+    cold = []
+    for _ in range(args.cold_runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", COLD_SCRIPT, args.csv, code], check=True, capture_output=True)
+        cold.append(time.perf_counter() - start)
+    summary("cold exec (new process)", cold)
+
+    import matplotlib
+
+    matplotlib.use("Agg")
+    import utils
+
+    df = utils.load_and_prepare_data(args.csv)
+    warm = []
+    for _ in range(args.runs + 1):
+        start = time.perf_counter()
+        exec(code, {"df": df.copy()})
+        warm.append(time.perf_counter() - start)
+    summary("first in-process exec", warm[:1])
+    summary("in-process exec, warm", warm[1:])
+
+    start = time.perf_counter()
+    with ChartSandbox(args.csv, workers=args.workers, timeout=30) as sandbox:
+        sandbox.wait_ready()
+        print(f"{'sandbox startup':28s} {time.perf_counter() - start:8.2f} s  ({args.workers} workers, once per kernel)")
+        results = [sandbox.run(code, out_path=out_path) for _ in range(args.runs)]
+        assert all(r["ok"] and r["png"].startswith(b"\x89PNG") for r in results), results[0]["error"]
+        summary("sandbox run", [r["seconds"] for r in results])
+
+        hung = sandbox.run("while True:\n    pass", timeout=2)
+        after = sandbox.run(code, out_path=out_path)
+        print(f"{'hung code':28s} {hung['seconds']:8.2f} s  -> {hung['error']}")
+        print(f"{'next run after timeout':28s} {after['seconds']:8.2f} s  ok={after['ok']} (replacement worker warming up)")
+        print(f"stats: {sandbox.stats}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+Benchmark: load time and memory of load_and_prepare_data on a large sales file.
+
+Writes a synthetic coffee_sales-style CSV (default 10M rows) and loads it in a fresh
+process per variant, reporting wall time, DataFrame size (deep) and peak RSS:
+  - legacy:           read_csv with default dtypes + to_datetime(errors="coerce")
+  - csv:              explicit date format, categoricals, int8/int16 date parts (no cache)
+  - csv, chunked:     same, read in CSV_CHUNK_ROWS chunks
+  - cache build:      first cached load (parse + write Feather/Parquet)
+  - cache hit:        later loads, straight from the columnar cache
+
+Usage (from this folder):
+    python bench_load_data.py                  # 10M rows
+    python bench_load_data.py --rows 1000000 --keep
+"""
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+DRINKS = ["Latte", "Americano", "Cappuccino", "Hot Chocolate", "Cortado", "Espresso", "Cocoa",
+          "Americano with Milk"]
+
+LOAD_SCRIPT = r"""
+import json, os, sys, time
+variant, csv_path = sys.argv[1], sys.argv[2]
+import pandas as pd
+import utils
+start = time.perf_counter()
+if variant == "legacy":
+    df = pd.read_csv(csv_path)
+    df["date"] = pd.to_datetime(df["date"], errors="coerce")
+    df["quarter"] = df["date"].dt.quarter
+    df["month"] = df["date"].dt.month
+    df["year"] = df["date"].dt.year
+elif variant == "csv":
+    df = utils.load_and_prepare_data(csv_path, use_cache=False, chunksize=0)
+elif variant == "csv, chunked":
+    df = utils.load_and_prepare_data(csv_path, use_cache=False, chunksize=utils.CSV_CHUNK_ROWS)
+else:
+    df = utils.load_and_prepare_data(csv_path)
+seconds = time.perf_counter() - start
+with open("/proc/self/status") as f:  # VmHWM: peak RSS of this process (ru_maxrss survives exec)
+    peak_kb = next(int(line.split()[1]) for line in f if line.startswith("VmHWM:"))
+print(json.dumps({"seconds": seconds, "frame_mb": df.memory_usage(deep=True).sum() / 1e6,
+                  "peak_rss_mb": peak_kb / 1024,
+                  "rows": len(df)}))
+"""
+
+
+def write_csv(path: str, rows: int, seed: int) -> None:
+    import numpy as np
+    import pandas as pd
+
+    rng = np.random.default_rng(seed)
+    block = 1_000_000
+    for start in range(0, rows, block):
+        n = min(block, rows - start)
+        days = rng.integers(0, 730, n)
+        cash = rng.random(n) < 0.1
+        card = pd.Series([f"ANON-0000-0000-{c:04d}" for c in rng.integers(1, 5000, n)])
+        frame = pd.DataFrame({
+            "date": (pd.Timestamp("2024-01-01") + pd.to_timedelta(days, unit="D")).strftime("%Y-%m-%d"),
+            "time": pd.Series(rng.integers(6, 22, n)).map("{:02d}".format) + ":"
+                    + pd.Series(rng.integers(0, 60, n)).map("{:02d}".format),
+            "cash_type": np.where(cash, "cash", "card"),
+            "card": card.where(~cash),
+            "price": rng.choice([2.15, 2.86, 3.35, 3.87, 4.0], n),
+            "coffee_name": rng.choice(DRINKS, n),
+        })
+        frame.to_csv(path, mode="w" if start == 0 else "a", header=start == 0, index=False)
+
+
+def run_variant(variant: str, csv_path: str, env: dict) -> dict:
+    out = subprocess.run([sys.executable, "-c", LOAD_SCRIPT, variant, csv_path], env=env,
+                         check=True, capture_output=True, text=True, cwd=os.path.dirname(os.path.abspath(__file__)))
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--keep", action="store_true", help="keep the generated CSV and cache")
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp(prefix="load_bench_")
+    csv_path = os.path.join(work_dir, "sales.csv")
+    try:
+        start = time.perf_counter()
+        write_csv(csv_path, args.rows, args.seed)
+        print(f"csv: {args.rows:,} rows, {os.path.getsize(csv_path) / 1e6:.0f} MB "
+              f"(written in {time.perf_counter() - start:.1f} s)\n")
+        print(f"{'variant':22s} {'time':>9s} {'frame':>10s} {'peak RSS':>10s}")
+        variants = [("legacy", {}), ("csv", {}), ("csv, chunked", {})]
+        for fmt in ("feather", "parquet"):
+            variants += [(f"cache build ({fmt})", {"DATA_CACHE_FORMAT": fmt}),
+                         (f"cache hit ({fmt})", {"DATA_CACHE_FORMAT": fmt})]
+        for variant, extra in variants:
+            env = {**os.environ, "DATA_CACHE_DIR": os.path.join(work_dir, "cache"), **extra}
+            result = run_variant(variant, csv_path, env)
+            assert result["rows"] == args.rows, result
+            print(f"{variant:22s} {result['seconds']:8.2f}s {result['frame_mb']:8.0f} MB "
+                  f"{result['peak_rss_mb']:8.0f} MB")
+    finally:
+        if args.keep:
+            print(f"\nkept {work_dir}")
+        else:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,320 @@
+# === Standard Library ===
+import io
+import os
+import re
+import sys
+import time
+import queue
+import threading
+import traceback
+import contextlib
+import multiprocessing as mp
+from typing import Any, Callable
+
+# Sandboxed execution of LLM-generated chart code (the `exec` step of run_workflow).
+#
+# - A small pool of worker processes, each with pandas, matplotlib (Agg backend, font
+#   cache and renderer already warmed) and the prepared DataFrame loaded once at startup,
+#   so a run only pays for the chart itself.
+# - Every run gets a fresh namespace with its own copy of `df` (plus `pd` and `plt`), the
+#   way the notebook does `exec(code, {"df": df})`, but in another process.
+# - Wall-clock timeout: a worker that does not answer in time is killed and replaced in
+#   the background; the caller gets an error result instead of a hung kernel.
+# - Memory limit: each worker's address space is capped at what it uses after preloading
+#   plus `memory_mb` (Linux), so a runaway allocation raises MemoryError in the worker.
+# - The PNG comes back as bytes: the file the code saved (out_path), else the open figure.
+#
+#   sandbox = ChartSandbox("coffee_sales.csv")
+#   result = sandbox.run(code_v1, out_path="chart_v1.png")   # code with or without <execute_python> tags
+#   result["ok"], result["png"], result["error"], result["seconds"]
+#
+# Env:
+#   CHART_SANDBOX_WORKERS     worker processes (default 2)
+#   CHART_SANDBOX_TIMEOUT     seconds per run (default 60)
+#   CHART_SANDBOX_MEMORY_MB   memory allowance per worker on top of the preloaded state (default 1024)
+
+CODE_RE = re.compile(r"<execute_python>([\s\S]*?)</execute_python>")
+STARTUP_TIMEOUT = 120       # seconds for a worker to import libraries and load the data
+MAX_TASKS_PER_WORKER = 200  # recycle workers now and then so leaked figures/state do not pile up
+MAX_OUTPUT_CHARS = 10_000
+
+
+def extract_code(text: str) -> str:
+    """Code inside <execute_python> tags, or `text` itself when there are none."""
+    match = CODE_RE.search(text or "")
+    return (match.group(1) if match else text or "").strip()
+
+
+# === Worker side ===
+def _limit_memory(memory_mb: int | None) -> None:
+    """Cap the address space at current size + memory_mb (no-op where RLIMIT_AS is unavailable)."""
+    if not memory_mb:
+        return
+    try:
+        import resource
+
+        with open("/proc/self/statm") as f:
+            current = int(f.read().split()[0]) * os.sysconf("SC_PAGE_SIZE")
+        limit = current + memory_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, resource.getrlimit(resource.RLIMIT_AS)[1]))
+    except (ImportError, OSError, ValueError):
+        pass
+
+
+def _warm_matplotlib(plt) -> None:
+    """Draw and save a throwaway chart so fonts, text layout and the PNG writer are loaded."""
+    fig, ax = plt.subplots(figsize=(4, 3))
+    ax.bar(["a", "b"], [1, 2], label="bars")
+    ax.plot([0, 1], [1, 2], marker="o")
+    ax.set_title("warm-up")
+    ax.legend()
+    fig.tight_layout()
+    fig.savefig(io.BytesIO(), format="png", dpi=100)
+    plt.close("all")
+
+
+def _mtime(path: str | None) -> int | None:
+    try:
+        return os.stat(path).st_mtime_ns if path else None
+    except OSError:
+        return None
+
+
+def _execute(task: dict, df, pd, plt) -> dict:
+    out_path = task.get("out_path")
+    if task.get("cwd") and os.getcwd() != task["cwd"]:
+        os.chdir(task["cwd"])
+    before = _mtime(out_path)
+    namespace = {"__name__": "__chart__", "df": df.copy() if df is not None else None, "pd": pd, "plt": plt}
+    output = io.StringIO()
+    result = {"ok": True, "png": None, "path": None, "stdout": "", "error": None, "restart": False}
+    try:
+        with contextlib.redirect_stdout(output), contextlib.redirect_stderr(output):
+            exec(compile(task["code"], "<chart_code>", "exec"), namespace)
+        after = _mtime(out_path)
+        if after is not None and after != before:
+            with open(out_path, "rb") as f:
+                result["png"] = f.read()
+            result["path"] = os.path.abspath(out_path)
+        elif plt.get_fignums():
+            buffer = io.BytesIO()
+            plt.gcf().savefig(buffer, format="png", dpi=task.get("dpi", 150))
+            result["png"] = buffer.getvalue()
+    except MemoryError:
+        result.update(ok=False, error="MemoryError: chart code exceeded the sandbox memory limit", restart=True)
+    except BaseException:  # SystemExit / KeyboardInterrupt from generated code included
+        result.update(ok=False, error=traceback.format_exc(limit=-5))
+    finally:
+        plt.close("all")
+    result["stdout"] = output.getvalue()[-MAX_OUTPUT_CHARS:]
+    return result
+
+
+def _worker_main(conn, csv_path: str | None, loader: Callable | None, memory_mb: int | None) -> None:
+    os.environ["MPLBACKEND"] = "Agg"
+    try:
+        import matplotlib
+
+        matplotlib.use("Agg")
+        import matplotlib.pyplot as plt
+        import pandas as pd
+
+        if loader is None and csv_path:
+            from utils import load_and_prepare_data as loader
+        df = loader(csv_path) if csv_path else None
+        _warm_matplotlib(plt)
+        _limit_memory(memory_mb)
+    except BaseException:
+        conn.send(("failed", traceback.format_exc()))
+        return
+    conn.send(("ready", os.getpid()))
+    while True:
+        try:
+            task = conn.recv()
+        except (EOFError, OSError):
+            break
+        if task is None:
+            break
+        conn.send(_execute(task, df, pd, plt))
+
+
+# === Parent side ===
+class _Worker:
+    def __init__(self, ctx, csv_path, loader, memory_mb):
+        self.conn, child_conn = ctx.Pipe()
+        self.process = ctx.Process(target=_worker_main, args=(child_conn, csv_path, loader, memory_mb),
+                                   name="chart-sandbox", daemon=True)
+        self.process.start()
+        child_conn.close()
+        self.ready = False
+        self.tasks = 0
+
+    def wait_ready(self, timeout: float = STARTUP_TIMEOUT) -> None:
+        if self.ready:
+            return
+        if not self.conn.poll(timeout):
+            self.kill()
+            raise TimeoutError(f"chart sandbox worker did not start within {timeout}s")
+        try:
+            status, detail = self.conn.recv()
+        except EOFError:
+            status, detail = "failed", f"worker exited with code {self.process.exitcode}"
+        if status != "ready":
+            self.kill()
+            raise RuntimeError(f"chart sandbox worker failed to start:\n{detail}")
+        self.ready = True
+
+    def kill(self) -> None:
+        if self.process.is_alive():
+            self.process.kill()
+        self.process.join(timeout=5)
+        self.conn.close()
+
+    def stop(self) -> None:
+        try:
+            self.conn.send(None)
+            self.process.join(timeout=2)
+        except (OSError, ValueError):
+            pass
+        self.kill()
+
+
+def _default_start_method() -> str:
+    # forkserver where available: workers (and replacements after a timeout) are forked from a
+    # clean server process that already imported pandas/matplotlib, not from the notebook kernel.
+    return "forkserver" if "forkserver" in mp.get_all_start_methods() else "spawn"
+
+
+class ChartSandbox:
+    """
+    Pool of preloaded worker processes for running generated chart code.
+
+    Example:
+        with ChartSandbox("coffee_sales.csv", workers=2, timeout=30) as sandbox:
+            result = sandbox.run(code_v1, out_path="chart_v1.png")
+            if not result["ok"]:
+                print(result["error"])
+    """
+
+    def __init__(self, csv_path: str | None = None, workers: int | None = None, timeout: float | None = None,
+                 memory_mb: int | None = None, loader: Callable | None = None, start_method: str | None = None):
+        self.csv_path = os.path.abspath(csv_path) if csv_path else None
+        self.workers = workers or int(os.getenv("CHART_SANDBOX_WORKERS", "2"))
+        self.timeout = timeout or float(os.getenv("CHART_SANDBOX_TIMEOUT", "60"))
+        self.memory_mb = memory_mb if memory_mb is not None else int(os.getenv("CHART_SANDBOX_MEMORY_MB", "1024"))
+        self.loader = loader
+        self.stats = {"runs": 0, "errors": 0, "timeouts": 0, "restarts": 0}
+        self._ctx = mp.get_context(start_method or _default_start_method())
+        if self._ctx.get_start_method() == "forkserver":
+            self._ctx.set_forkserver_preload(["pandas", "matplotlib"])
+        self._idle: queue.Queue[_Worker] = queue.Queue()
+        self._all: set[_Worker] = set()
+        self._lock = threading.Lock()
+        self._closed = False
+        for _ in range(self.workers):
+            self._add_worker()
+
+    def _add_worker(self) -> None:
+        worker = _Worker(self._ctx, self.csv_path, self.loader, self.memory_mb)
+        with self._lock:
+            self._all.add(worker)
+        self._idle.put(worker)
+
+    def _replace(self, worker: _Worker) -> None:
+        worker.kill()
+        with self._lock:
+            self._all.discard(worker)
+            self.stats["restarts"] += 1
+        if not self._closed:
+            self._add_worker()  # starts in the background; waited for when next picked
+
+    def wait_ready(self) -> "ChartSandbox":
+        """Block until every worker has finished preloading (otherwise the first run waits)."""
+        with self._lock:
+            workers = list(self._all)
+        for worker in workers:
+            worker.wait_ready()
+        return self
+
+    def run(self, code: str, out_path: str | None = None, timeout: float | None = None, dpi: int = 150) -> dict:
+        """
+        Execute chart code (with or without <execute_python> tags) in a worker.
+
+        Returns {"ok", "png", "path", "stdout", "error", "seconds", "worker"}: `png` holds the
+        bytes of `out_path` if the code saved it, else of the current figure (at `dpi`).
+        """
+        if self._closed:
+            raise RuntimeError("chart sandbox is closed")
+        timeout = timeout or self.timeout
+        task = {"code": extract_code(code), "out_path": out_path, "cwd": os.getcwd(), "dpi": dpi}
+        worker = self._idle.get()
+        start = time.perf_counter()
+        try:
+            worker.wait_ready()
+            worker.conn.send(task)
+            if worker.conn.poll(timeout):
+                result = worker.conn.recv()
+            else:
+                with self._lock:
+                    self.stats["timeouts"] += 1
+                result = {"ok": False, "png": None, "path": None, "stdout": "", "restart": True,
+                          "error": f"TimeoutError: chart code did not finish within {timeout:g}s"}
+        except (EOFError, OSError, RuntimeError, TimeoutError) as e:
+            worker.process.join(timeout=1)
+            exitcode = worker.process.exitcode
+            reason = f"worker exited with code {exitcode}" if exitcode is not None else repr(e)
+            result = {"ok": False, "png": None, "path": None, "stdout": "", "restart": True,
+                      "error": f"WorkerError: {reason}"}
+        worker.tasks += 1
+        restart = result.pop("restart", False) or worker.tasks >= MAX_TASKS_PER_WORKER
+        if restart:
+            self._replace(worker)
+        else:
+            self._idle.put(worker)
+        with self._lock:
+            self.stats["runs"] += 1
+            self.stats["errors"] += not result["ok"]
+        result["seconds"] = time.perf_counter() - start
+        result["worker"] = worker.process.pid
+        return result
+
+    def close(self) -> None:
+        self._closed = True
+        with self._lock:
+            workers, self._all = list(self._all), set()
+        for worker in workers:
+            worker.stop()
+
+    def __enter__(self) -> "ChartSandbox":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+# === Shared sandbox for notebooks ===
+_sandboxes: dict[tuple, ChartSandbox] = {}
+
+
+def get_sandbox(csv_path: str, **kwargs: Any) -> ChartSandbox:
+    """One sandbox per (csv_path, options) per kernel, started on first use."""
+    key = (os.path.abspath(csv_path), tuple(sorted(kwargs.items())))
+    if key not in _sandboxes:
+        _sandboxes[key] = ChartSandbox(csv_path, **kwargs)
+    return _sandboxes[key]
+
+
+def run_chart_code(code: str, csv_path: str = "coffee_sales.csv", out_path: str | None = None,
+                   timeout: float | None = None) -> dict:
+    """Drop-in for the notebook's `exec(code, {"df": df})` step, through the shared sandbox."""
+    return get_sandbox(csv_path).run(code, out_path=out_path, timeout=timeout)
+
+
+if __name__ == "__main__" and len(sys.argv) > 1:
+    # python chart_sandbox.py code.py [coffee_sales.csv] [out.png]
+    with open(sys.argv[1], encoding="utf-8") as f:
+        source = f.read()
+    with ChartSandbox(sys.argv[2] if len(sys.argv) > 2 else "coffee_sales.csv", workers=1) as sandbox:
+        outcome = sandbox.run(source, out_path=sys.argv[3] if len(sys.argv) > 3 else None)
+    print(outcome["stdout"], end="")
+    print("ok" if outcome["ok"] else outcome["error"], f"({outcome['seconds']:.2f}s)")
@@ -1,43 +1,221 @@
 # === Standard Library ===
 import os
 import re
+import sys
 import json
 import base64
+import hashlib
+import tempfile
+import functools
+import importlib
 import mimetypes
 from pathlib import Path
+from html import escape
+from typing import TYPE_CHECKING
 
 # === Third-Party ===
-import pandas as pd
-import matplotlib.pyplot as plt
-from PIL import Image  # (kept if you need it elsewhere)
-from dotenv import load_dotenv
-from openai import OpenAI
-from anthropic import Anthropic
-from html import escape
+# pandas, matplotlib, PIL, dotenv, openai and anthropic are imported on first use, so
+# `import utils` stays cheap. `utils.openai_client`, `utils.pd`, ... still resolve (lazily).
+if TYPE_CHECKING:
+    import pandas as pd
 
 # === Env & Clients ===
-load_dotenv()
-openai_api_key = os.getenv("OPENAI_API_KEY")
-anthropic_api_key = os.getenv("ANTHROPIC_API_KEY")
+@functools.lru_cache(maxsize=1)
+def _load_env() -> dict:
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    return {
+        "openai_api_key": os.getenv("OPENAI_API_KEY"),
+        "anthropic_api_key": os.getenv("ANTHROPIC_API_KEY"),
+    }
+
 
 # Both clients read keys from env by default; explicit is also fine:
-openai_client = OpenAI(api_key=openai_api_key) if openai_api_key else OpenAI()
-anthropic_client = Anthropic(api_key=anthropic_api_key) if anthropic_api_key else Anthropic()
+@functools.lru_cache(maxsize=1)
+def get_openai_client():
+    from openai import OpenAI
+
+    openai_api_key = _load_env()["openai_api_key"]
+    return OpenAI(api_key=openai_api_key) if openai_api_key else OpenAI()
+
+
+@functools.lru_cache(maxsize=1)
+def get_anthropic_client():
+    from anthropic import Anthropic
+
+    anthropic_api_key = _load_env()["anthropic_api_key"]
+    return Anthropic(api_key=anthropic_api_key) if anthropic_api_key else Anthropic()
+
+
+_LAZY_ATTRS = {
+    "openai_client": get_openai_client,
+    "anthropic_client": get_anthropic_client,
+    "openai_api_key": lambda: _load_env()["openai_api_key"],
+    "anthropic_api_key": lambda: _load_env()["anthropic_api_key"],
+    "pd": lambda: importlib.import_module("pandas"),
+    "plt": lambda: importlib.import_module("matplotlib.pyplot"),
+    "Image": lambda: importlib.import_module("PIL.Image"),
+}
+
+
+def __getattr__(name: str):
+    if name in _LAZY_ATTRS:
+        return _LAZY_ATTRS[name]()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 # === Data Loading ===
-def load_and_prepare_data(csv_path: str) -> pd.DataFrame:
-    """Load CSV and derive date parts commonly used in charts."""
-    df = pd.read_csv(csv_path)
+# The prepared frame is cached next to the CSV (.data_cache/) as Feather, or Parquet with
+# DATA_CACHE_FORMAT=parquet. It is keyed by the content hash of the source file, which is
+# recomputed only when the file's mtime/size change, so re-running a workflow skips CSV
+# parsing and date handling. Cache names include a hash of the source path, so CSVs with
+# the same name in different folders can share DATA_CACHE_DIR. Needs pyarrow and a
+# writable cache folder; otherwise the CSV is parsed every time.
+# Env: DATA_CACHE=0 (disable), DATA_CACHE_DIR, DATA_CACHE_FORMAT (feather | parquet).
+DATE_FORMATS = ("%Y-%m-%d", "%m/%d/%y")  # tried in order; anything else falls back to inference
+CATEGORY_COLUMNS = ("cash_type", "coffee_name")
+CSV_CHUNK_ROWS = 1_000_000
+CHUNKED_READ_BYTES = 256 * 1024 * 1024  # CSVs above this are read in CSV_CHUNK_ROWS chunks
+_CACHE_VERSION = "1"                    # bump when the preparation below changes
+
+
+def _prepare_frame(df: "pd.DataFrame") -> "pd.DataFrame":
+    """Categorical dtypes, dates parsed with DATE_FORMATS, compact quarter/month/year columns."""
+    import pandas as pd
+
+    for col in CATEGORY_COLUMNS:
+        if col in df.columns and not isinstance(df[col].dtype, pd.CategoricalDtype):
+            df[col] = df[col].astype("category")
     # Be tolerant if 'date' exists
     if "date" in df.columns:
-        df["date"] = pd.to_datetime(df["date"], errors="coerce")
-        df["quarter"] = df["date"].dt.quarter
-        df["month"] = df["date"].dt.month
-        df["year"] = df["date"].dt.year
+        raw = df["date"]
+        missing = raw.isna().sum()
+        for fmt in DATE_FORMATS:
+            df["date"] = pd.to_datetime(raw, format=fmt, errors="coerce")
+            if df["date"].isna().sum() == missing:
+                break
+        else:  # other spellings: infer like before
+            df["date"] = pd.to_datetime(raw, errors="coerce")
+        dates = df["date"].dt
+        complete = not df["date"].isna().any()
+        df["quarter"] = dates.quarter.astype("int8" if complete else "Int8")
+        df["month"] = dates.month.astype("int8" if complete else "Int8")
+        df["year"] = dates.year.astype("int16" if complete else "Int16")
+    return df
+
+
+def _read_csv_prepared(csv_path: str, chunksize: int | None = None, **read_csv_kwargs) -> "pd.DataFrame":
+    import pandas as pd
+
+    dtype = {col: "category" for col in CATEGORY_COLUMNS} | read_csv_kwargs.pop("dtype", {})
+    if chunksize is None and os.path.getsize(csv_path) > CHUNKED_READ_BYTES:
+        chunksize = CSV_CHUNK_ROWS
+    if not chunksize:
+        return _prepare_frame(pd.read_csv(csv_path, dtype=dtype, **read_csv_kwargs))
+
+    # One raw chunk in memory at a time; only the compact prepared chunks are kept.
+    chunks = [_prepare_frame(chunk) for chunk in
+              pd.read_csv(csv_path, dtype=dtype, chunksize=chunksize, **read_csv_kwargs)]
+    if not chunks:
+        return _prepare_frame(pd.read_csv(csv_path, dtype=dtype, **read_csv_kwargs))
+    for col in CATEGORY_COLUMNS:  # align categories so concat keeps the column categorical
+        if col in chunks[0].columns:
+            categories = pd.api.types.union_categoricals([c[col] for c in chunks]).categories
+            for chunk in chunks:
+                chunk[col] = chunk[col].cat.set_categories(categories)
+    return pd.concat(chunks, ignore_index=True)
+
+
+def file_digest(path: str, block_size: int = 1 << 20) -> str:
+    """Content hash of a file, read in 1 MiB blocks."""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _atomic_write(path: Path, write) -> None:
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    os.close(fd)
+    try:
+        write(tmp)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def _cached_digest(source: Path, cache_dir: Path) -> str:
+    """File hash, reused from cache_dir/index.json while mtime and size are unchanged."""
+    index_path = cache_dir / "index.json"
+    try:
+        index = json.loads(index_path.read_text())
+    except (OSError, ValueError):
+        index = {}
+    stat = source.stat()
+    key = str(source)
+    entry = index.get(key)
+    if entry and entry["mtime_ns"] == stat.st_mtime_ns and entry["size"] == stat.st_size:
+        return entry["digest"]
+    digest = file_digest(source)
+    index[key] = {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size, "digest": digest}
+    _atomic_write(index_path, lambda tmp: Path(tmp).write_text(json.dumps(index, indent=2)))
+    return digest
+
+
+def load_and_prepare_data(csv_path: str, use_cache: bool | None = None, chunksize: int | None = None,
+                          **read_csv_kwargs) -> "pd.DataFrame":
+    """
+    Load CSV and derive date parts commonly used in charts.
+
+    `cash_type` / `coffee_name` are categorical; `quarter`, `month` (int8) and `year`
+    (int16) are compact ints (nullable if some dates do not parse). Large files are
+    read in chunks (`chunksize` rows, automatic above CHUNKED_READ_BYTES).
+    """
+    import pandas as pd
+
+    if use_cache is None:
+        use_cache = os.getenv("DATA_CACHE", "1") != "0"
+    use_cache = use_cache and not read_csv_kwargs  # the cache key does not cover read_csv options
+    fmt = os.getenv("DATA_CACHE_FORMAT", "feather").lower()
+    if use_cache:
+        try:
+            import pyarrow  # noqa: F401  (Feather / Parquet backend)
+        except ImportError:
+            use_cache = False
+    if not use_cache:
+        return _read_csv_prepared(csv_path, chunksize, **read_csv_kwargs)
+
+    source = Path(csv_path).resolve()
+    cache_dir = Path(os.getenv("DATA_CACHE_DIR") or source.parent / ".data_cache")
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        digest = _cached_digest(source, cache_dir)
+    except OSError:  # read-only data folder / cache dir: load without the cache
+        return _read_csv_prepared(str(source), chunksize)
+    prefix = f"{source.stem}-{hashlib.blake2b(str(source).encode(), digest_size=4).hexdigest()}"
+    cache_path = cache_dir / f"{prefix}-{digest}-v{_CACHE_VERSION}.{fmt}"
+    reader, writer = (pd.read_parquet, "to_parquet") if fmt == "parquet" else (pd.read_feather, "to_feather")
+    if cache_path.exists():
+        try:
+            return reader(cache_path)
+        except Exception:  # truncated / unreadable cache file: rebuild it
+            pass
+    df = _read_csv_prepared(str(source), chunksize, **read_csv_kwargs)
+    try:
+        _atomic_write(cache_path, lambda tmp: getattr(df, writer)(tmp))
+        # older versions of this file only: same path hash, then a 32-char content digest
+        for stale in cache_dir.glob(f"{prefix}-{'?' * 32}-v*.{fmt}"):
+            if stale != cache_path:
+                stale.unlink(missing_ok=True)
+    except OSError:  # cache not writable: the frame is still good
+        pass
     return df
 
 # === Helpers ===
-def make_schema_text(df: pd.DataFrame) -> str:
+def make_schema_text(df: "pd.DataFrame") -> str:
     """Return a human-readable schema from a DataFrame."""
     return "\n".join(f"- {c}: {dt}" for c, dt in df.dtypes.items())
 
@@ -72,12 +250,16 @@ def print_html(content, title: str | None = None, is_image: bool = False):
     except ImportError:
         _HAS_IPY = False
 
+    # A DataFrame/Series can only exist if pandas is already imported
+    pd = sys.modules.get("pandas")
+    is_frame = pd is not None and isinstance(content, (pd.DataFrame, pd.Series))
+
     # Render content
     if is_image and isinstance(content, str):
         rendered = f'<img src="{content}" alt="Image" style="max-width:100%; height:auto; border-radius:8px;">'
-    elif isinstance(content, pd.DataFrame):
+    elif is_frame and isinstance(content, pd.DataFrame):
         rendered = content.to_html(classes="pretty-table", index=False, border=0, escape=False)
-    elif isinstance(content, pd.Series):
+    elif is_frame:
         rendered = content.to_frame().to_html(classes="pretty-table", border=0, escape=False)
     elif isinstance(content, str):
         rendered = f"<pre><code>{escape(content)}</code></pre>"
@@ -85,7 +267,7 @@ def print_html(content, title: str | None = None, is_image: bool = False):
         rendered = f"<pre><code>{escape(str(content))}</code></pre>"
 
     if not _HAS_IPY:
-        if isinstance(content, (pd.DataFrame, pd.Series)):
+        if is_frame:
             print(content if title is None else f"=== {title} ===\n{content}")
         else:
             if title:
@@ -144,3 +326,8 @@ def print_html(content, title: str | None = None, is_image: bool = False):
     card = f'<div class="pretty-card">{title_html}{rendered}</div>'
 
     display(HTML(css + card))
+
+
+# `from utils import *` (the notebooks) exports the lazy names too: they resolve through
+# __getattr__ at import time, like the eager imports they replaced.
+__all__ = [name for name in globals() if not name.startswith("_")] + list(_LAZY_ATTRS)
@@ -0,0 +1,81 @@
+"""
+Offline throughput benchmark for the email agent loop.
+
+Starts the stub LLM server (email_server/stub_llm_service.py) and the email API
+in background threads, points aisuite at the stub, and runs the tool loop from
+`llm_service.run_agent_events` N times. No OpenAI/Anthropic access is needed, so
+the numbers isolate tool-dispatch and orchestration overhead.
+
+Usage (from this folder):
+    python bench_agent_loop.py --runs 50 --latency-ms 0
+"""
+import argparse
+import os
+import socket
+import statistics
+import threading
+import time
+
+import requests
+import uvicorn
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _serve(app: str, port: int) -> None:
+    config = uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning")
+    server = uvicorn.Server(config)
+    threading.Thread(target=server.run, daemon=True).start()
+    for _ in range(100):
+        try:
+            requests.get(f"http://127.0.0.1:{port}/health", timeout=0.5)
+            return
+        except requests.exceptions.ConnectionError:
+            time.sleep(0.05)
+    raise RuntimeError(f"{app} did not start on port {port}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--latency-ms", type=int, default=0, help="Simulated model latency per turn")
+    parser.add_argument("--prompt", default="Check for unread emails from boss@email.com and reply politely.")
+    args = parser.parse_args()
+
+    llm_port, email_port = _free_port(), _free_port()
+    os.environ["OPENAI_BASE_URL"] = f"http://127.0.0.1:{llm_port}/v1"
+    os.environ["OPENAI_API_KEY"] = "stub"
+    os.environ["M3_EMAIL_SERVER_API_URL"] = f"http://127.0.0.1:{email_port}"
+
+    _serve("email_server.stub_llm_service:app", llm_port)
+    _serve("email_server.email_service:app", email_port)
+
+    from email_server import stub_llm_service
+    stub_llm_service.script["latency_ms"] = args.latency_ms
+
+    # Imported after the env vars are set: email_tools reads the API URL at import time
+    from email_server.llm_service import run_agent_events
+
+    durations, events = [], 0
+    for _ in range(args.runs):
+        requests.get(f"{os.environ['M3_EMAIL_SERVER_API_URL']}/reset_database")
+        start = time.perf_counter()
+        for _event in run_agent_events(args.prompt):
+            events += 1
+        durations.append(time.perf_counter() - start)
+
+    total = sum(durations)
+    print(f"runs:            {args.runs}")
+    print(f"events:          {events}")
+    print(f"model latency:   {args.latency_ms} ms/turn (simulated)")
+    print(f"mean run:        {statistics.mean(durations) * 1000:.1f} ms")
+    print(f"p95 run:         {sorted(durations)[int(0.95 * (len(durations) - 1))] * 1000:.1f} ms")
+    print(f"throughput:      {args.runs / total:.1f} runs/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,22 @@
 from fastapi import FastAPI, Request, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 import aisuite as ai
+from aisuite.utils.tools import Tools
 from dotenv import load_dotenv
-from .display_functions import pretty_print_chat_completion_html
+from .display_functions import (
+    tool_call_html,
+    tool_response_html,
+    final_message_html,
+    tool_sequence_html,
+)
+from .agent_accounting import RunAccounting, BudgetExceeded
+from .tool_result_governor import governor, fetch_tool_result_page
+from concurrent.futures import ThreadPoolExecutor
+import json
 import markdown
+import os
 
 # Importa las herramientas decoradas con @tool
 from .email_tools import (
@@ -35,12 +47,48 @@ app.add_middleware(
 
 class PromptInput(BaseModel):
     prompt: str
+    max_tokens: int | None = None     # per-run token budget (prompt + completion)
+    max_seconds: float | None = None  # per-run wall-clock budget
 
-@app.post("/prompt")
-async def handle_prompt(payload: PromptInput):
-    prompt = payload.prompt
+EMAIL_TOOLS = [
+    list_all_emails,
+    list_unread_emails,
+    search_emails,
+    filter_emails,
+    get_email,
+    mark_email_as_read,
+    mark_email_as_unread,
+    send_email,
+    delete_email,
+    search_unread_from_sender,
+    fetch_tool_result_page
+]
 
-    prompt_ = f"""
+TOOLS_BY_NAME = {tool.__name__: tool for tool in EMAIL_TOOLS}
+TOOL_SPECS = Tools(EMAIL_TOOLS).tools()
+
+MODEL = "openai:gpt-4.1"
+MAX_TURNS = 20
+MAX_PARALLEL_TOOL_CALLS = 4
+
+# Tools without side effects: consecutive calls to these may run concurrently. Anything
+# else (send, delete, mark read/unread) runs alone, in the order the model asked for it.
+READ_ONLY_TOOLS = {
+    "list_all_emails",
+    "list_unread_emails",
+    "search_emails",
+    "filter_emails",
+    "get_email",
+    "search_unread_from_sender",
+    "fetch_tool_result_page",
+}
+
+# Append one JSON line per run (usage summary) when set
+ACCOUNTING_LOG = os.getenv("AGENT_ACCOUNTING_LOG")
+
+
+def build_prompt(prompt: str) -> str:
+    return f"""
         - You are an AI assistant specialized in managing emails. 
         - You can perform various actions such as listing, searching, filtering, and manipulating emails. 
         - Use the provided tools to interact with the email system.
@@ -49,28 +97,165 @@ async def handle_prompt(payload: PromptInput):
         {prompt}
         """
 
-    response = client.chat.completions.create(
-        model="openai:gpt-4.1",
-        messages=[{"role": "user", "content": prompt_}],
-        tools=[
-            list_all_emails,
-            list_unread_emails,
-            search_emails,
-            filter_emails,
-            get_email,
-            mark_email_as_read,
-            mark_email_as_unread,
-            send_email,
-            delete_email,
-            search_unread_from_sender
-        ],
-        max_turns=20
-    )
 
-    html_response = pretty_print_chat_completion_html(response)
-    final_text = markdown.markdown(response.choices[0].message.content)
+@app.post("/prompt")
+def handle_prompt(payload: PromptInput):
+    for event, data in run_agent_events(payload.prompt, payload.max_tokens, payload.max_seconds):
+        pass
+
+    return {
+        "response": data["response"],
+        "html_response": data["html_response"],
+        "usage": data["usage"]
+    }
+
 
+def sse_event(event: str, data: dict) -> str:
+    """Encode one Server-Sent Event frame."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+def run_tool_call(call, run: RunAccounting) -> dict:
+    """Execute one tool call and return its tool message; errors stay attached to the call."""
+    try:
+        args = json.loads(call.function.arguments)
+        result = run.call_tool(call.function.name, TOOLS_BY_NAME[call.function.name], **args)
+    except Exception as e:
+        result = {"error": f"{call.function.name} failed: {e}"}
     return {
-        "response": final_text,
-        "html_response": html_response
+        "role": "tool",
+        "name": call.function.name,
+        # Size-capped before re-entering the context: long fields truncated, long lists paged
+        "content": governor.serialize(call.function.name, result),
+        "tool_call_id": call.id,
+    }
+
+
+def tool_call_batches(tool_calls) -> list[list]:
+    """Split a turn's calls into runs of consecutive read-only calls and single state-changing calls."""
+    batches = []
+    for call in tool_calls:
+        read_only = call.function.name in READ_ONLY_TOOLS
+        if read_only and batches and batches[-1][0].function.name in READ_ONLY_TOOLS:
+            batches[-1].append(call)
+        else:
+            batches.append([call])
+    return batches
+
+
+def iter_tool_results(tool_calls, run: RunAccounting):
+    """Tool messages in call order; read-only batches run concurrently, writes one at a time."""
+    with ThreadPoolExecutor(max_workers=MAX_PARALLEL_TOOL_CALLS) as pool:
+        for batch in tool_call_batches(tool_calls):
+            if len(batch) == 1:
+                yield run_tool_call(batch[0], run)
+                continue
+            futures = [pool.submit(run_tool_call, call, run) for call in batch]
+            for future in futures:
+                yield future.result()
+
+
+def run_agent_events(prompt: str, max_tokens: int | None = None, max_seconds: float | None = None):
+    """
+    Tool loop equivalent to aisuite's `max_turns` runner, driven by hand so every
+    step can be reported as soon as it happens. Read-only tool calls returned in the
+    same turn run concurrently (up to MAX_PARALLEL_TOOL_CALLS); state-changing ones
+    run one at a time in call order, so reads before a write see the old state and
+    reads after it the new one. Results are reported and fed back in call order.
+
+    Yields (event, data) tuples:
+      - ("llm_decision", {"turn", "content", "tool_calls"})
+      - ("tool_call",    {"step", "name", "arguments", "html"})
+      - ("tool_result",  {"step", "name", "content", "html"})
+      - ("final",        {"response", "html_response", "html", "usage"})
+
+    `usage` is the run's RunAccounting summary (turns, tokens, cost, model and
+    tool time). When a budget runs out the loop stops and the final message says so.
+    """
+    run = RunAccounting("email_agent", max_tokens=max_tokens, max_seconds=max_seconds, max_turns=MAX_TURNS)
+    messages = [{"role": "user", "content": build_prompt(prompt)}]
+    steps_html = ""
+    tool_sequence = []
+    step_ = 0
+    final_msg = ""
+
+    for turn in range(1, MAX_TURNS + 1):
+        try:
+            response = run.create(
+                client,
+                model=MODEL,
+                messages=messages,
+                tools=TOOL_SPECS,
+            )
+        except BudgetExceeded as e:
+            final_msg = f"⚠️ Stopped early: {e}"
+            break
+        message = response.choices[0].message
+        final_msg = message.content or ""
+        tool_calls = getattr(message, "tool_calls", None) or []
+
+        yield "llm_decision", {
+            "turn": turn,
+            "content": message.content,
+            "tool_calls": [call.function.name for call in tool_calls],
+        }
+
+        if not tool_calls:
+            break
+
+        messages.append(message)
+        first_step = step_ + 1
+        for call in tool_calls:
+            step_ += 1
+            tool_name = call.function.name
+            tool_sequence.append(tool_name)
+            try:
+                args = json.loads(call.function.arguments)
+            except json.JSONDecodeError:
+                args = call.function.arguments
+            html = tool_call_html(step_, tool_name, args)
+            steps_html += html
+            yield "tool_call", {"step": step_, "name": tool_name, "arguments": args, "html": html}
+
+        for step, tool_message in enumerate(iter_tool_results(tool_calls, run), start=first_step):
+            messages.append(tool_message)
+            html = tool_response_html(step, tool_message["name"], tool_message["content"])
+            steps_html += html
+            yield "tool_result", {
+                "step": step,
+                "name": tool_message["name"],
+                "content": tool_message["content"],
+                "html": html,
+            }
+
+    usage = run.finish()
+    if ACCOUNTING_LOG:
+        run.write_jsonl(ACCOUNTING_LOG)
+
+    html = final_message_html(final_msg) + tool_sequence_html(tool_sequence)
+    yield "final", {
+        "response": markdown.markdown(final_msg),
+        "html_response": steps_html + html,
+        "html": html,
+        "usage": usage,
     }
+
+
+@app.post("/prompt/stream")
+def handle_prompt_stream(payload: PromptInput):
+    """
+    Streaming variant of `/prompt`: emits each LLM decision, tool call and tool
+    result as Server-Sent Events, then a `final` event with the rendered answer.
+    """
+    def event_stream():
+        try:
+            for event, data in run_agent_events(payload.prompt, payload.max_tokens, payload.max_seconds):
+                yield sse_event(event, data)
+        except Exception as e:
+            yield sse_event("error", {"detail": str(e)})
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
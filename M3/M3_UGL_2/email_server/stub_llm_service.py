@@ -0,0 +1,188 @@
+from fastapi import FastAPI, HTTPException
+from fastapi.middleware.cors import CORSMiddleware
+from pydantic import BaseModel, ConfigDict
+from pathlib import Path
+import asyncio
+import itertools
+import json
+import os
+import time
+
+# Local, deterministic stand-in for the OpenAI chat-completions API.
+# Point any OpenAI/aisuite client at it with:
+#   OPENAI_BASE_URL=http://127.0.0.1:5002/v1  OPENAI_API_KEY=stub
+# and every "openai:<model>" call is answered from a script instead of the network.
+#
+# Script format (JSON file, or POST /script):
+# {
+#   "latency_ms": 0,              # default delay per response
+#   "prompt_tokens": null,        # default usage numbers (null -> estimated from text length)
+#   "completion_tokens": null,
+#   "scenarios": [
+#     {
+#       "match": "unread",        # optional substring of the first user message
+#       "turns": [
+#         {"tool_calls": [{"name": "list_unread_emails", "arguments": {}}]},
+#         {"content": "You have 5 unread emails.", "latency_ms": 250, "completion_tokens": 12}
+#       ]
+#     }
+#   ]
+# }
+#
+# The turn to answer is the number of assistant messages already in the request, so
+# the server keeps no per-conversation state and replays the same sequence every run.
+
+_THIS_DIR = Path(__file__).resolve().parent
+DEFAULT_SCRIPT_PATH = os.getenv("STUB_LLM_SCRIPT", str(_THIS_DIR / "stub_llm_script.json"))
+DEFAULT_REPLY = "[stub] No scripted turn left for this conversation."
+
+app = FastAPI(title="Stub LLM Chat Completions")
+
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins=["*"],
+    allow_credentials=True,
+    allow_methods=["*"],
+    allow_headers=["*"],
+)
+
+
+class ChatCompletionRequest(BaseModel):
+    model: str
+    messages: list[dict]
+    tools: list[dict] | None = None
+    tool_choice: str | dict | None = None
+    temperature: float | None = None
+    stream: bool | None = False
+
+    model_config = ConfigDict(extra="allow")
+
+
+def load_script(path: str | None) -> dict:
+    if path and Path(path).exists():
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    return {"scenarios": []}
+
+
+script = load_script(DEFAULT_SCRIPT_PATH)
+stats = {"requests": 0, "prompt_tokens": 0, "completion_tokens": 0}
+_ids = itertools.count(1)
+
+
+def _first_user_text(messages: list[dict]) -> str:
+    for m in messages:
+        if m.get("role") == "user":
+            content = m.get("content")
+            return content if isinstance(content, str) else json.dumps(content)
+    return ""
+
+
+def _pick_turn(messages: list[dict]) -> dict:
+    first_user = _first_user_text(messages)
+    turn_index = sum(1 for m in messages if m.get("role") == "assistant")
+    for scenario in script.get("scenarios", []):
+        match = scenario.get("match")
+        if match is None or match.lower() in first_user.lower():
+            turns = scenario.get("turns", [])
+            if turn_index < len(turns):
+                return turns[turn_index]
+            break
+    return {"content": DEFAULT_REPLY}
+
+
+def _estimate_tokens(data) -> int:
+    text = data if isinstance(data, str) else json.dumps(data, default=str)
+    return max(1, len(text) // 4)
+
+
+def build_completion(req: ChatCompletionRequest) -> tuple[dict, float]:
+    turn = _pick_turn(req.messages)
+    tool_calls = [
+        {
+            "id": f"call_{len(req.messages)}_{i}",
+            "type": "function",
+            "function": {
+                "name": call["name"],
+                "arguments": json.dumps(call.get("arguments", {})),
+            },
+        }
+        for i, call in enumerate(turn.get("tool_calls", []))
+    ]
+    content = turn.get("content")
+
+    prompt_tokens = turn.get("prompt_tokens", script.get("prompt_tokens"))
+    if prompt_tokens is None:
+        prompt_tokens = _estimate_tokens(req.messages) + (_estimate_tokens(req.tools) if req.tools else 0)
+    completion_tokens = turn.get("completion_tokens", script.get("completion_tokens"))
+    if completion_tokens is None:
+        completion_tokens = _estimate_tokens(content or "") + (_estimate_tokens(tool_calls) if tool_calls else 0)
+
+    message = {"role": "assistant", "content": content}
+    if tool_calls:
+        message["tool_calls"] = tool_calls
+
+    completion = {
+        "id": f"chatcmpl-stub-{next(_ids)}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": req.model,
+        "choices": [{
+            "index": 0,
+            "message": message,
+            "finish_reason": "tool_calls" if tool_calls else "stop",
+        }],
+        "usage": {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+        },
+    }
+    latency_ms = turn.get("latency_ms", script.get("latency_ms", 0))
+    return completion, latency_ms / 1000
+
+
+# --- API ---
+
+@app.post("/v1/chat/completions")
+async def chat_completions(req: ChatCompletionRequest):
+    if req.stream:
+        raise HTTPException(status_code=400, detail="Streaming is not supported by the stub server")
+
+    completion, latency = build_completion(req)
+    if latency > 0:
+        await asyncio.sleep(latency)
+
+    stats["requests"] += 1
+    stats["prompt_tokens"] += completion["usage"]["prompt_tokens"]
+    stats["completion_tokens"] += completion["usage"]["completion_tokens"]
+    return completion
+
+
+@app.get("/v1/models")
+def list_models():
+    return {"object": "list", "data": [{"id": "stub", "object": "model", "owned_by": "local"}]}
+
+
+@app.post("/script")
+def set_script(new_script: dict):
+    script.clear()
+    script.update(new_script)
+    return {"message": "Script loaded", "scenarios": len(script.get("scenarios", []))}
+
+
+@app.get("/stats")
+def get_stats():
+    return stats
+
+
+@app.get("/reset_stats")
+def reset_stats():
+    for k in stats:
+        stats[k] = 0
+    return {"message": "Stats reset"}
+
+
+@app.get("/health")
+def health():
+    return {"status": "ok"}
@@ -0,0 +1,248 @@
+"""
+Batch evaluation of stored agent runs against a domain allow-list.
+
+Each run is a `history` (list of (step, agent, output), as returned by
+executor_agent) evaluated like `utils.evaluate_references`. Runs are read
+lazily (iterable or JSONL file), sent to a process pool in batches with a
+bounded number of batches in flight, and folded into an aggregate report, so
+memory does not grow with the number of runs and throughput scales with cores.
+The allow-list is compiled once (DomainMatcher) and shipped to every worker as is.
+
+JSONL input: one run per line, either a bare history list
+`[[step, agent, output], ...]` or an object `{"id": ..., "history": [...]}`.
+
+Usage (from this folder):
+    python batch_eval.py runs.jsonl --domains arxiv.org nature.com mit.edu
+    python batch_eval.py runs.jsonl --domains-file top_domains.txt --workers 8 --runs-out per_run.jsonl
+"""
+# ================================
+# Standard library imports
+# ================================
+import argparse
+import json
+import os
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Iterable, Iterator
+
+# ================================
+# Personal / local imports
+# ================================
+from domain_match import DomainMatcher, compile_domains
+from utils import evaluate_anytext_against_domains, select_reference_payload
+
+BATCH_SIZE = 64           # runs per task sent to a worker
+TOP_FAILING_HOSTS = 20
+RATIO_BINS = 10           # histogram buckets of width 1 / RATIO_BINS
+
+
+def iter_histories(source: str | Iterable) -> Iterator[tuple[Any, Any]]:
+    """(run id, history) pairs from a JSONL path or an iterable of histories / {"id", "history"} dicts."""
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, encoding="utf-8") as f:
+            for number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except ValueError as e:
+                    yield f"line {number}", {"error": f"Invalid JSON: {e}"}
+                    continue
+                yield _with_id(record, f"line {number}")
+    else:
+        for number, record in enumerate(source):
+            yield _with_id(record, number)
+
+
+def _with_id(record: Any, default_id: Any) -> tuple[Any, Any]:
+    if isinstance(record, dict) and "history" in record:
+        return record.get("id", default_id), record["history"]
+    return default_id, record
+
+
+def evaluate_run(run_id: Any, history: Any, matcher: DomainMatcher, min_ratio: float = 0.4) -> dict:
+    """Compact per-run report: ok, total, approved, ratio and the hosts that were not approved."""
+    if isinstance(history, dict) and "error" in history:
+        return {"id": run_id, "error": history["error"]}
+    try:
+        payload = select_reference_payload(history)
+        if payload is None:
+            ok, report = False, {"total": 0, "approved": 0, "ratio": 0.0, "details": []}
+        else:
+            ok, report = evaluate_anytext_against_domains(matcher, payload, min_ratio=min_ratio)
+    except Exception as e:
+        return {"id": run_id, "error": f"{type(e).__name__}: {e}"}
+
+    failing = [d.get("host") or "-" for d in report["details"] if not d.get("approved")]
+    return {"id": run_id, "ok": ok, "total": report["total"], "approved": report["approved"],
+            "ratio": report["ratio"], "failing_hosts": failing}
+
+
+# --- process pool ---
+_matcher: DomainMatcher | None = None
+
+
+def _init_worker(matcher: DomainMatcher) -> None:
+    global _matcher
+    _matcher = matcher
+
+
+def _evaluate_batch(batch: list[tuple[Any, Any]], min_ratio: float) -> list[dict]:
+    return [evaluate_run(run_id, history, _matcher, min_ratio) for run_id, history in batch]
+
+
+def _batches(items: Iterator, size: int) -> Iterator[list]:
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def evaluate_histories(source: str | Iterable, TOP_DOMAINS: Iterable[str], min_ratio: float = 0.4,
+                       workers: int | None = None, batch_size: int = BATCH_SIZE) -> Iterator[dict]:
+    """Per-run reports, in input order, streamed as batches complete."""
+    runs = iter_histories(source)
+    workers = workers or os.cpu_count() or 1
+    matcher = compile_domains(TOP_DOMAINS)
+    if workers == 1:
+        for run_id, history in runs:
+            yield evaluate_run(run_id, history, matcher, min_ratio)
+        return
+
+    # the compiled matcher pickles as plain dicts/sets, so each worker gets the same rules
+    # (including custom public suffixes) without recompiling
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(matcher,)) as pool:
+        pending = deque()
+        for batch in _batches(runs, batch_size):
+            pending.append(pool.submit(_evaluate_batch, batch, min_ratio))
+            if len(pending) >= 2 * workers:  # bounded: don't read the whole file ahead of the workers
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+# --- aggregate ---
+def _percentile(sorted_values: list[float], q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = q * (len(sorted_values) - 1)
+    low = int(index)
+    high = min(low + 1, len(sorted_values) - 1)
+    return sorted_values[low] + (sorted_values[high] - sorted_values[low]) * (index - low)
+
+
+def summarize(reports: Iterable[dict], min_ratio: float = 0.4, top_hosts: int = TOP_FAILING_HOSTS) -> dict:
+    """Fold per-run reports into pass rate, ratio distribution and the most frequent unapproved hosts."""
+    ratios, error_samples = [], []
+    passed = links = approved = no_links = errors = 0
+    failing = Counter()
+    for report in reports:
+        if "error" in report:
+            errors += 1
+            if len(error_samples) < 10:
+                error_samples.append({"id": report["id"], "error": report["error"]})
+            continue
+        ratios.append(report["ratio"])
+        passed += report["ok"]
+        links += report["total"]
+        approved += report["approved"]
+        no_links += report["total"] == 0
+        failing.update(report["failing_hosts"])
+
+    ratios.sort()
+    histogram = [0] * RATIO_BINS
+    for ratio in ratios:
+        histogram[min(int(ratio * RATIO_BINS), RATIO_BINS - 1)] += 1
+    runs = len(ratios)
+    return {
+        "runs": runs,
+        "passed": passed,
+        "pass_rate": passed / runs if runs else 0.0,
+        "min_ratio": min_ratio,
+        "runs_without_links": no_links,
+        "links": links,
+        "approved_links": approved,
+        "ratio": {
+            "mean": sum(ratios) / runs if runs else 0.0,
+            **{f"p{int(q * 100)}": _percentile(ratios, q) for q in (0.1, 0.25, 0.5, 0.75, 0.9)},
+            "min": ratios[0] if ratios else 0.0,
+            "max": ratios[-1] if ratios else 0.0,
+            "histogram": histogram,
+        },
+        "top_failing_hosts": failing.most_common(top_hosts),
+        "errors": errors,
+        "error_samples": error_samples,
+    }
+
+
+def batch_evaluate(source: str | Iterable, TOP_DOMAINS: Iterable[str], min_ratio: float = 0.4,
+                   workers: int | None = None, runs_out: str | None = None) -> dict:
+    """
+    Evaluate every run in `source` and return the aggregate report (see `summarize`).
+    With `runs_out`, per-run reports are also written there as JSONL.
+
+    Example:
+        summary = batch_evaluate("runs.jsonl", TOP_DOMAINS, min_ratio=0.4)
+        utils.print_html(format_batch_report(summary), title="Batch evaluation")
+    """
+    reports = evaluate_histories(source, TOP_DOMAINS, min_ratio=min_ratio, workers=workers)
+    if not runs_out:
+        return summarize(reports, min_ratio=min_ratio)
+
+    with open(runs_out, "w", encoding="utf-8") as out:
+        def written():
+            for report in reports:
+                out.write(json.dumps(report, ensure_ascii=False, default=str) + "\n")
+                yield report
+        return summarize(written(), min_ratio=min_ratio)
+
+
+def format_batch_report(summary: dict) -> str:
+    """Markdown version of a `summarize` report."""
+    r = summary["ratio"]
+    lines = [
+        f"### Batch Evaluation — Top Domains ({summary['passed']}/{summary['runs']} PASS, {summary['pass_rate']:.0%})",
+        f"- Runs: {summary['runs']} ({summary['runs_without_links']} without links, {summary['errors']} errors)",
+        f"- Links: {summary['links']} ({summary['approved_links']} approved)",
+        f"- Ratio: mean {r['mean']:.0%}, p10 {r['p10']:.0%}, median {r['p50']:.0%}, p90 {r['p90']:.0%} "
+        f"(min {int(summary['min_ratio'] * 100)}%)",
+        "",
+        "| Ratio | Runs |", "|---|---:|",
+    ]
+    width = 100 // RATIO_BINS
+    for i, count in enumerate(r["histogram"]):
+        lines.append(f"| {i * width}–{(i + 1) * width}% | {count} |")
+    lines += ["", "| Unapproved host | Links |", "|---|---:|"]
+    lines += [f"| {host} | {count} |" for host, count in summary["top_failing_hosts"]]
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("source", help="JSONL file of histories")
+    parser.add_argument("--domains", nargs="*", default=[])
+    parser.add_argument("--domains-file", help="one domain per line")
+    parser.add_argument("--min-ratio", type=float, default=0.4)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--runs-out", help="write per-run reports to this JSONL file")
+    parser.add_argument("--json", action="store_true", help="print the summary as JSON")
+    args = parser.parse_args()
+
+    domains = set(args.domains)
+    if args.domains_file:
+        with open(args.domains_file, encoding="utf-8") as f:
+            domains.update(line.strip() for line in f if line.strip() and not line.startswith("#"))
+    if not domains:
+        parser.error("no domains given (--domains or --domains-file)")
+
+    summary = batch_evaluate(args.source, domains, min_ratio=args.min_ratio, workers=args.workers,
+                             runs_out=args.runs_out)
+    print(json.dumps(summary, indent=2) if args.json else format_batch_report(summary))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Benchmark: batch_eval over synthetic agent transcripts, at increasing worker counts.
+
+Writes a JSONL file of N histories (planner/research/editor steps, with links to
+allow-listed hosts, other hosts and lookalikes), then times `batch_evaluate` with
+1, 2, 4, ... workers up to the number of cores and prints runs/s and speedup.
+
+Usage (from this folder):
+    python bench_batch_eval.py                      # 20k runs
+    python bench_batch_eval.py --runs 100000 --links 30
+"""
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+
+from batch_eval import batch_evaluate
+
+TOP_DOMAINS = {
+    "wikipedia.org", "nature.com", "science.org", "arxiv.org", "nasa.gov",
+    "mit.edu", "stanford.edu", "harvard.edu", "acm.org", "ieee.org", "openreview.net",
+}
+OTHER_HOSTS = ["medium.com", "example.com", "blog.somecorp.io", "news.ycombinator.com", "reddit.com",
+               "notarxiv.org.evil.com", "arxiv.org.mirror.cn", "towardsdatascience.com"]
+
+
+def make_history(rng: random.Random, links: int) -> list:
+    refs = []
+    for i in range(links):
+        host = rng.choice(sorted(TOP_DOMAINS)) if rng.random() < 0.55 else rng.choice(OTHER_HOSTS)
+        prefix = rng.choice(["", "www.", "en.", "export."])
+        refs.append(f"{i + 1}. Reference title {rng.randint(1, 10**6)} — https://{prefix}{host}/p/{rng.randint(1, 10**6)}")
+    research = "Here are the sources I found:\n" + "\n".join(refs) + "\n" + "Discussion. " * rng.randint(20, 200)
+    return [
+        ["Research the topic", "research_agent", research],
+        ["Draft the report", "writer_agent", "# Report\n" + "Body text. " * 300],
+        ["Edit the draft", "editor_agent", "# Final\n" + "Edited text. " * 300],
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=20_000)
+    parser.add_argument("--links", type=int, default=15, help="average links per research output")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    fd, path = tempfile.mkstemp(suffix=".jsonl")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            for i in range(args.runs):
+                history = make_history(rng, rng.randint(0, 2 * args.links))
+                f.write(json.dumps({"id": f"run-{i}", "history": history}) + "\n")
+        print(f"{args.runs:,} runs, {os.path.getsize(path) / 1e6:.0f} MB of JSONL")
+
+        cores = os.cpu_count() or 1
+        counts = sorted({1, *[w for w in (2, 4, 8, 16, 32, 64) if w <= cores], cores})
+        baseline = None
+        for workers in counts:
+            start = time.perf_counter()
+            summary = batch_evaluate(path, TOP_DOMAINS, workers=workers)
+            elapsed = time.perf_counter() - start
+            baseline = baseline or elapsed
+            print(f"workers={workers:3d}  {elapsed:6.2f} s  {summary['runs'] / elapsed:9,.0f} runs/s  "
+                  f"speedup {baseline / elapsed:4.1f}x  pass rate {summary['pass_rate']:.0%}")
+        print("top unapproved hosts:", summary["top_failing_hosts"][:5])
+    finally:
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
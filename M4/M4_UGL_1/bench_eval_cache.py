@@ -0,0 +1,74 @@
+"""
+Benchmark: memoized vs. direct evaluation of the same research output.
+
+Times evaluate_tavily_results and evaluate_references on a realistic output
+(cold: computed, warm: memory hit, disk: fresh process-like cache reading the
+SQLite file) and checks that cached results equal the direct ones.
+
+Usage (from this folder):
+    python bench_eval_cache.py
+    python bench_eval_cache.py --links 200 --repeat 20000
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from eval_cache import EvaluationCache, memoized_evaluation
+from utils import evaluate_references, evaluate_tavily_results
+
+TOP_DOMAINS = {"wikipedia.org", "nature.com", "science.org", "arxiv.org", "nasa.gov",
+               "mit.edu", "stanford.edu", "harvard.edu", "acm.org", "ieee.org", "openreview.net"}
+HOSTS = sorted(TOP_DOMAINS) + ["medium.com", "example.com", "notarxiv.org.evil.com"]
+
+
+def per_call_us(func, repeat: int, *args, **kwargs) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func(*args, **kwargs)
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--links", type=int, default=30)
+    parser.add_argument("--repeat", type=int, default=5000)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    output = "\n".join(f"{i + 1}. Paper {i} — https://{rng.choice(HOSTS)}/abs/{rng.randint(1, 10**6)} " + "notes " * 40
+                       for i in range(args.links))
+    history = [("Research", "research_agent", output), ("Write", "writer_agent", "draft " * 2000),
+               ("Edit", "editor_agent", "final " * 2000)]
+
+    fd, path = tempfile.mkstemp(suffix=".sqlite")
+    os.close(fd)
+    try:
+        for label, func, call_args in [
+            ("evaluate_tavily_results", evaluate_tavily_results, (TOP_DOMAINS, output)),
+            ("evaluate_references", evaluate_references, (history, TOP_DOMAINS)),
+        ]:
+            direct = per_call_us(func, max(args.repeat // 50, 20), *call_args)
+            cache = EvaluationCache(path=path)
+            cached = memoized_evaluation(func, cache=cache)
+            start = time.perf_counter()
+            first = cached(*call_args)
+            cold = (time.perf_counter() - start) * 1e6
+            warm = per_call_us(cached, args.repeat, *call_args)
+            assert first == func(*call_args) == cached(*call_args)
+
+            restarted = memoized_evaluation(func, cache=EvaluationCache(path=path))
+            start = time.perf_counter()
+            assert restarted(*call_args) == first
+            disk = (time.perf_counter() - start) * 1e6
+            print(f"{label:24s} direct {direct:9.1f} us  cold {cold:9.1f} us  warm {warm:6.1f} us  "
+                  f"disk {disk:7.1f} us  ({direct / warm:,.0f}x)")
+    finally:
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(path + suffix):
+                os.remove(path + suffix)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Benchmark: URL extraction throughput (MB/s) on a large synthetic transcript.
+
+Compares the previous extractor (regex findall + urlparse per match) with
+url_extract: in-memory text, deduplicated text, a file scanned via mmap and a
+binary stream read in 1 MiB chunks.
+
+Usage (from this folder):
+    python bench_url_extract.py                 # 50 MB transcript
+    python bench_url_extract.py --mb 200 --url-every 40
+"""
+import argparse
+import os
+import random
+import re
+import tempfile
+import time
+import urllib.parse
+
+from url_extract import iter_file_urls, iter_urls
+
+LEGACY_URL_RE = re.compile(r"https?://[^\s\)\]\}<>\"']+", re.IGNORECASE)
+HOSTS = ["arxiv.org", "www.nature.com", "en.wikipedia.org", "export.arxiv.org", "medium.com",
+         "user@example.com:8080", "news.ycombinator.com", "www.science.org", "openreview.net"]
+WORDS = "the model results show that retrieval agents improve evaluation of sources and papers".split()
+
+
+def legacy_extract(text: str) -> list[tuple[str, str]]:
+    items = []
+    for url in LEGACY_URL_RE.findall(text):
+        host = urllib.parse.urlparse(url).hostname or ""
+        items.append((url, host[4:] if host.startswith("www.") else host))
+    return items
+
+
+def make_transcript(rng: random.Random, size: int, url_every: int) -> str:
+    parts, length = [], 0
+    while length < size:
+        if rng.randrange(url_every) == 0:
+            piece = f"(https://{rng.choice(HOSTS)}/abs/{rng.randint(1, 5000)}?ref=agent)"
+        else:
+            piece = rng.choice(WORDS)
+        parts.append(piece)
+        length += len(piece) + 1
+    return " ".join(parts)
+
+
+def timed(label: str, mb: float, func) -> int:
+    start = time.perf_counter()
+    count = func()
+    elapsed = time.perf_counter() - start
+    print(f"{label:28s} {elapsed:7.2f} s  {mb / elapsed:8.1f} MB/s  {count:>10,} urls")
+    return count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mb", type=float, default=50)
+    parser.add_argument("--url-every", type=int, default=20, help="one URL per N tokens on average")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    text = make_transcript(random.Random(args.seed), int(args.mb * 1e6), args.url_every)
+    mb = len(text.encode("utf-8")) / 1e6
+    print(f"transcript: {mb:.1f} MB")
+
+    fd, path = tempfile.mkstemp(suffix=".txt")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(text)
+
+        legacy = timed("legacy findall + urlparse", mb, lambda: len(legacy_extract(text)))
+        fast = timed("url_extract str", mb, lambda: sum(1 for _ in iter_urls(text, unique=False)))
+        timed("url_extract str, unique", mb, lambda: sum(1 for _ in iter_urls(text)))
+        timed("url_extract mmap file", mb, lambda: sum(1 for _ in iter_file_urls(path, unique=False)))
+
+        def chunked():
+            with open(path, "rb") as f:
+                return sum(1 for _ in iter_urls(f, unique=False))
+        timed("url_extract 1 MiB chunks", mb, chunked)
+        assert legacy == fast, (legacy, fast)
+    finally:
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
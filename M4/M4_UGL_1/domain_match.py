@@ -0,0 +1,159 @@
+# ================================
+# Standard library imports
+# ================================
+import functools
+import hashlib
+from typing import Iterable
+
+# Allow-list matcher for the source evaluators (utils.evaluate_*).
+#
+# Domains are compiled once into a reversed-label trie ("arxiv.org" -> org -> arxiv), and
+# a host is matched by walking its labels right to left: O(labels) per host, independent
+# of the allow-list size, and only on whole labels, so "arxiv.org" approves
+# "export.arxiv.org" but not "notarxiv.org" or "arxiv.org.evil.com".
+#
+# Public-suffix aware: an entry that is itself a public suffix ("co.uk", "github.io",
+# "edu") only matches that exact host, since the sites under it belong to unrelated
+# owners. To approve a whole suffix on purpose, write it as "*.edu" (or ".edu").
+# PUBLIC_SUFFIXES is a built-in subset of the Public Suffix List; load the full list
+# with `load_public_suffix_list(path)` (https://publicsuffix.org/list/public_suffix_list.dat).
+
+PUBLIC_SUFFIXES = {
+    # generic second-level registries
+    "ac.uk", "co.uk", "gov.uk", "ltd.uk", "me.uk", "net.uk", "nhs.uk", "org.uk", "plc.uk", "sch.uk",
+    "com.au", "edu.au", "gov.au", "net.au", "org.au", "co.nz", "ac.nz", "govt.nz", "org.nz",
+    "co.jp", "ac.jp", "go.jp", "or.jp", "ne.jp", "co.kr", "ac.kr", "go.kr",
+    "com.cn", "edu.cn", "gov.cn", "net.cn", "org.cn", "ac.cn", "com.hk", "edu.hk", "gov.hk",
+    "com.tw", "edu.tw", "gov.tw", "com.sg", "edu.sg", "gov.sg", "co.in", "ac.in", "gov.in", "res.in",
+    "com.br", "edu.br", "gov.br", "org.br", "com.mx", "edu.mx", "gob.mx", "com.ar", "edu.ar",
+    "co.za", "ac.za", "gov.za", "org.za", "com.tr", "edu.tr", "gov.tr", "co.il", "ac.il",
+    "ac.at", "co.at", "or.at", "com.es", "edu.es", "gob.es", "com.pl", "edu.pl", "gov.pl",
+    # hosting platforms (private section of the list)
+    "github.io", "gitlab.io", "blogspot.com", "wordpress.com", "herokuapp.com", "netlify.app",
+    "vercel.app", "pages.dev", "web.app", "firebaseapp.com", "appspot.com", "azurewebsites.net",
+    "cloudfront.net", "s3.amazonaws.com", "substack.com", "medium.com", "readthedocs.io",
+}
+
+_EXACT = "="      # trie node key: entry matches this exact host
+_SUBTREE = "*"    # trie node key: entry matches this host and everything under it
+
+
+def normalize_host(value: str) -> str:
+    """'https://WWW.Nature.com:443/x' -> 'nature.com' (lowercase, IDNA, no www./port/trailing dot)."""
+    host = (value or "").strip().lower()
+    if "://" in host:
+        host = host.split("://", 1)[1]
+    host = host.split("/", 1)[0].split("?", 1)[0].split("#", 1)[0]
+    host = host.rsplit("@", 1)[-1]
+    if host.startswith("["):                        # IPv6 literal
+        return host.split("]", 1)[0] + "]"
+    host = host.split(":", 1)[0].strip(".")
+    if host.startswith("www."):
+        host = host[4:]
+    if not host.isascii():
+        try:
+            host = host.encode("idna").decode("ascii")
+        except UnicodeError:
+            pass
+    return host
+
+
+def is_public_suffix(domain: str, suffixes: set[str] = PUBLIC_SUFFIXES) -> bool:
+    return "." not in domain or domain in suffixes
+
+
+def registrable_domain(host: str, suffixes: set[str] = PUBLIC_SUFFIXES) -> str:
+    """Public suffix plus one label: 'export.arxiv.org' -> 'arxiv.org', 'x.y.ox.ac.uk' -> 'ox.ac.uk'."""
+    labels = host.split(".")
+    for i in range(1, len(labels) - 1):
+        if ".".join(labels[i:]) in suffixes:
+            return ".".join(labels[i - 1:])
+    return ".".join(labels[-2:])
+
+
+def load_public_suffix_list(path: str) -> set[str]:
+    """Read the Mozilla public_suffix_list.dat format into a set (wildcard/exception rules skipped)."""
+    suffixes = set()
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            rule = line.split("//", 1)[0].strip()
+            if rule and rule[0] not in "*!":
+                suffixes.add(normalize_host(rule))
+    return suffixes
+
+
+class DomainMatcher:
+    """
+    Compiled allow-list.
+
+    Example:
+        matcher = DomainMatcher({"arxiv.org", "nature.com", "*.edu"})
+        matcher.match("export.arxiv.org")       # -> "arxiv.org"
+        matcher.match("notarxiv.org.evil.com")  # -> None
+        matcher.match_url("https://cs.stanford.edu/x")  # -> "*.edu"
+    """
+
+    def __init__(self, domains: Iterable[str], public_suffixes: set[str] = PUBLIC_SUFFIXES):
+        self._root: dict = {}
+        self._rules: set[tuple[str, str]] = set()
+        self._fingerprint: str | None = None
+        self.size = 0
+        for entry in domains:
+            self.add(entry, public_suffixes)
+
+    def add(self, entry: str, public_suffixes: set[str] = PUBLIC_SUFFIXES) -> None:
+        raw = (entry or "").strip()
+        wildcard = raw.startswith(("*.", "."))
+        domain = normalize_host(raw.lstrip("*."))
+        if not domain:
+            return
+        node = self._root
+        for label in reversed(domain.split(".")):
+            node = node.setdefault(label, {})
+        exact_only = not wildcard and is_public_suffix(domain, public_suffixes)
+        node[_EXACT if exact_only else _SUBTREE] = raw
+        self._rules.add((domain, _EXACT if exact_only else _SUBTREE))
+        self._fingerprint = None
+        self.size += 1
+
+    @property
+    def fingerprint(self) -> str:
+        """Hash of the compiled rules, equal for lists that differ only in spelling ("www.", case, URLs)."""
+        if self._fingerprint is None:
+            rules = "\n".join(f"{mode}{domain}" for domain, mode in sorted(self._rules))
+            self._fingerprint = hashlib.sha256(rules.encode("utf-8")).hexdigest()[:32]
+        return self._fingerprint
+
+    def match(self, host: str) -> str | None:
+        """The allow-list entry approving `host` (already normalized), or None."""
+        if not host:
+            return None
+        node = self._root
+        for label in reversed(host.split(".")):
+            node = node.get(label)
+            if node is None:
+                return None
+            if _SUBTREE in node:
+                return node[_SUBTREE]
+        return node.get(_EXACT)
+
+    def match_url(self, url: str) -> str | None:
+        return self.match(normalize_host(url))
+
+    def __contains__(self, host: str) -> bool:
+        return self.match(host) is not None
+
+    def __len__(self) -> int:
+        return self.size
+
+
+@functools.lru_cache(maxsize=32)
+def _compile(domains: frozenset) -> DomainMatcher:
+    return DomainMatcher(domains)
+
+
+def compile_domains(domains: Iterable[str]) -> DomainMatcher:
+    """Matcher for `domains`, built once per distinct allow-list (a DomainMatcher passes through)."""
+    if isinstance(domains, DomainMatcher):
+        return domains
+    return _compile(frozenset(domains))
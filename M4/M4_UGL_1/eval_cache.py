@@ -0,0 +1,187 @@
+# ================================
+# Standard library imports
+# ================================
+import functools
+import hashlib
+import inspect
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable
+
+# ================================
+# Personal / local imports
+# ================================
+from domain_match import compile_domains
+from utils import evaluate_references, evaluate_tavily_results
+
+# Memoized evaluation results (evaluate_tavily_results / evaluate_references).
+#
+# - Key: evaluator name + a content digest (SHA-256, 128 bits) of every argument; TOP_DOMAINS
+#   is keyed by the compiled matcher's fingerprint, so the same allow-list spelled differently
+#   ("www.", case, order) shares entries and any real change to it misses.
+# - The bounded in-memory LRU and the optional SQLite file behind it use that same key, so
+#   cached entries hold digests, not payloads, and a lookup hashes the payload once. The
+#   SQLite file lets results survive notebook restarts and be shared between graders /
+#   dashboards on the same machine.
+# - Results are returned as stored: treat them as read-only.
+#
+#   evaluate = memoized_evaluation(utils.evaluate_tavily_results)
+#   flag, report = evaluate(TOP_DOMAINS, research_output, min_ratio=0.4)   # computed
+#   flag, report = evaluate(TOP_DOMAINS, research_output, min_ratio=0.4)   # from memory
+#
+# Env:
+#   EVAL_CACHE_PATH   SQLite file for on-disk persistence (default: memory only)
+#   EVAL_CACHE=0      disable memoization
+
+MAX_ENTRIES = 4096
+MAX_DISK_ENTRIES = 100_000
+DOMAINS_ARG = "TOP_DOMAINS"
+
+
+def _feed(digest, value: Any) -> None:
+    # Texts and lists/tuples (histories) are hashed piece by piece, length-prefixed, without
+    # serializing them first; anything else (dicts, numbers) goes through JSON.
+    if isinstance(value, str):
+        value = value.encode("utf-8", "surrogatepass")
+        digest.update(b"s%d:" % len(value))
+        digest.update(value)
+    elif isinstance(value, bytes):
+        digest.update(b"b%d:" % len(value))
+        digest.update(value)
+    elif isinstance(value, (list, tuple)):
+        digest.update(b"l%d:" % len(value))
+        for item in value:
+            _feed(digest, item)
+    else:
+        data = json.dumps(value, sort_keys=True, default=str, ensure_ascii=False).encode("utf-8", "surrogatepass")
+        digest.update(b"j%d:" % len(data))
+        digest.update(data)
+
+
+def payload_digest(value: Any) -> str:
+    """Short content hash of an evaluator argument (text, history, result list, number...)."""
+    digest = hashlib.sha256()  # hardware-accelerated on most CPUs, faster than blake2b here
+    _feed(digest, value)
+    return digest.hexdigest()[:32]
+
+
+def _encode(value: Any) -> str:
+    return json.dumps({"tuple": isinstance(value, tuple), "value": value}, default=str)
+
+
+def _decode(raw: str) -> Any:
+    data = json.loads(raw)
+    return tuple(data["value"]) if data["tuple"] else data["value"]
+
+
+class EvaluationCache:
+    def __init__(self, max_entries: int = MAX_ENTRIES, path: str | None = None,
+                 max_disk_entries: int = MAX_DISK_ENTRIES):
+        self.max_entries = max_entries
+        self.max_disk_entries = max_disk_entries
+        self.path = path if path is not None else os.getenv("EVAL_CACHE_PATH") or None
+        self.enabled = os.getenv("EVAL_CACHE", "1") != "0"
+        self.stats = {"hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0}
+        self._entries: OrderedDict[str, Any] = OrderedDict()  # digest key -> result
+        self._lock = threading.Lock()
+        self._conn = None
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS evaluations (
+                    key TEXT PRIMARY KEY,
+                    value TEXT,
+                    created REAL
+                )""")
+        return self._conn
+
+    def get(self, key: str) -> tuple[bool, Any]:
+        """(found, value): memory first, then the SQLite file if one is configured."""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.stats["hits"] += 1
+                return True, self._entries[key]
+            if self.path:
+                row = self._db().execute("SELECT value FROM evaluations WHERE key = ?", (key,)).fetchone()
+                if row is not None:
+                    value = _decode(row[0])
+                    self._remember(key, value)
+                    self.stats["disk_hits"] += 1
+                    return True, value
+            self.stats["misses"] += 1
+            return False, None
+
+    def set(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._remember(key, value)
+            if self.path:
+                db = self._db()
+                db.execute("INSERT OR REPLACE INTO evaluations (key, value, created) VALUES (?, ?, ?)",
+                           (key, _encode(value), time.time()))
+                db.execute("DELETE FROM evaluations WHERE key IN (SELECT key FROM evaluations "
+                           "ORDER BY created DESC LIMIT -1 OFFSET ?)", (self.max_disk_entries,))
+                db.commit()
+
+    def _remember(self, key: str, value: Any) -> None:
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats["evictions"] += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            if self.path:
+                self._db().execute("DELETE FROM evaluations")
+                self._db().commit()
+
+    def info(self) -> dict:
+        return {**self.stats, "entries": len(self._entries), "max_entries": self.max_entries, "path": self.path}
+
+
+evaluation_cache = EvaluationCache()
+
+
+def memoized_evaluation(func: Callable, cache: EvaluationCache | None = None) -> Callable:
+    """
+    Wrap an evaluator so identical calls (same payload, allow-list and parameters)
+    are answered from `cache` (default: the module-level `evaluation_cache`).
+    """
+    parameters = inspect.signature(func).parameters
+    names = list(parameters)
+    defaults = {n: p.default for n, p in parameters.items() if p.default is not inspect.Parameter.empty}
+    name = f"{func.__module__}.{func.__qualname__}"
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        store = cache or evaluation_cache
+        if not store.enabled:
+            return func(*args, **kwargs)
+        arguments = {**defaults, **dict(zip(names, args)), **kwargs}
+        if len(arguments) != len(names):  # missing/unknown argument: let the call raise
+            return func(*args, **kwargs)
+        if DOMAINS_ARG in arguments:
+            arguments[DOMAINS_ARG] = compile_domains(arguments[DOMAINS_ARG]).fingerprint
+        key = "|".join([name, *(f"{n}={payload_digest(arguments[n])}" for n in names)])
+
+        found, value = store.get(key)
+        if found:
+            return value
+        value = func(*args, **kwargs)
+        store.set(key, value)
+        return value
+
+    return wrapper
+
+
+cached_evaluate_tavily_results = memoized_evaluation(evaluate_tavily_results)
+cached_evaluate_references = memoized_evaluation(evaluate_references)
@@ -0,0 +1,275 @@
+"""
+Evaluation harness: run research agents over a task benchmark and score them.
+
+Each (agent, task) pair runs in a thread pool with bounded parallelism and
+records latency, tokens, cost, tool calls and the `evaluate_tavily_results`
+domain score. Results are summarized per agent in a Markdown table and saved
+as a JSON artifact, so prompt or model changes can be compared on quality and
+speed (`compare_benchmarks`).
+
+Agents are plain callables `agent(task) -> str`. One that accepts
+`return_usage=True` (find_references) reports its own usage; others are run
+inside a RunAccounting, which records model turns when the client is a
+MeteredClient and tool calls made through metered_tool.
+
+Example (M4 notebook):
+    import eval_harness
+    result = eval_harness.run_benchmark(
+        {"find_references": find_references,
+         "find_references_mini": functools.partial(find_references, model="openai:gpt-4o-mini")},
+        "benchmark_tasks.yaml", max_workers=4, label="baseline",
+    )
+    utils.print_html(eval_harness.format_benchmark_table(result), title="Benchmark")
+
+The M5 research_agent is passed the same way ({"research_agent": research_agent}).
+
+CLI, for saved artifacts:
+    python eval_harness.py show benchmark_runs/baseline_2025-11-07_14-16-29.json
+    python eval_harness.py compare benchmark_runs/baseline_*.json benchmark_runs/new-prompt_*.json
+"""
+# ================================
+# Standard library imports
+# ================================
+import argparse
+import inspect
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Callable
+
+# ================================
+# Personal / local imports
+# ================================
+from agent_accounting import RunAccounting
+from utils import score_text_against_domains
+
+DEFAULT_MIN_RATIO = 0.4
+ARTIFACT_DIR = "benchmark_runs"
+
+
+# --- benchmark file ---
+def load_benchmark(path: str) -> dict:
+    """
+    Read a YAML or JSON benchmark: {"tasks": [...], "top_domains": [...], "min_ratio": 0.4}
+    or a bare list of tasks. A task is a string or {"id", "task", "min_ratio"?, "top_domains"?}.
+    """
+    with open(path, encoding="utf-8") as f:
+        if path.endswith((".yaml", ".yml")):
+            import yaml  # pip install pyyaml
+
+            data = yaml.safe_load(f)
+        else:
+            data = json.load(f)
+
+    if isinstance(data, list):
+        data = {"tasks": data}
+    tasks = []
+    for number, task in enumerate(data.get("tasks") or [], 1):
+        if isinstance(task, str):
+            task = {"task": task}
+        if not task.get("task"):
+            raise ValueError(f"{path}: task {number} has no 'task' text")
+        tasks.append({"id": str(task.get("id") or f"task-{number}"), **task})
+    return {
+        "path": path,
+        "tasks": tasks,
+        "top_domains": set(data.get("top_domains") or []),
+        "min_ratio": float(data.get("min_ratio", DEFAULT_MIN_RATIO)),
+    }
+
+
+# --- running ---
+def _call_agent(name: str, agent: Callable, task: str) -> tuple[Any, dict]:
+    """Run one task; returns (output, usage summary from agent_accounting)."""
+    try:
+        reports_usage = "return_usage" in inspect.signature(agent).parameters
+    except (TypeError, ValueError):
+        reports_usage = False
+    if reports_usage:
+        result = agent(task, return_usage=True)
+        return result[0], result[-1]
+    with RunAccounting(name) as run:
+        output = agent(task)
+    return output, run.summary()
+
+
+def run_task(agent_name: str, agent: Callable, spec: dict, benchmark: dict, repeat: int = 0) -> dict:
+    """One benchmark row: latency, usage and domain score for `agent` on `spec`."""
+    top_domains = set(spec.get("top_domains") or benchmark["top_domains"])
+    min_ratio = float(spec.get("min_ratio", benchmark["min_ratio"]))
+    row = {"agent": agent_name, "task_id": spec["id"], "repeat": repeat, "min_ratio": min_ratio}
+
+    start = time.perf_counter()
+    try:
+        output, usage = _call_agent(agent_name, agent, spec["task"])
+        error = None
+    except Exception as e:
+        output, usage, error = "", {}, f"{type(e).__name__}: {e}"
+    row["latency_seconds"] = round(time.perf_counter() - start, 3)
+
+    output = output if isinstance(output, str) else str(output)
+    if error is None and output.startswith("[Model Error"):
+        error = output
+    scores = score_text_against_domains(top_domains, output)
+    row.update({
+        "error": error,
+        "passed": error is None and scores["total"] > 0 and scores["ratio"] >= min_ratio,
+        "ratio": round(scores["ratio"], 4),
+        "links": scores["total"],
+        "trusted_links": scores["trusted"],
+        "turns": usage.get("turns", 0),
+        "prompt_tokens": usage.get("prompt_tokens", 0),
+        "completion_tokens": usage.get("completion_tokens", 0),
+        "total_tokens": usage.get("total_tokens", 0),
+        "cost_usd": usage.get("cost_usd"),
+        "llm_seconds": usage.get("llm_seconds"),
+        "tool_seconds": usage.get("tool_seconds"),
+        "tool_calls": usage.get("tool_calls", 0),
+        "tool_errors": usage.get("tool_errors", 0),
+        "budget_exceeded": usage.get("budget_exceeded"),
+        "output": output,
+    })
+    return row
+
+
+def run_benchmark(
+    agents: dict[str, Callable],
+    benchmark: str | dict,
+    max_workers: int = 4,
+    repeats: int = 1,
+    label: str | None = None,
+    artifact_dir: str | None = ARTIFACT_DIR,
+) -> dict:
+    """
+    Run every agent on every task (`repeats` times) with at most `max_workers`
+    runs in flight. Returns {"label", "summary": {agent: ...}, "results": [rows]}
+    and writes it to `artifact_dir/<label>_<timestamp>.json` (skip with artifact_dir=None).
+    """
+    if isinstance(benchmark, str):
+        benchmark = load_benchmark(benchmark)
+    jobs = [(name, agent, spec, r) for r in range(repeats) for spec in benchmark["tasks"]
+            for name, agent in agents.items()]
+
+    created_at = datetime.now()
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        rows = list(pool.map(lambda job: run_task(job[0], job[1], job[2], benchmark, job[3]), jobs))
+    wall_seconds = time.perf_counter() - start
+
+    label = label or "benchmark"
+    result = {
+        "label": label,
+        "created_at": created_at.isoformat(timespec="seconds"),
+        "benchmark": benchmark.get("path"),
+        "max_workers": max_workers,
+        "repeats": repeats,
+        "wall_seconds": round(wall_seconds, 3),
+        "summary": {name: summarize_rows([r for r in rows if r["agent"] == name]) for name in agents},
+        "results": rows,
+    }
+    if artifact_dir:
+        os.makedirs(artifact_dir, exist_ok=True)
+        path = os.path.join(artifact_dir, f"{label}_{created_at.strftime('%Y-%m-%d_%H-%M-%S')}.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2, ensure_ascii=False)
+        result["artifact"] = path
+    return result
+
+
+# --- reporting ---
+def _percentile(values: list[float], q: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(int(round(q * (len(values) - 1))), len(values) - 1)]
+
+
+def summarize_rows(rows: list[dict]) -> dict:
+    n = len(rows) or 1
+    latencies = [r["latency_seconds"] for r in rows]
+    costs = [r["cost_usd"] for r in rows if r["cost_usd"] is not None]
+    return {
+        "runs": len(rows),
+        "passed": sum(r["passed"] for r in rows),
+        "pass_rate": sum(r["passed"] for r in rows) / n,
+        "mean_ratio": sum(r["ratio"] for r in rows) / n,
+        "latency_p50": _percentile(latencies, 0.5),
+        "latency_p95": _percentile(latencies, 0.95),
+        "mean_tokens": sum(r["total_tokens"] for r in rows) / n,
+        "mean_tool_calls": sum(r["tool_calls"] for r in rows) / n,
+        "cost_usd": round(sum(costs), 6) if costs else None,
+        "errors": sum(1 for r in rows if r["error"]),
+    }
+
+
+def format_benchmark_table(result: dict, per_task: bool = True) -> str:
+    """Markdown summary table per agent (and, optionally, one row per task run)."""
+    lines = [
+        f"### Benchmark — {result['label']} ({result['created_at']}, {result['wall_seconds']:.1f}s wall, "
+        f"{result['max_workers']} workers)",
+        "| Agent | Pass | Mean ratio | p50 s | p95 s | Tokens/run | Tools/run | Cost $ | Errors |",
+        "|---|---:|---:|---:|---:|---:|---:|---:|---:|",
+    ]
+    for name, s in result["summary"].items():
+        cost = f"{s['cost_usd']:.4f}" if s["cost_usd"] is not None else "-"
+        lines.append(f"| {name} | {s['passed']}/{s['runs']} ({s['pass_rate']:.0%}) | {s['mean_ratio']:.0%} | "
+                     f"{s['latency_p50']:.1f} | {s['latency_p95']:.1f} | {s['mean_tokens']:,.0f} | "
+                     f"{s['mean_tool_calls']:.1f} | {cost} | {s['errors']} |")
+    if per_task:
+        lines += ["", "| Agent | Task | Status | Ratio | Links | Latency s | Tokens | Tools |",
+                  "|---|---|:---:|---:|---:|---:|---:|---:|"]
+        for r in result["results"]:
+            status = "⚠️ ERROR" if r["error"] else "✅ PASS" if r["passed"] else "❌ FAIL"
+            lines.append(f"| {r['agent']} | {r['task_id']} | {status} | {r['ratio']:.0%} | {r['links']} | "
+                         f"{r['latency_seconds']:.1f} | {r['total_tokens']:,} | {r['tool_calls']} |")
+    return "\n".join(lines)
+
+
+def compare_benchmarks(before: str | dict, after: str | dict) -> str:
+    """Markdown table of per-agent changes between two runs (artifact paths or results)."""
+    runs = []
+    for item in (before, after):
+        if isinstance(item, str):
+            with open(item, encoding="utf-8") as f:
+                item = json.load(f)
+        runs.append(item)
+    before, after = runs
+
+    lines = [f"### Benchmark comparison — {before['label']} → {after['label']}",
+             "| Agent | Pass rate | Mean ratio | p50 s | p95 s | Tokens/run | Tool calls/run |",
+             "|---|---:|---:|---:|---:|---:|---:|"]
+    for name in sorted(set(before["summary"]) | set(after["summary"])):
+        a, b = before["summary"].get(name), after["summary"].get(name)
+        if a is None or b is None:
+            lines.append(f"| {name} | {'only in ' + (after if a is None else before)['label']} | | | | | |")
+            continue
+        lines.append(
+            f"| {name} | {a['pass_rate']:.0%} → {b['pass_rate']:.0%} | {a['mean_ratio']:.0%} → {b['mean_ratio']:.0%} | "
+            f"{a['latency_p50']:.1f} → {b['latency_p50']:.1f} | {a['latency_p95']:.1f} → {b['latency_p95']:.1f} | "
+            f"{a['mean_tokens']:,.0f} → {b['mean_tokens']:,.0f} | {a['mean_tool_calls']:.1f} → {b['mean_tool_calls']:.1f} |"
+        )
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+    show = commands.add_parser("show", help="print the table of a saved artifact")
+    show.add_argument("artifact")
+    show.add_argument("--no-tasks", action="store_true")
+    compare = commands.add_parser("compare", help="compare two saved artifacts")
+    compare.add_argument("before")
+    compare.add_argument("after")
+    args = parser.parse_args()
+
+    if args.command == "show":
+        with open(args.artifact, encoding="utf-8") as f:
+            print(format_benchmark_table(json.load(f), per_task=not args.no_tasks))
+    else:
+        print(compare_benchmarks(args.before, args.after))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+# ================================
+# Standard library imports
+# ================================
+from typing import Any, Iterable
+
+# ================================
+# Personal / local imports
+# ================================
+from domain_match import compile_domains
+from utils import evaluate_anytext_against_domains, format_reference_report, looks_like_references
+
+# Incremental version of utils.evaluate_references for long, growing histories.
+#
+# evaluate_references walks the whole history and re-extracts every link on each call,
+# so evaluating after every step of a run is quadratic. Here each entry is looked at
+# once, when it is appended: the evaluator only tracks which output is the current
+# payload (latest research_agent output, else latest output with links) and scores a
+# payload once, when it becomes current. Appending is O(1) beyond reading the new
+# output, and `report()` / `passed` / `ratio` are O(1) reads of the running counts.
+#
+#   evaluator = IncrementalReferenceEvaluator(TOP_DOMAINS, min_ratio=0.4)
+#   history = EvaluatedHistory(evaluator)        # drop-in for `history = []` in executor_agent
+#   history.append((step, agent_name, output))
+#   evaluator.passed, evaluator.ratio, evaluator.report()   # same Markdown as evaluate_references
+
+
+class IncrementalReferenceEvaluator:
+    def __init__(self, TOP_DOMAINS: Iterable[str], min_ratio: float = 0.4):
+        self.matcher = compile_domains(TOP_DOMAINS)
+        self.min_ratio = min_ratio
+        self.steps = 0
+        self._research_index: int | None = None   # step of the latest research_agent output
+        self._fallback_index: int | None = None   # step of the latest output with links
+        self._payloads: dict[int, Any] = {}       # at most the two candidates above
+        self._scored_index: int | None = None
+        self._ok = False
+        self._report = self._empty_report()
+        self._markdown: str | None = None
+
+    def _empty_report(self) -> dict:
+        return {"total": 0, "approved": 0, "ratio": 0.0, "details": [], "min_ratio": self.min_ratio}
+
+    # --- ingest ---
+    def append(self, step: str, agent: str, output: Any) -> None:
+        """Ingest one history entry (step, agent, output)."""
+        index = self.steps
+        self.steps += 1
+        if agent == "research_agent":
+            self._payloads.pop(self._research_index, None)
+            self._research_index = index
+            self._payloads[index] = output
+        elif self._research_index is None and looks_like_references(output):
+            self._payloads.pop(self._fallback_index, None)
+            self._fallback_index = index
+            self._payloads[index] = output
+        else:
+            return
+        if self._research_index is not None and self._fallback_index is not None:
+            self._payloads.pop(self._fallback_index, None)  # a research_agent output always wins
+            self._fallback_index = None
+        self._score()
+
+    def extend(self, entries: Iterable[tuple[str, str, Any]]) -> None:
+        for step, agent, output in entries:
+            self.append(step, agent, output)
+
+    def sync(self, history: list[tuple[str, str, Any]]) -> None:
+        """Ingest the entries of `history` not seen yet (for code that keeps a plain list)."""
+        if len(history) < self.steps:
+            raise ValueError("history is shorter than what was already ingested; use a new evaluator")
+        self.extend(history[self.steps:])
+
+    def _score(self) -> None:
+        index = self._research_index if self._research_index is not None else self._fallback_index
+        if index == self._scored_index:
+            return
+        self._scored_index = index
+        self._markdown = None
+        if index is None:
+            self._ok, self._report = False, self._empty_report()
+        else:
+            self._ok, self._report = evaluate_anytext_against_domains(self.matcher, self._payloads[index],
+                                                                      min_ratio=self.min_ratio)
+
+    # --- current state (O(1)) ---
+    @property
+    def passed(self) -> bool:
+        return self._ok
+
+    @property
+    def total(self) -> int:
+        return self._report["total"]
+
+    @property
+    def approved(self) -> int:
+        return self._report["approved"]
+
+    @property
+    def ratio(self) -> float:
+        return self._report["ratio"]
+
+    def result(self) -> tuple[bool, dict]:
+        """(ok, report) as returned by evaluate_anytext_against_domains for the current payload."""
+        return self._ok, self._report
+
+    def report(self) -> str:
+        """Markdown PASS/FAIL, identical to evaluate_references(history, TOP_DOMAINS, min_ratio)."""
+        if self._markdown is None:
+            self._markdown = format_reference_report(self._ok, self._report, self.min_ratio)
+        return self._markdown
+
+
+class EvaluatedHistory(list):
+    """A history list that feeds every appended entry to an IncrementalReferenceEvaluator."""
+
+    def __init__(self, evaluator: IncrementalReferenceEvaluator, entries: Iterable = ()):
+        super().__init__()
+        self.evaluator = evaluator
+        self.extend(entries)
+
+    def append(self, entry: tuple[str, str, Any]) -> None:
+        super().append(entry)
+        self.evaluator.append(*entry)
+
+    def extend(self, entries: Iterable[tuple[str, str, Any]]) -> None:
+        for entry in entries:
+            self.append(entry)
@@ -0,0 +1,276 @@
+# ================================
+# Standard library imports
+# ================================
+import atexit
+import base64
+import contextlib
+import gzip
+import hashlib
+import io
+import json
+import os
+import threading
+import time
+from collections import defaultdict, deque
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+# ================================
+# Third-party imports
+# ================================
+import requests
+from requests.structures import CaseInsensitiveDict
+
+# Record/replay of the research tools' HTTP traffic ("cassettes").
+#
+# Patched at class level, so every client is covered:
+#   - requests.Session.request: the shared `session` (arXiv, Wikipedia) and TavilyClient
+#   - httpx.AsyncClient.send:   AsyncTavilyClient (only if httpx is installed)
+#
+# A cassette is a gzipped JSON file of request -> response interactions. Requests are
+# matched on method, URL (sorted query) and a hash of the body; API keys and auth headers
+# are never written. Identical requests recorded several times replay in recorded order.
+#
+# Modes:
+#   record   call the network and append every interaction to the cassette
+#   replay   never touch the network; unknown requests raise CassetteMiss
+#   auto     replay what is in the cassette, record the rest
+#
+# Latency on replay: None (instant), "recorded" (sleep the recorded time) or seconds.
+# Replayed responses don't reach the servers, so set `session.rate_limit = False` on a
+# PoliteSession while replaying (research_tools does this for RESEARCH_CASSETTE_MODE=replay).
+#
+# Env (read by `install_from_env`, called when research_tools is imported):
+#   RESEARCH_CASSETTE           cassette path, e.g. cassettes/research.json.gz
+#   RESEARCH_CASSETTE_MODE      record | replay | auto (default: replay)
+#   RESEARCH_CASSETTE_LATENCY   "recorded" or seconds (default: none)
+
+SECRET_FIELDS = {"api_key", "apikey", "key", "token"}
+KEPT_HEADERS = ("content-type", "retry-after")
+
+
+class CassetteMiss(RuntimeError):
+    """Raised in replay mode for a request that is not in the cassette."""
+
+
+def _strip_secrets(pairs):
+    return [(k, v) for k, v in pairs if k.lower() not in SECRET_FIELDS]
+
+
+def _match_key(method: str, url: str, body: bytes | None) -> str:
+    parts = urlsplit(url)
+    query = urlencode(sorted(_strip_secrets(parse_qsl(parts.query, keep_blank_values=True))))
+    url = urlunsplit((parts.scheme, parts.netloc, parts.path, query, ""))
+
+    if body:
+        try:
+            data = json.loads(body)
+            if isinstance(data, dict):
+                data = {k: v for k, v in data.items() if k.lower() not in SECRET_FIELDS}
+            body = json.dumps(data, sort_keys=True).encode("utf-8")
+        except (ValueError, UnicodeDecodeError):
+            pass
+    digest = hashlib.sha256(body or b"").hexdigest()[:16]
+    return f"{method.upper()} {url} {digest}"
+
+
+def _encode_body(body: bytes) -> dict:
+    try:
+        return {"text": body.decode("utf-8")}
+    except UnicodeDecodeError:
+        return {"base64": base64.b64encode(body).decode("ascii")}
+
+
+def _decode_body(stored: dict) -> bytes:
+    if "base64" in stored:
+        return base64.b64decode(stored["base64"])
+    return stored.get("text", "").encode("utf-8")
+
+
+class Cassette:
+    def __init__(self, path: str, mode: str = "replay", latency: float | str | None = None):
+        if mode not in ("record", "replay", "auto"):
+            raise ValueError(f"Unknown cassette mode: {mode}")
+        self.path = path
+        self.mode = mode
+        self.latency = latency
+        self.stats = {"played": 0, "recorded": 0, "misses": 0}
+        self._lock = threading.Lock()
+        self._interactions: list[dict] = []
+        self._queues: dict[str, deque] = defaultdict(deque)
+        if mode != "record" and os.path.exists(path):
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                self._interactions = json.load(f)["interactions"]
+            for item in self._interactions:
+                self._queues[item["key"]].append(item)
+        if mode == "record":
+            self._interactions = []
+
+    # --- lookup / store ---
+    def play(self, method: str, url: str, body: bytes | None) -> dict | None:
+        key = _match_key(method, url, body)
+        with self._lock:
+            queue = self._queues.get(key)
+            if queue:
+                item = queue.popleft()
+                if not queue:
+                    queue.append(item)  # keep serving the last recording
+                self.stats["played"] += 1
+            else:
+                item = None
+                if self.mode == "replay":
+                    self.stats["misses"] += 1
+        if item is None:
+            if self.mode == "replay":
+                raise CassetteMiss(f"No recorded response for {method.upper()} {url} in {self.path}")
+            return None
+        self._sleep(item["elapsed"])
+        return item
+
+    def record(self, method: str, url: str, body: bytes | None, status: int, headers, content: bytes, elapsed: float):
+        item = {
+            "key": _match_key(method, url, body),
+            "status": status,
+            "headers": {h: headers[h] for h in KEPT_HEADERS if h in headers},
+            "body": _encode_body(content),
+            "elapsed": round(elapsed, 3),
+        }
+        with self._lock:
+            self._interactions.append(item)
+            self.stats["recorded"] += 1
+
+    def _sleep(self, recorded: float) -> None:
+        if self.latency == "recorded":
+            time.sleep(recorded)
+        elif self.latency:
+            time.sleep(float(self.latency))
+
+    def save(self) -> None:
+        if not self.stats["recorded"]:
+            return
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        with self._lock, gzip.open(self.path, "wt", encoding="utf-8") as f:
+            json.dump({"version": 1, "interactions": self._interactions}, f, separators=(",", ":"))
+
+
+# --- patches ---
+_active: Cassette | None = None
+_originals: dict = {}
+
+
+def _requests_request(self, method, url, params=None, data=None, json=None, **kwargs):
+    if _active is None:
+        return _originals["requests"](self, method, url, params=params, data=data, json=json, **kwargs)
+
+    prepared = self.prepare_request(requests.Request(method, url, params=params, data=data, json=json))
+    body = prepared.body.encode("utf-8") if isinstance(prepared.body, str) else prepared.body
+
+    item = _active.play(method, prepared.url, body)
+    if item is not None:
+        response = requests.Response()
+        response.status_code = item["status"]
+        response.headers = CaseInsensitiveDict(item["headers"])
+        response.url = prepared.url
+        response.request = prepared
+        response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+        content = _decode_body(item["body"])
+        response._content = content
+        response._content_consumed = True
+        response.raw = _ReplayRaw(content)
+        return response
+
+    start = time.perf_counter()
+    response = _originals["requests"](self, method, url, params=params, data=data, json=json, **kwargs)
+    content = response.content  # reads streamed bodies too
+    _active.record(method, prepared.url, body, response.status_code, response.headers, content,
+                   time.perf_counter() - start)
+    response.raw = _ReplayRaw(content)  # streamed callers (arXiv iterparse) read .raw
+    return response
+
+
+class _ReplayRaw:
+    """Minimal stand-in for urllib3's response, enough for `.raw` readers."""
+
+    def __init__(self, content: bytes):
+        self._buffer = io.BytesIO(content)
+        self.decode_content = True
+
+    def read(self, *args, **kwargs):
+        return self._buffer.read(*args)
+
+    def close(self):
+        self._buffer.close()
+
+
+def _patch_httpx():
+    try:
+        import httpx
+    except ImportError:
+        return
+
+    original = httpx.AsyncClient.send
+    _originals["httpx"] = original
+
+    async def send(self, request, **kwargs):
+        if _active is None:
+            return await original(self, request, **kwargs)
+        body = request.content
+        item = _active.play(request.method, str(request.url), body)
+        if item is not None:
+            return httpx.Response(item["status"], headers=item["headers"], content=_decode_body(item["body"]),
+                                  request=request)
+        start = time.perf_counter()
+        response = await original(self, request, **kwargs)
+        content = await response.aread()
+        _active.record(request.method, str(request.url), body, response.status_code, response.headers, content,
+                       time.perf_counter() - start)
+        return response
+
+    httpx.AsyncClient.send = send
+
+
+def install(cassette: Cassette) -> None:
+    """Route all research HTTP traffic through `cassette` until `uninstall()`."""
+    global _active
+    if not _originals:
+        _originals["requests"] = requests.Session.request
+        requests.Session.request = _requests_request
+        _patch_httpx()
+    _active = cassette
+
+
+def uninstall() -> None:
+    global _active
+    if _active is not None:
+        _active.save()
+    _active = None
+
+
+@contextlib.contextmanager
+def use_cassette(path: str, mode: str = "replay", latency: float | str | None = None):
+    """
+    Example:
+        with use_cassette("cassettes/black_holes.json.gz", mode="auto"):
+            multi_source_search("black hole thermodynamics")
+    """
+    cassette = Cassette(path, mode=mode, latency=latency)
+    previous = _active
+    install(cassette)
+    try:
+        yield cassette
+    finally:
+        uninstall()
+        if previous is not None:
+            install(previous)
+
+
+def install_from_env() -> Cassette | None:
+    path = os.getenv("RESEARCH_CASSETTE")
+    if not path:
+        return None
+    latency = os.getenv("RESEARCH_CASSETTE_LATENCY") or None
+    if latency and latency != "recorded":
+        latency = float(latency)
+    cassette = Cassette(path, mode=os.getenv("RESEARCH_CASSETTE_MODE", "replay"), latency=latency)
+    install(cassette)
+    atexit.register(cassette.save)
+    return cassette
@@ -0,0 +1,166 @@
+# ================================
+# Standard library imports
+# ================================
+import email.utils
+import threading
+import time
+from urllib.parse import urlencode, urlsplit
+
+# ================================
+# Third-party imports
+# ================================
+import requests
+
+# Polite HTTP session for the research tools.
+#
+# - Per-host token bucket: arXiv asks for one request every 3 seconds.
+# - Single-flight: concurrent identical GETs share one upstream request
+#   (streamed responses can't be shared and are never coalesced).
+# - Retries 429/5xx and connection errors with exponential backoff, honouring Retry-After.
+# - `metrics()` reports request counts, retries, coalesced calls and queueing delay per host.
+
+# host -> (requests per second, burst size)
+HOST_RATES = {
+    "export.arxiv.org": (1 / 3, 1),
+    "en.wikipedia.org": (10, 10),
+}
+DEFAULT_RATE = (5, 5)
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class TokenBucket:
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.capacity = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """Take one token, sleeping until it is available. Returns the seconds waited."""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1  # reserve now, so waiting callers are served in order
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+
+class _Flight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.response = None
+        self.error = None
+
+
+def _retry_after_seconds(response: requests.Response) -> float | None:
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        parsed = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):  # malformed HTTP-date: fall back to normal backoff
+        return None
+    return max(0.0, parsed.timestamp() - time.time()) if parsed else None
+
+
+class PoliteSession(requests.Session):
+    def __init__(self, host_rates: dict | None = None, max_retries: int = 3, backoff: float = 1.0):
+        super().__init__()
+        self.host_rates = {**HOST_RATES, **(host_rates or {})}
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.rate_limit = True
+        self._buckets: dict[str, TokenBucket] = {}
+        self._flights: dict[tuple, _Flight] = {}
+        self._lock = threading.Lock()
+        self._metrics: dict[str, dict] = {}
+
+    # --- bookkeeping ---
+    def _host_metrics(self, host: str) -> dict:
+        return self._metrics.setdefault(host, {
+            "requests": 0, "retries": 0, "coalesced": 0, "queue_seconds": 0.0, "max_queue_seconds": 0.0,
+        })
+
+    def _bucket(self, host: str) -> TokenBucket:
+        with self._lock:
+            if host not in self._buckets:
+                self._buckets[host] = TokenBucket(*self.host_rates.get(host, DEFAULT_RATE))
+            return self._buckets[host]
+
+    def metrics(self) -> dict:
+        """Per-host counters; `avg_queue_seconds` is the mean rate-limiter delay per request."""
+        with self._lock:
+            out = {}
+            for host, m in self._metrics.items():
+                avg = m["queue_seconds"] / m["requests"] if m["requests"] else 0.0
+                out[host] = {**m, "avg_queue_seconds": round(avg, 4)}
+            return out
+
+    # --- request pipeline ---
+    def _send_with_retries(self, method: str, url: str, host: str, **kwargs) -> requests.Response:
+        attempt = 0
+        while True:
+            waited = self._bucket(host).acquire() if self.rate_limit else 0.0
+            with self._lock:
+                m = self._host_metrics(host)
+                m["requests"] += 1
+                m["queue_seconds"] += waited
+                m["max_queue_seconds"] = max(m["max_queue_seconds"], waited)
+
+            try:
+                response = super().request(method, url, **kwargs)
+            except requests.exceptions.ConnectionError:
+                if attempt >= self.max_retries:
+                    raise
+                delay = None
+            else:
+                if response.status_code not in RETRY_STATUSES or attempt >= self.max_retries:
+                    return response
+                delay = _retry_after_seconds(response)
+                response.close()
+
+            attempt += 1
+            with self._lock:
+                self._host_metrics(host)["retries"] += 1
+            time.sleep(delay if delay is not None else self.backoff * 2 ** (attempt - 1))
+
+    def request(self, method, url, **kwargs):
+        host = urlsplit(url).hostname or ""
+        if method.upper() != "GET" or kwargs.get("stream"):
+            return self._send_with_retries(method, url, host, **kwargs)
+
+        params = kwargs.get("params") or {}
+        key = (url, urlencode(sorted(params.items()) if isinstance(params, dict) else params, doseq=True))
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+            else:
+                self._host_metrics(host)["coalesced"] += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error:
+                raise flight.error
+            return flight.response
+
+        try:
+            flight.response = self._send_with_retries(method, url, host, **kwargs)
+            flight.response.content  # load the body so followers can read it too
+            return flight.response
+        except Exception as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                self._flights.pop(key, None)
+            flight.done.set()
@@ -0,0 +1,266 @@
+# ================================
+# Standard library imports
+# ================================
+import functools
+import heapq
+import math
+import os
+import re
+import sqlite3
+import threading
+from collections import Counter
+from typing import Callable
+
+# Local BM25 index over every arXiv / Tavily result the tools have fetched.
+#
+# - Stored in SQLite: one row per document (keyed by URL) and one posting per (term, doc).
+# - Incremental: each tool call adds its new results; URLs already indexed are skipped.
+# - `local_corpus_search` ranks documents with BM25 without any network call.
+#
+# Env:
+#   RESEARCH_INDEX_PATH   location of the SQLite file (default: .research_index.sqlite)
+#   RESEARCH_INDEX=0      do not index tool results
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+SNIPPET_CHARS = 300
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+STOPWORDS = frozenset("""
+a an and are as at be by for from has have in is it its of on or that the this to was were which with we our
+""".split())
+
+
+def tokenize(text: str) -> list[str]:
+    return [t for t in _TOKEN_RE.findall(text.lower()) if t not in STOPWORDS and len(t) > 1]
+
+
+def _document(source: str, item: dict) -> dict | None:
+    """Map a tool result to an indexable document, or None for errors/images."""
+    url = item.get("url")
+    if not url or "error" in item:
+        return None
+    text = item.get("summary") or item.get("content") or ""
+    return {
+        "url": url,
+        "source": source,
+        "title": item.get("title", ""),
+        "published": item.get("published"),
+        "text": text,
+    }
+
+
+class CorpusIndex:
+    def __init__(self, path: str | None = None):
+        self.path = path or os.getenv("RESEARCH_INDEX_PATH", ".research_index.sqlite")
+        self.enabled = os.getenv("RESEARCH_INDEX", "1") != "0"
+        self._lock = threading.Lock()
+        self._conn = None
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript("""
+                CREATE TABLE IF NOT EXISTS docs (
+                    id INTEGER PRIMARY KEY,
+                    url TEXT UNIQUE,
+                    source TEXT,
+                    title TEXT,
+                    published TEXT,
+                    snippet TEXT,
+                    length INTEGER
+                );
+                CREATE TABLE IF NOT EXISTS terms (
+                    term TEXT PRIMARY KEY,
+                    df INTEGER
+                ) WITHOUT ROWID;
+                CREATE TABLE IF NOT EXISTS postings (
+                    term TEXT,
+                    doc_id INTEGER,
+                    tf INTEGER,
+                    length INTEGER,
+                    PRIMARY KEY (term, doc_id)
+                ) WITHOUT ROWID;
+                CREATE TABLE IF NOT EXISTS meta (
+                    key TEXT PRIMARY KEY,
+                    value REAL
+                );
+                INSERT OR IGNORE INTO meta VALUES ('n_docs', 0), ('total_length', 0);
+            """)
+        return self._conn
+
+    # --- ingestion ---
+    def add_documents(self, docs: list[dict]) -> int:
+        """Index documents with keys url, source, title, published, text. Returns how many were new."""
+        if not docs:
+            return 0
+        with self._lock:
+            db = self._db()
+            urls = list({d["url"] for d in docs})
+            known = set()
+            for i in range(0, len(urls), 500):
+                chunk = urls[i:i + 500]
+                rows = db.execute(f"SELECT url FROM docs WHERE url IN ({','.join('?' * len(chunk))})", chunk)
+                known.update(r[0] for r in rows)
+
+            postings, df, added, total_length = [], Counter(), 0, 0
+            for doc in docs:
+                if doc["url"] in known:
+                    continue
+                known.add(doc["url"])
+                counts = Counter(tokenize(f"{doc['title']} {doc['text']}"))
+                length = sum(counts.values())
+                cur = db.execute(
+                    "INSERT INTO docs (url, source, title, published, snippet, length) VALUES (?, ?, ?, ?, ?, ?)",
+                    (doc["url"], doc["source"], doc["title"], doc.get("published"), doc["text"][:SNIPPET_CHARS], length),
+                )
+                postings.extend((term, cur.lastrowid, tf, length) for term, tf in counts.items())
+                df.update(counts.keys())
+                added += 1
+                total_length += length
+
+            postings.sort()  # insert in primary-key order
+            db.executemany("INSERT INTO postings VALUES (?, ?, ?, ?)", postings)
+            db.executemany(
+                "INSERT INTO terms VALUES (?, ?) ON CONFLICT(term) DO UPDATE SET df = df + excluded.df",
+                df.items(),
+            )
+            db.execute("UPDATE meta SET value = value + ? WHERE key = 'n_docs'", (added,))
+            db.execute("UPDATE meta SET value = value + ? WHERE key = 'total_length'", (total_length,))
+            db.commit()
+        return added
+
+    def add_results(self, source: str, results: list[dict]) -> int:
+        """Index the output of a search tool; never raises, indexing is best effort."""
+        if not self.enabled or not isinstance(results, list):
+            return 0
+        docs = [d for d in (_document(source, r) for r in results if isinstance(r, dict)) if d]
+        try:
+            return self.add_documents(docs)
+        except sqlite3.Error:
+            return 0
+
+    # --- search ---
+    def search(self, query: str, top_k: int = 5, source: str | None = None) -> list[dict]:
+        terms = set(tokenize(query))
+        if not terms:
+            return []
+        with self._lock:
+            db = self._db()
+            meta = dict(db.execute("SELECT key, value FROM meta"))
+            n_docs = meta["n_docs"]
+            if not n_docs:
+                return []
+            avg_length = meta["total_length"] / n_docs
+
+            scores: dict[int, float] = {}
+            for term in terms:
+                row = db.execute("SELECT df FROM terms WHERE term = ?", (term,)).fetchone()
+                if row is None:
+                    continue
+                idf = math.log(1 + (n_docs - row[0] + 0.5) / (row[0] + 0.5))
+                for doc_id, tf, length in db.execute("SELECT doc_id, tf, length FROM postings WHERE term = ?", (term,)):
+                    norm = tf + BM25_K1 * (1 - BM25_B + BM25_B * length / avg_length)
+                    scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (BM25_K1 + 1) / norm
+
+            if source:
+                # Filter before taking the top k, so a source-restricted query still fills k results
+                ids = list(scores)
+                allowed = set()
+                for i in range(0, len(ids), 500):
+                    chunk = ids[i:i + 500]
+                    rows = db.execute(
+                        f"SELECT id FROM docs WHERE source = ? AND id IN ({','.join('?' * len(chunk))})",
+                        [source, *chunk],
+                    )
+                    allowed.update(r[0] for r in rows)
+                scores = {k: v for k, v in scores.items() if k in allowed}
+
+            best = heapq.nlargest(top_k, scores.items(), key=lambda kv: kv[1])
+            results = []
+            for doc_id, score in best:
+                url, src, title, published, snippet = db.execute(
+                    "SELECT url, source, title, published, snippet FROM docs WHERE id = ?", (doc_id,)
+                ).fetchone()
+                results.append({
+                    "title": title,
+                    "url": url,
+                    "source": src,
+                    "published": published,
+                    "snippet": snippet,
+                    "score": round(score, 3),
+                })
+        return results
+
+    def stats(self) -> dict:
+        with self._lock:
+            db = self._db()
+            meta = dict(db.execute("SELECT key, value FROM meta"))
+            terms = db.execute("SELECT COUNT(*) FROM terms").fetchone()[0]
+        return {"documents": int(meta["n_docs"]), "terms": terms}
+
+
+corpus = CorpusIndex()
+
+
+def indexed_tool(source: str) -> Callable:
+    """Decorator: add every result list a search tool returns to the local corpus."""
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            results = func(*args, **kwargs)
+            corpus.add_results(source, results)
+            return results
+
+        return wrapper
+
+    return decorator
+
+
+def local_corpus_search(query: str, top_k: int = 5, source: str | None = None) -> list[dict]:
+    """
+    Search the local index of previously fetched arXiv papers and web results (no network).
+
+    Args:
+        query (str): Search keywords.
+        top_k (int): Maximum number of results.
+        source (str | None): Restrict to "arxiv" or "tavily".
+
+    Returns:
+        list[dict]: title, url, source, published, snippet and BM25 score per document, best first.
+    """
+    try:
+        return corpus.search(query, top_k=top_k, source=source)
+    except sqlite3.Error as e:
+        return [{"error": f"Local index unavailable: {e}"}]
+
+
+local_corpus_search_tool_def = {
+    "type": "function",
+    "function": {
+        "name": "local_corpus_search",
+        "description": "Searches the local index of arXiv papers and web pages already fetched in earlier searches. Instant and offline; use before new web/arXiv searches.",
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "query": {
+                    "type": "string",
+                    "description": "Search keywords."
+                },
+                "top_k": {
+                    "type": "integer",
+                    "description": "Maximum number of results to return.",
+                    "default": 5
+                },
+                "source": {
+                    "type": "string",
+                    "enum": ["arxiv", "tavily"],
+                    "description": "Restrict results to one source (default: both)."
+                }
+            },
+            "required": ["query"]
+        }
+    }
+}
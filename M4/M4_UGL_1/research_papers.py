@@ -0,0 +1,204 @@
+# ================================
+# Standard library imports
+# ================================
+import hashlib
+import json
+import os
+import re
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+# Full-text pipeline for arXiv papers.
+#
+# - The PDF is streamed to disk in blocks while it is hashed, and stored content-addressed
+#   as <sha256>.pdf; `refs/<arxiv id>` points at the hash, so repeat fetches skip the network.
+# - Text is extracted page by page (pypdf), in a process pool for longer papers. Workers get
+#   the file path and a page range, never the PDF bytes, and pages are written to
+#   <sha256>.pages.jsonl as they arrive, so memory stays bounded by a few pages.
+# - Pages are cut into overlapping chunks for retrieval, cached as <sha256>.chunks.jsonl.
+#
+# Env:
+#   RESEARCH_PAPER_DIR    cache directory (default: .research_papers)
+#
+# Needs `pypdf` (pip install pypdf); it is imported on first extraction only.
+
+ARXIV_PDF_URL = "https://export.arxiv.org/pdf/{arxiv_id}"
+DOWNLOAD_BLOCK = 64 * 1024
+MAX_PDF_BYTES = 50 * 1024 * 1024
+CHUNK_CHARS = 2000
+CHUNK_OVERLAP = 200
+PAGES_PER_TASK = 4
+POOL_MIN_PAGES = 8          # shorter papers are extracted in-process
+MAX_WORKERS = min(4, os.cpu_count() or 1)
+
+_ID_RE = re.compile(r"([a-z\-]+(?:\.[a-z]{2})?/\d{7}|\d{4}\.\d{4,5})(v\d+)?", re.IGNORECASE)
+_locks: dict[str, threading.Lock] = {}
+_locks_guard = threading.Lock()
+
+
+def paper_dir() -> str:
+    path = os.getenv("RESEARCH_PAPER_DIR", ".research_papers")
+    os.makedirs(os.path.join(path, "refs"), exist_ok=True)
+    return path
+
+
+def normalize_arxiv_id(value: str) -> str:
+    """'https://arxiv.org/pdf/2401.01234v2.pdf' or '2401.01234v2' -> '2401.01234v2'."""
+    match = _ID_RE.search(value or "")
+    if not match:
+        raise ValueError(f"Not an arXiv id or URL: {value!r}")
+    return match.group(1).lower() + (match.group(2) or "")
+
+
+def _lock_for(key: str) -> threading.Lock:
+    with _locks_guard:
+        return _locks.setdefault(key, threading.Lock())
+
+
+# --- download ---
+def _ref_path(root: str, arxiv_id: str) -> str:
+    return os.path.join(root, "refs", arxiv_id.replace("/", "_"))
+
+
+def download_pdf(arxiv_id: str, session) -> str:
+    """Stream the PDF into the content-addressed cache (once) and return its sha256."""
+    root = paper_dir()
+    ref = _ref_path(root, arxiv_id)
+    if os.path.exists(ref):
+        with open(ref) as f:
+            digest = f.read().strip()
+        if os.path.exists(os.path.join(root, f"{digest}.pdf")):
+            return digest
+
+    sha = hashlib.sha256()
+    size = 0
+    fd, tmp_path = tempfile.mkstemp(dir=root, suffix=".part")
+    try:
+        with os.fdopen(fd, "wb") as out, \
+                session.get(ARXIV_PDF_URL.format(arxiv_id=arxiv_id), timeout=60, stream=True) as response:
+            response.raise_for_status()
+            for block in response.iter_content(DOWNLOAD_BLOCK):
+                size += len(block)
+                if size > MAX_PDF_BYTES:
+                    raise ValueError(f"PDF larger than {MAX_PDF_BYTES // (1024 * 1024)} MB")
+                sha.update(block)
+                out.write(block)
+        digest = sha.hexdigest()
+        os.replace(tmp_path, os.path.join(root, f"{digest}.pdf"))
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+    with open(ref, "w") as f:
+        f.write(digest)
+    return digest
+
+
+# --- extraction ---
+def _page_count(pdf_path: str) -> int:
+    from pypdf import PdfReader
+    return len(PdfReader(pdf_path).pages)
+
+
+def _extract_pages(pdf_path: str, start: int, end: int) -> list[str]:
+    """Worker: text of pages [start, end). Runs in a child process for long papers."""
+    from pypdf import PdfReader
+
+    reader = PdfReader(pdf_path)
+    texts = []
+    for number in range(start, end):
+        try:
+            texts.append(reader.pages[number].extract_text() or "")
+        except Exception as e:  # one broken page shouldn't lose the paper
+            texts.append(f"[page {number + 1}: extraction failed: {e}]")
+    return texts
+
+
+def extract_pages(pdf_path: str, pages_path: str) -> int:
+    """Write one JSON line per page to `pages_path`; returns the page count."""
+    total = _page_count(pdf_path)
+    ranges = [(start, min(start + PAGES_PER_TASK, total)) for start in range(0, total, PAGES_PER_TASK)]
+    tmp_path = pages_path + ".part"
+    with open(tmp_path, "w", encoding="utf-8") as out:
+        if total < POOL_MIN_PAGES or MAX_WORKERS == 1:
+            batches = (_extract_pages(pdf_path, s, e) for s, e in ranges)
+        else:
+            pool = ProcessPoolExecutor(max_workers=MAX_WORKERS)
+            batches = pool.map(_extract_pages, [pdf_path] * len(ranges), *zip(*ranges))
+        try:
+            number = 0
+            for batch in batches:  # in page order
+                for text in batch:
+                    number += 1
+                    out.write(json.dumps({"page": number, "text": text}, ensure_ascii=False) + "\n")
+        finally:
+            if total >= POOL_MIN_PAGES and MAX_WORKERS > 1:
+                pool.shutdown()
+    os.replace(tmp_path, pages_path)
+    return total
+
+
+# --- chunking ---
+def iter_chunks(pages_path: str, chunk_chars: int = CHUNK_CHARS, overlap: int = CHUNK_OVERLAP):
+    """Yield {"chunk", "pages", "text"} windows over the page stream, breaking at whitespace."""
+    buffer, buffer_pages, index = "", [], 0
+    with open(pages_path, encoding="utf-8") as f:
+        for line in f:
+            page = json.loads(line)
+            text = " ".join(page["text"].split())
+            if not text:
+                continue
+            buffer = f"{buffer} {text}" if buffer else text
+            buffer_pages.append((len(buffer), page["page"]))
+            while len(buffer) >= chunk_chars:
+                cut = buffer.rfind(" ", chunk_chars - overlap, chunk_chars)
+                cut = cut if cut > 0 else chunk_chars
+                first = next((p for end, p in buffer_pages if end > 0), buffer_pages[-1][1])
+                last = next((p for end, p in buffer_pages if end >= cut), buffer_pages[-1][1])
+                yield {"chunk": index, "pages": [first, last], "text": buffer[:cut].strip()}
+                index += 1
+                keep = max(0, cut - overlap)
+                if keep and buffer[keep - 1] != " ":  # start the overlap on a word boundary too
+                    space = buffer.find(" ", keep, cut)
+                    keep = space + 1 if space >= 0 else cut
+                buffer = buffer[keep:]
+                buffer_pages = [(end - keep, p) for end, p in buffer_pages if end - keep > 0]
+    if buffer.strip():
+        first, last = buffer_pages[0][1], buffer_pages[-1][1]
+        yield {"chunk": index, "pages": [first, last], "text": buffer.strip()}
+
+
+def paper_chunks(arxiv_id: str, session) -> tuple[str, int, str]:
+    """Download + extract + chunk (each step cached). Returns (sha256, page count, chunks path)."""
+    arxiv_id = normalize_arxiv_id(arxiv_id)
+    with _lock_for(arxiv_id):
+        digest = download_pdf(arxiv_id, session)
+        root = paper_dir()
+        pdf_path = os.path.join(root, f"{digest}.pdf")
+        pages_path = os.path.join(root, f"{digest}.pages.jsonl")
+        chunks_path = os.path.join(root, f"{digest}.chunks.jsonl")
+
+        if not os.path.exists(pages_path):
+            extract_pages(pdf_path, pages_path)
+        with open(pages_path, encoding="utf-8") as f:
+            pages = sum(1 for _ in f)
+
+        if not os.path.exists(chunks_path):
+            tmp_path = chunks_path + ".part"
+            with open(tmp_path, "w", encoding="utf-8") as out:
+                for chunk in iter_chunks(pages_path):
+                    out.write(json.dumps(chunk, ensure_ascii=False) + "\n")
+            os.replace(tmp_path, chunks_path)
+    return digest, pages, chunks_path
+
+
+def read_chunks(chunks_path: str, offset: int, limit: int) -> tuple[list[dict], int]:
+    """Chunks [offset, offset + limit) and the total chunk count, reading line by line."""
+    chunks, total = [], 0
+    with open(chunks_path, encoding="utf-8") as f:
+        for number, line in enumerate(f):
+            total += 1
+            if offset <= number < offset + limit:
+                chunks.append(json.loads(line))
+    return chunks, total
@@ -0,0 +1,145 @@
+# ================================
+# Standard library imports
+# ================================
+import functools
+import inspect
+import itertools
+import os
+import zlib
+from typing import TYPE_CHECKING, Callable
+
+if TYPE_CHECKING:  # numpy is imported on the first rerank
+    import numpy as np
+
+# ================================
+# Local / project imports
+# ================================
+from research_index import _TOKEN_RE, STOPWORDS
+
+# Local reranker that trims search results before they reach the model.
+#
+# - Hashed TF-IDF: tokens are hashed into HASH_DIM columns, IDF is computed over the
+#   candidate set, rows are L2-normalized and scored against the query by one
+#   matrix-vector product (no GPU, no network).
+# - Per-tool config (RERANK_CONFIG, read on every call): keep the `top_k` best results,
+#   below the tools' default result counts so default calls are trimmed. A `max_results`
+#   the caller passed explicitly widens the cut to max(top_k, max_results), so it is never
+#   cut back. `min_score` is opt-in: add it to a tool's entry to also drop weak matches
+#   (the best result is always kept). Error/image entries are appended unchanged.
+#
+# Env:
+#   RESEARCH_RERANK=0     return tool results unchanged
+
+HASH_DIM = 1 << 12
+DEFAULT_RERANK = {"top_k": 8, "min_score": None}
+RERANK_CONFIG = {                                  # default results fetched:
+    "arxiv_search_tool": {"top_k": 3},             # 5
+    "tavily_search_tool": {"top_k": 3},            # 5
+    "wikipedia_search_tool": {"top_k": 3},         # 1
+    "multi_source_search": {"top_k": 6},           # 3 per source x 3 sources
+}
+
+
+def _text(item: dict) -> str:
+    return f"{item.get('title', '')} {item.get('summary') or item.get('content') or ''}"
+
+
+_BUCKETS: dict[str, int] = {}
+
+
+def _token_buckets(text: str) -> list[int]:
+    """Hashed column of each token (-1 for stopwords), memoized per token."""
+    tokens = _TOKEN_RE.findall(text.lower())
+    try:
+        return [_BUCKETS[t] for t in tokens]
+    except KeyError:
+        for t in tokens:
+            if t not in _BUCKETS:
+                skip = t in STOPWORDS or len(t) < 2
+                _BUCKETS[t] = -1 if skip else zlib.crc32(t.encode("utf-8")) & (HASH_DIM - 1)
+        return [_BUCKETS[t] for t in tokens]
+
+
+def _count_matrix(texts: list[str]) -> "np.ndarray":
+    import numpy as np
+
+    buckets = [_token_buckets(text) for text in texts]
+    lengths = [len(row) for row in buckets]
+    cols = np.fromiter(itertools.chain.from_iterable(buckets), dtype=np.int64, count=sum(lengths))
+    rows = np.repeat(np.arange(len(texts), dtype=np.int64), lengths)
+    keep = cols >= 0
+    flat = np.bincount(rows[keep] * HASH_DIM + cols[keep], minlength=len(texts) * HASH_DIM)
+    return flat.reshape(len(texts), HASH_DIM).astype(np.float32)
+
+
+def score_texts(query: str, texts: list[str]) -> "np.ndarray":
+    """Cosine similarity between the query and each text in hashed TF-IDF space."""
+    import numpy as np  # imported on first rerank, not with research_tools
+
+    if not texts:
+        return np.zeros(0, dtype=np.float32)
+    counts = _count_matrix(texts + [query])
+    df = np.count_nonzero(counts[:-1], axis=0)
+    idf = (np.log((1 + len(texts)) / (1 + df)) + 1.0).astype(np.float32)
+    weights = np.log1p(counts, out=counts)
+    weights *= idf
+    norms = np.linalg.norm(weights, axis=1, keepdims=True)
+    weights /= np.where(norms == 0, 1.0, norms)
+    return weights[:-1] @ weights[-1]
+
+
+def rerank(query: str, results: list, top_k: int | None = None, min_score: float | None = None) -> list:
+    """Order results by relevance to `query`, keep at most `top_k` and drop those under `min_score` (if set)."""
+    if not isinstance(results, list):
+        return results
+    docs = [r for r in results if isinstance(r, dict) and "error" not in r and (r.get("title") or r.get("url"))]
+    doc_ids = {id(d) for d in docs}
+    others = [r for r in results if id(r) not in doc_ids]
+    if len(docs) < 2:
+        return results
+
+    scores = score_texts(query, [_text(d) for d in docs])
+    order = (-scores).argsort(kind="stable")
+    if top_k is not None:
+        order = order[:top_k]
+    kept = [docs[i] for j, i in enumerate(order) if j == 0 or min_score is None or scores[i] >= min_score]
+    return kept + others
+
+
+def _requested(limit_arg: str | Callable[[dict], int] | None, arguments: dict) -> int | None:
+    if limit_arg is None:
+        return None
+    value = limit_arg(arguments) if callable(limit_arg) else arguments.get(limit_arg)
+    return value if isinstance(value, int) and value > 0 else None
+
+
+def reranked_tool(query_arg: str = "query", limit_arg: str | Callable[[dict], int] | None = "max_results") -> Callable:
+    """
+    Decorator: rerank a search tool's results with its RERANK_CONFIG entry.
+
+    When the caller passes the result count explicitly (the `limit_arg` argument, or
+    any argument besides the query for a callable `limit_arg(arguments)`), at most
+    max(top_k, that number) are kept; calls that leave it at its default keep top_k.
+    """
+    def decorator(func: Callable) -> Callable:
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            results = func(*args, **kwargs)
+            if os.getenv("RESEARCH_RERANK", "1") == "0":
+                return results
+            config = {**DEFAULT_RERANK, **RERANK_CONFIG.get(func.__name__, {})}
+            bound = signature.bind(*args, **kwargs)
+            explicit = set(bound.arguments) - {query_arg}
+            bound.apply_defaults()
+            top_k = config["top_k"]
+            widen = limit_arg in explicit if isinstance(limit_arg, str) else bool(explicit)
+            requested = _requested(limit_arg, bound.arguments) if widen else None
+            if top_k is not None and requested is not None:
+                top_k = max(top_k, requested)
+            return rerank(bound.arguments.get(query_arg, ""), results, top_k=top_k, min_score=config["min_score"])
+
+        return wrapper
+
+    return decorator
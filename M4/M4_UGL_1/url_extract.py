@@ -0,0 +1,155 @@
+# ================================
+# Standard library imports
+# ================================
+import mmap
+import os
+import re
+from typing import IO, Iterator
+
+# Fast URL extraction for large transcripts (used by utils.extract_urls and the evaluators).
+#
+# - One precompiled scanner per input type (str / bytes), with the host captured as a
+#   group, so no per-match urlparse: the host is cut out of the match, lowercased and
+#   stripped of userinfo/port/"www." (cached per distinct host string).
+# - Inputs: str, bytes, a path (scanned through mmap, zero-copy), a file-like object
+#   (read in chunks; a chunk is cut at its last URL terminator, which a URL never spans,
+#   and the tail is carried into the next chunk) or an mmap. The carry is capped at
+#   MAX_URL_CHARS, so input without terminators (base64 blobs) does not grow it.
+# - Deduplication as it goes (unique=True), so repeated links cost a set lookup.
+#
+# A URL ends at whitespace, ) ] } < > " or ' (the character set extract_urls has always used).
+
+URL_PATTERN = r"""https?://([^\s/?#\)\]\}<>"']+)[^\s\)\]\}<>"']*"""
+_URL_STR = re.compile(URL_PATTERN, re.IGNORECASE)
+_URL_BYTES = re.compile(URL_PATTERN.encode("ascii"), re.IGNORECASE)
+_NETLOC_END = re.compile(r"[/?#]")
+_SCHEME_STR = re.compile(r"https?://", re.IGNORECASE)
+_SCHEME_BYTES = re.compile(rb"https?://", re.IGNORECASE)
+_TERMINATORS = " \n\t\r)]}<>\"'"
+
+CHUNK_SIZE = 1 << 20        # 1 MiB per read for file-like inputs
+MAX_URL_CHARS = 8192        # longest URL kept by the chunked reader (streams only)
+_HOST_CACHE_SIZE = 100_000
+_hosts: dict[str, str] = {}
+
+
+def fast_hostname(netloc: str) -> str:
+    """'User@WWW.Example.com:8080' -> 'example.com', as urlparse(...).hostname without the parse."""
+    host = _hosts.get(netloc)
+    if host is not None:
+        return host
+    host = netloc.rsplit("@", 1)[-1]
+    if host.startswith("["):                        # IPv6 literal: [::1]:8080 -> ::1
+        host = host[1:].split("]", 1)[0]
+    else:
+        host = host.split(":", 1)[0]
+    host = host.lower().rstrip(".")
+    if host.startswith("www."):
+        host = host[4:]
+    if len(_hosts) >= _HOST_CACHE_SIZE:
+        _hosts.clear()
+    _hosts[netloc] = host
+    return host
+
+
+def url_hostname(url: str) -> str:
+    """Host of one URL via the fast path ("" without a scheme, like urlparse)."""
+    _, sep, rest = url.partition("://")
+    if not sep:
+        return ""
+    return fast_hostname(_NETLOC_END.split(rest, 1)[0])
+
+
+def _scan_str(text: str, seen: set | None) -> Iterator[tuple[str, str]]:
+    for match in _URL_STR.finditer(text):
+        url = match.group(0)
+        if seen is not None:
+            if url in seen:
+                continue
+            seen.add(url)
+        yield url, fast_hostname(match.group(1))
+
+
+def _scan_bytes(data, seen: set | None) -> Iterator[tuple[str, str]]:
+    for match in _URL_BYTES.finditer(data):
+        url = match.group(0).decode("utf-8", "replace")
+        if seen is not None:
+            if url in seen:
+                continue
+            seen.add(url)
+        yield url, fast_hostname(match.group(1).decode("utf-8", "replace"))
+
+
+def _last_terminator(buffer) -> int:
+    """Index just past the last character that ends a URL in `buffer` (str or bytes), or -1."""
+    chars = _TERMINATORS if isinstance(buffer, str) else [c.encode("ascii") for c in _TERMINATORS]
+    position = max(buffer.rfind(c) for c in chars)
+    return position + 1 if position >= 0 else -1
+
+
+def _bounded_carry(buffer):
+    """
+    Tail of a terminator-free `buffer` worth carrying, at most MAX_URL_CHARS long. Such a
+    buffer holds at most one URL, running to its end: keep it from its scheme on, drop it
+    once it is longer than MAX_URL_CHARS, and otherwise keep just enough for a scheme
+    split across reads.
+    """
+    match = (_SCHEME_STR if isinstance(buffer, str) else _SCHEME_BYTES).search(buffer)
+    if match is not None and len(buffer) - match.start() <= MAX_URL_CHARS:
+        return buffer[match.start():]
+    return buffer[-(len("https://") - 1):]
+
+
+def _scan_stream(stream: IO, seen: set | None, chunk_size: int) -> Iterator[tuple[str, str]]:
+    carry = None
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            break
+        buffer = carry + chunk if carry else chunk
+        cut = _last_terminator(buffer)
+        if cut < 0:  # no terminator at all yet: keep reading, with a bounded carry
+            carry = buffer if len(buffer) <= MAX_URL_CHARS else _bounded_carry(buffer)
+            continue
+        yield from (_scan_str if isinstance(buffer, str) else _scan_bytes)(buffer[:cut], seen)
+        carry = buffer[cut:]
+        if len(carry) > MAX_URL_CHARS:
+            carry = _bounded_carry(carry)
+    if carry:
+        yield from (_scan_str if isinstance(carry, str) else _scan_bytes)(carry, seen)
+
+
+def iter_urls(source, unique: bool = True, chunk_size: int = CHUNK_SIZE) -> Iterator[tuple[str, str]]:
+    """
+    Yield (url, host) for every URL in `source`: text (str), bytes, mmap, a file-like
+    object or a path (os.PathLike; use `iter_file_urls` for a path given as str).
+
+    Example:
+        for url, host in iter_urls(open("transcript.jsonl", "rb")):
+            ...
+    """
+    seen = set() if unique else None
+    if isinstance(source, str):
+        yield from _scan_str(source, seen)
+    elif isinstance(source, (bytes, bytearray, memoryview, mmap.mmap)):
+        yield from _scan_bytes(source, seen)
+    elif hasattr(source, "read"):
+        yield from _scan_stream(source, seen, chunk_size)
+    elif isinstance(source, os.PathLike):
+        yield from iter_file_urls(source, unique=unique)
+    else:
+        yield from _scan_str(str(source), seen)
+
+
+def iter_file_urls(path: str | os.PathLike, unique: bool = True) -> Iterator[tuple[str, str]]:
+    """(url, host) pairs from a file, scanned through mmap without reading it into memory."""
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            yield from _scan_bytes(data, set() if unique else None)
+
+
+def extract_url_items(source, unique: bool = True) -> list[dict]:
+    """utils.extract_urls shape ({title, url, source}) from any `iter_urls` source."""
+    return [{"title": None, "url": url, "source": host or None} for url, host in iter_urls(source, unique=unique)]
@@ -5,20 +5,20 @@ import ast
 import base64
 import json
 import re
-import urllib
-import urllib.parse
+import sys
 from typing import Any
 
 # ================================
 # Third-party imports
 # ================================
-import duckdb
-import pandas as pd
 from IPython.display import display, HTML
+# pandas is not imported here: a DataFrame/Series can only be passed in if it is already loaded
 
 # ================================
 # Personal / local imports
 # ================================
+from domain_match import compile_domains
+from url_extract import iter_urls, url_hostname
 
 
 def print_html(content: Any, title: str | None = None, is_image: bool = False):
@@ -37,13 +37,15 @@ def print_html(content: Any, title: str | None = None, is_image: bool = False):
         with open(image_path, "rb") as img_file:
             return base64.b64encode(img_file.read()).decode("utf-8")
 
+    pd = sys.modules.get("pandas")
+
     # Render content
     if is_image and isinstance(content, str):
         b64 = image_to_base64(content)
         rendered = f'<img src="data:image/png;base64,{b64}" alt="Image" style="max-width:100%; height:auto; border-radius:8px;">'
-    elif isinstance(content, pd.DataFrame):
+    elif pd is not None and isinstance(content, pd.DataFrame):
         rendered = content.to_html(classes="pretty-table", index=False, border=0, escape=False)
-    elif isinstance(content, pd.Series):
+    elif pd is not None and isinstance(content, pd.Series):
         rendered = content.to_frame().to_html(classes="pretty-table", border=0, escape=False)
     elif isinstance(content, str):
         rendered = f"<pre><code>{_escape(content)}</code></pre>"
@@ -113,12 +115,9 @@ def clean_json_block(raw: str) -> str:
 # --- utils.py (añade estas funciones) ---
 
 
-_URL_RE = re.compile(r"https?://[^\s\)\]\}<>\"']+", re.IGNORECASE)
-
 def _extract_hostname(url: str) -> str:
     try:
-        host = urllib.parse.urlparse(url).hostname or ""
-        return host[4:] if host.startswith("www.") else host
+        return url_hostname(url)
     except Exception:
         return ""
 
@@ -129,12 +128,8 @@ def extract_urls(text: str) -> list[dict[str, Any]]:
     """
     if not isinstance(text, str):
         text = str(text)
-    urls = _URL_RE.findall(text)
-    items = []
-    for u in urls:
-        host = _extract_hostname(u)
-        items.append({"title": None, "url": u, "source": host or None})
-    return items
+    # One precompiled scanner, host cut from the match (no urlparse per link); see url_extract.py
+    return [{"title": None, "url": u, "source": host or None} for u, host in iter_urls(text, unique=False)]
 
 def evaluate_anytext_against_domains(TOP_DOMAINS: set[str], payload: Any, min_ratio: float = 0.4):
     """
@@ -171,12 +166,13 @@ def evaluate_anytext_against_domains(TOP_DOMAINS: set[str], payload: Any, min_ra
     if total == 0:
         return False, {"total": 0, "approved": 0, "ratio": 0.0, "details": [], "note": "No items/links parsed"}
 
+    matcher = compile_domains(TOP_DOMAINS)
     details = []
     approved = 0
     for it in items:
         url = (it or {}).get("url")
         host = _extract_hostname(url or "")
-        ok = any(host.endswith(dom) for dom in TOP_DOMAINS) if host else False
+        ok = matcher.match(host) is not None
         if ok:
             approved += 1
         details.append({
@@ -190,29 +186,37 @@ def evaluate_anytext_against_domains(TOP_DOMAINS: set[str], payload: Any, min_ra
     ok = ratio >= min_ratio
     return ok, {"total": total, "approved": approved, "ratio": ratio, "details": details, "min_ratio": min_ratio}
 
+def looks_like_references(output: Any) -> bool:
+    """Fallback payload test of `evaluate_references`: text with links or array-looking text."""
+    return isinstance(output, str) and (("http://" in output) or ("https://" in output) or ("[" in output and "]" in output))
+
+def select_reference_payload(history: list[tuple[str, str, str]]) -> Any:
+    """The output to evaluate: the latest research_agent output, else the latest output with links."""
+    # 1) Prefer latest research_agent output
+    for step, agent, output in reversed(history):
+        if agent == "research_agent":
+            return output
+    # 2) Fallback: any output with links or array-looking text
+    for _, _, output in reversed(history):
+        if looks_like_references(output):
+            return output
+    return None
+
 def evaluate_references(history: list[tuple[str, str, str]], TOP_DOMAINS: set[str], min_ratio: float = 0.4) -> str:
     """
     Pure evaluator. Finds the most recent research_agent output (any text or JSON),
     extracts links, compares domains to TOP_DOMAINS, and returns a Markdown PASS/FAIL.
     """
-    # 1) Prefer latest research_agent output
-    payload = None
-    for step, agent, output in reversed(history):
-        if agent == "research_agent":
-            payload = output
-            break
-    # 2) Fallback: any output with links or array-looking text
-    if payload is None:
-        for _, _, output in reversed(history):
-            if isinstance(output, str) and (("http://" in output) or ("https://" in output) or ("[" in output and "]" in output)):
-                payload = output
-                break
+    payload = select_reference_payload(history)
 
     if payload is None:
         ok, report = False, {"total": 0, "approved": 0, "ratio": 0.0, "details": [], "min_ratio": min_ratio}
     else:
         ok, report = evaluate_anytext_against_domains(TOP_DOMAINS, payload, min_ratio=min_ratio)
+    return format_reference_report(ok, report, min_ratio)
 
+def format_reference_report(ok: bool, report: dict, min_ratio: float = 0.4) -> str:
+    """Markdown PASS/FAIL card for an `evaluate_anytext_against_domains` result."""
     status = "✅ PASS" if ok else "⚠️ FAIL"
     header = f"### Evaluation — Tavily Top Domains ({status})"
     summary = (f"- Total: {report['total']}\n"
@@ -256,15 +260,15 @@ def evaluate_tavily_results(TOP_DOMAINS, raw, min_ratio=0.4):
     else:
         return False, f"⚠️ Unexpected input type: {type(raw)}"
 
-    # Count trusted vs total
+    # Count trusted vs total (whole-label domain match: "arxiv.org" does not approve "notarxiv.org.evil.com")
+    matcher = compile_domains(TOP_DOMAINS)
     total = len(results)
     trusted_count = 0
     details = []
 
     for r in results:
         url = r.get("url", "")
-        domain = url.split("/")[2] if "://" in url else url
-        trusted = any(td in domain for td in TOP_DOMAINS)
+        trusted = matcher.match_url(url) is not None
         if trusted:
             trusted_count += 1
         details.append(f"- {url} → {'✅ TRUSTED' if trusted else '❌ NOT TRUSTED'}")
@@ -287,6 +291,30 @@ def evaluate_tavily_results(TOP_DOMAINS, raw, min_ratio=0.4):
     return flag, report
 
 
+def score_text_against_domains(TOP_DOMAINS, raw: str) -> dict:
+    """
+    URL counts behind `evaluate_tavily_results`, for code that needs the numbers
+    (benchmarks, dashboards) rather than the Markdown report.
+
+    Returns:
+        dict: total, trusted, ratio and details (list of (url, trusted) pairs).
+    """
+    # Extract URLs (with their hosts) from the text; see url_extract.py
+    urls = list(iter_urls(raw, unique=False))
+
+    # Count trusted vs total (whole-label domain match: "arxiv.org" does not approve "notarxiv.org.evil.com")
+    matcher = compile_domains(TOP_DOMAINS)
+    details = [(url, matcher.match(host) is not None) for url, host in urls]
+    trusted_count = sum(1 for _, trusted in details if trusted)
+    total = len(urls)
+    return {
+        "total": total,
+        "trusted": trusted_count,
+        "ratio": trusted_count / total if total > 0 else 0.0,
+        "details": details,
+    }
+
+
 def evaluate_tavily_results(TOP_DOMAINS, raw: str, min_ratio=0.4):
     """
     Evaluate whether plain-text research results mostly come from trusted domains.
@@ -301,32 +329,19 @@ def evaluate_tavily_results(TOP_DOMAINS, raw: str, min_ratio=0.4):
             flag -> True if PASS, False if FAIL
             markdown_report -> Markdown-formatted summary of the evaluation
     """
-    import re
-
-    # Extract URLs from the text
-    url_pattern = re.compile(r'https?://[^\s\]\)>\}]+', flags=re.IGNORECASE)
-    urls = url_pattern.findall(raw)
+    scores = score_text_against_domains(TOP_DOMAINS, raw)
 
-    if not urls:
+    if not scores["total"]:
         return False, """### Evaluation — Tavily Top Domains
 No URLs detected in the provided text. 
 Please include links in your research results.
 """
 
-    # Count trusted vs total
-    total = len(urls)
-    trusted_count = 0
-    details = []
-
-    for url in urls:
-        domain = url.split("/")[2]
-        trusted = any(td in domain for td in TOP_DOMAINS)
-        if trusted:
-            trusted_count += 1
-        details.append(f"- {url} → {'✅ TRUSTED' if trusted else '❌ NOT TRUSTED'}")
-
-    ratio = trusted_count / total if total > 0 else 0.0
+    total = scores["total"]
+    trusted_count = scores["trusted"]
+    ratio = scores["ratio"]
     flag = ratio >= min_ratio
+    details = [f"- {url} → {'✅ TRUSTED' if trusted else '❌ NOT TRUSTED'}" for url, trusted in scores["details"]]
 
     # Markdown report
     report = f"""
@@ -4,14 +4,15 @@
 import base64
 import json
 import re
+import sys
 from html import escape
 from typing import Any, Optional
 
 # ================================
 # Third-party imports
 # ================================
-import pandas as pd
 from IPython.display import display, HTML
+# pandas is not imported here: a DataFrame/Series can only be passed in if it is already loaded
 
 # ================================
 # Personal / local imports
@@ -37,13 +38,15 @@ def print_html(content: Any, title: str | None = None, is_image: bool = False):
         with open(image_path, "rb") as img_file:
             return base64.b64encode(img_file.read()).decode("utf-8")
 
+    pd = sys.modules.get("pandas")
+
     # Render content
     if is_image and isinstance(content, str):
         b64 = image_to_base64(content)
         rendered = f'<img src="data:image/png;base64,{b64}" alt="Image" style="max-width:100%; height:auto; border-radius:8px;">'
-    elif isinstance(content, pd.DataFrame):
+    elif pd is not None and isinstance(content, pd.DataFrame):
         rendered = content.to_html(classes="pretty-table", index=False, border=0, escape=False)
-    elif isinstance(content, pd.Series):
+    elif pd is not None and isinstance(content, pd.Series):
         rendered = content.to_frame().to_html(classes="pretty-table", border=0, escape=False)
     elif isinstance(content, str):
         rendered = f"<pre><code>{_escape(content)}</code></pre>"
@@ -0,0 +1,279 @@
+# ================================
+# Standard library imports
+# ================================
+import contextvars
+import functools
+import json
+import threading
+import time
+from typing import Any, Callable
+
+# Token, cost and latency accounting for agent runs.
+#
+# Two ways to use it:
+#   1) Explicit, for hand-written tool loops:
+#        run = RunAccounting("email_agent", max_tokens=20_000, max_seconds=60)
+#        response = run.create(client, model=..., messages=..., tools=...)
+#        result = run.call_tool("search_emails", search_emails, query="report")
+#        run.finish()
+#   2) Implicit, for code that only sees a client (e.g. aisuite's `max_turns` runner):
+#        client = MeteredClient(aisuite.Client())
+#        with RunAccounting("find_references") as run:
+#            client.chat.completions.create(...)      # recorded into `run`
+#            metered_tool(my_tool)(...)               # recorded into `run`
+#        run.summary()
+#
+# Budgets are checked before each model call and each tool call. Inside one `max_turns`
+# call the turns' tokens are only known when the whole call returns, so max_tokens
+# cannot stop it partway (max_seconds still can, at the next metered tool call). Callers
+# that loop over several model calls should catch BudgetExceeded per step and keep the
+# results gathered so far.
+
+# USD per 1M tokens (input, output). Edit to match your provider's current pricing.
+MODEL_PRICES = {
+    "openai:gpt-4.1": (2.00, 8.00),
+    "openai:gpt-4o": (2.50, 10.00),
+    "openai:gpt-4o-mini": (0.15, 0.60),
+    "openai:o4-mini": (1.10, 4.40),
+}
+
+_current_run = contextvars.ContextVar("agent_run", default=None)
+
+
+class BudgetExceeded(RuntimeError):
+    """Raised before a model or tool call when a run is over one of its budgets."""
+
+
+def current_run() -> "RunAccounting | None":
+    """Return the run opened with `with RunAccounting(...)` in this context, if any."""
+    return _current_run.get()
+
+
+def _usage_numbers(response: Any) -> tuple[int, int]:
+    usage = getattr(response, "usage", None)
+    if usage is None:
+        return 0, 0
+    if isinstance(usage, dict):
+        get = usage.get
+    else:
+        get = lambda key, default=None: getattr(usage, key, default)
+    prompt = get("prompt_tokens", None)
+    completion = get("completion_tokens", None)
+    if prompt is None:  # Anthropic-style naming
+        prompt = get("input_tokens", 0)
+    if completion is None:
+        completion = get("output_tokens", 0)
+    return int(prompt or 0), int(completion or 0)
+
+
+class RunAccounting:
+    """
+    Records model turns, tokens, wall time and tool time for one agent run and
+    enforces optional budgets (max_tokens, max_seconds, max_turns).
+    """
+
+    def __init__(
+        self,
+        name: str = "agent_run",
+        max_tokens: int | None = None,
+        max_seconds: float | None = None,
+        max_turns: int | None = None,
+        prices: dict[str, tuple[float, float]] | None = None,
+    ):
+        self.name = name
+        self.max_tokens = max_tokens
+        self.max_seconds = max_seconds
+        self.max_turns = max_turns
+        self.prices = MODEL_PRICES if prices is None else prices
+
+        self.turns: list[dict] = []
+        self.tool_calls: list[dict] = []
+        self.llm_seconds = 0.0
+        self.budget_exceeded: str | None = None
+        self.started_at = time.time()
+        self._start = time.perf_counter()
+        self._end: float | None = None
+        self._lock = threading.Lock()
+        self._token = None
+
+    # --- context manager: makes this the current run for MeteredClient / metered_tool ---
+    def __enter__(self):
+        self._token = _current_run.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        _current_run.reset(self._token)
+        self.finish()
+        return False
+
+    def finish(self) -> dict:
+        if self._end is None:
+            self._end = time.perf_counter()
+        return self.summary()
+
+    # --- totals ---
+    @property
+    def prompt_tokens(self) -> int:
+        return sum(t["prompt_tokens"] for t in self.turns)
+
+    @property
+    def completion_tokens(self) -> int:
+        return sum(t["completion_tokens"] for t in self.turns)
+
+    @property
+    def total_tokens(self) -> int:
+        return self.prompt_tokens + self.completion_tokens
+
+    @property
+    def wall_seconds(self) -> float:
+        return (self._end or time.perf_counter()) - self._start
+
+    @property
+    def tool_seconds(self) -> float:
+        return sum(c["seconds"] for c in self.tool_calls)
+
+    @property
+    def cost_usd(self) -> float | None:
+        cost, priced = 0.0, False
+        for t in self.turns:
+            price = self.prices.get(t["model"])
+            if price:
+                priced = True
+                cost += (t["prompt_tokens"] * price[0] + t["completion_tokens"] * price[1]) / 1_000_000
+        return round(cost, 6) if priced else None
+
+    # --- budgets ---
+    def check_budget(self) -> None:
+        reason = None
+        if self.max_tokens is not None and self.total_tokens >= self.max_tokens:
+            reason = f"token budget exhausted ({self.total_tokens}/{self.max_tokens})"
+        elif self.max_seconds is not None and self.wall_seconds >= self.max_seconds:
+            reason = f"time budget exhausted ({self.wall_seconds:.1f}s/{self.max_seconds}s)"
+        elif self.max_turns is not None and len(self.turns) >= self.max_turns:
+            reason = f"turn budget exhausted ({len(self.turns)}/{self.max_turns})"
+        if reason:
+            self.budget_exceeded = reason
+            raise BudgetExceeded(f"{self.name}: {reason}")
+
+    # --- recording ---
+    def record_completion(self, model: str, response: Any, seconds: float) -> None:
+        """
+        Record one `chat.completions.create` call. aisuite's `max_turns` runner
+        performs several model turns per call: the earlier ones are listed in
+        `response.intermediate_responses` (without the final response itself), so
+        every turn is counted and the call's model time is split evenly across them.
+        """
+        responses = list(getattr(response, "intermediate_responses", None) or [])
+        if not responses or responses[-1] is not response:
+            responses.append(response)
+
+        with self._lock:
+            self.llm_seconds += seconds
+            for r in responses:
+                prompt, completion = _usage_numbers(r)
+                self.turns.append({
+                    "turn": len(self.turns) + 1,
+                    "model": model,
+                    "prompt_tokens": prompt,
+                    "completion_tokens": completion,
+                    "seconds": round(seconds / len(responses), 4),
+                })
+
+    def record_tool(self, name: str, seconds: float, error: str | None = None) -> None:
+        with self._lock:
+            self.tool_calls.append({"name": name, "seconds": round(seconds, 4), "error": error})
+
+    # --- explicit wrappers ---
+    def create(self, client: Any, **kwargs) -> Any:
+        """Budget-checked, timed `client.chat.completions.create(**kwargs)`."""
+        return self.complete(client.chat.completions.create, **kwargs)
+
+    def complete(self, create: Callable, **kwargs) -> Any:
+        self.check_budget()
+        tool_seconds_before = self.tool_seconds
+        start = time.perf_counter()
+        response = create(**kwargs)
+        elapsed = time.perf_counter() - start
+        # Tools run inside aisuite's `max_turns` loop count as tool time, not model time
+        self.record_completion(kwargs.get("model", "unknown"), response, elapsed - (self.tool_seconds - tool_seconds_before))
+        return response
+
+    def call_tool(self, name: str, func: Callable, *args, **kwargs) -> Any:
+        """Budget-checked, timed tool call. Exceptions are recorded and re-raised."""
+        self.check_budget()
+        start = time.perf_counter()
+        try:
+            result = func(*args, **kwargs)
+        except Exception as e:
+            self.record_tool(name, time.perf_counter() - start, error=str(e))
+            raise
+        self.record_tool(name, time.perf_counter() - start)
+        return result
+
+    # --- reporting ---
+    def summary(self) -> dict:
+        return {
+            "run": self.name,
+            "started_at": self.started_at,
+            "turns": len(self.turns),
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "total_tokens": self.total_tokens,
+            "cost_usd": self.cost_usd,
+            "wall_seconds": round(self.wall_seconds, 4),
+            "llm_seconds": round(self.llm_seconds, 4),
+            "tool_seconds": round(self.tool_seconds, 4),
+            "tool_calls": len(self.tool_calls),
+            "tool_errors": sum(1 for c in self.tool_calls if c["error"]),
+            "budget_exceeded": self.budget_exceeded,
+        }
+
+    def to_dict(self) -> dict:
+        return {**self.summary(), "turn_details": self.turns, "tool_details": self.tool_calls}
+
+    def write_jsonl(self, path: str, details: bool = False) -> None:
+        """Append this run as one JSON line to `path`."""
+        record = self.to_dict() if details else self.summary()
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record) + "\n")
+
+
+class _MeteredCompletions:
+    def __init__(self, completions: Any):
+        self._completions = completions
+
+    def create(self, **kwargs) -> Any:
+        run = current_run()
+        if run is None:
+            return self._completions.create(**kwargs)
+        return run.complete(self._completions.create, **kwargs)
+
+
+class MeteredClient:
+    """
+    Drop-in wrapper around an aisuite/OpenAI client. `client.chat.completions.create`
+    is recorded into the current `RunAccounting` (if one is open); everything else
+    is passed through unchanged.
+    """
+
+    def __init__(self, client: Any):
+        self._client = client
+        self.chat = type("_Chat", (), {"completions": _MeteredCompletions(client.chat.completions)})()
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._client, name)
+
+
+def metered_tool(func: Callable) -> Callable:
+    """
+    Wrap a tool so its calls are timed and budget-checked in the current run.
+    Keeps name, signature and docstring, so aisuite can still build the tool schema.
+    """
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        run = current_run()
+        if run is None:
+            return func(*args, **kwargs)
+        return run.call_tool(func.__name__, func, *args, **kwargs)
+
+    return wrapper
@@ -0,0 +1,73 @@
+"""
+Turn-latency benchmark for `tools.handle_tool_calls`.
+
+Simulates one assistant turn that returns several tool calls with different
+latencies and compares running them one by one (`handle_tool_call` in a loop)
+with the concurrent dispatcher. With enough workers the concurrent turn should
+take roughly as long as the slowest single call.
+
+Usage (from this folder):
+    python bench_tool_dispatch.py --calls 4 --max-workers 4
+"""
+import argparse
+import json
+import time
+from types import SimpleNamespace
+
+import tools
+
+
+def slow_tool(delay_ms: int) -> dict:
+    time.sleep(delay_ms / 1000)
+    return {"slept_ms": delay_ms}
+
+
+def failing_tool() -> dict:
+    raise RuntimeError("simulated failure")
+
+
+def make_tool_call(i: int, name: str, arguments: dict):
+    return SimpleNamespace(
+        id=f"call_{i}",
+        function=SimpleNamespace(name=name, arguments=json.dumps(arguments)),
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=4)
+    parser.add_argument("--base-ms", type=int, default=200, help="Latency of the fastest call")
+    parser.add_argument("--step-ms", type=int, default=100, help="Extra latency per following call")
+    parser.add_argument("--max-workers", type=int, default=tools.MAX_PARALLEL_TOOL_CALLS)
+    args = parser.parse_args()
+
+    tools_map = {"slow_tool": slow_tool, "failing_tool": failing_tool}
+    delays = [args.base_ms + i * args.step_ms for i in range(args.calls)]
+    tool_calls = [make_tool_call(i, "slow_tool", {"delay_ms": d}) for i, d in enumerate(delays)]
+    tool_calls.append(make_tool_call(len(tool_calls), "failing_tool", {}))
+
+    start = time.perf_counter()
+    sequential = []
+    for tc in tool_calls:
+        try:
+            sequential.append(tools.handle_tool_call(tc, tools_map))
+        except Exception as e:
+            sequential.append({"error": str(e)})
+    sequential_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    parallel = tools.handle_tool_calls(tool_calls, tools_map, max_workers=args.max_workers)
+    parallel_s = time.perf_counter() - start
+
+    assert [r.get("slept_ms") for r in parallel[:-1]] == delays, "results must keep call order"
+    assert "error" in parallel[-1], "failure must be attributed to its own call"
+
+    print(f"tool calls:        {len(tool_calls)} (one raises)")
+    print(f"slowest call:      {max(delays)} ms")
+    print(f"sequential turn:   {sequential_s * 1000:.0f} ms")
+    print(f"concurrent turn:   {parallel_s * 1000:.0f} ms (max_workers={args.max_workers})")
+    print(f"speedup:           {sequential_s / parallel_s:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
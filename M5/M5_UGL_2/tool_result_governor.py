@@ -0,0 +1,221 @@
+# ================================
+# Standard library imports
+# ================================
+import functools
+import json
+import threading
+import uuid
+from collections import OrderedDict
+from typing import Any, Callable
+
+# Caps the size of tool results before they go back into the model context.
+#
+# - Long string fields are truncated: per-tool field limits (e.g. email "body" in listings,
+#   Tavily "content") always apply; the generic `max_field_chars` only when the result would
+#   otherwise exceed `max_chars`, so a single email or summary that fits comes back whole.
+#   The cut text keeps a handle, so the rest can be read with `fetch_tool_result_page`.
+# - Listed fields can be dropped entirely.
+# - Lists longer than `max_items` become {"items": head, "total": N, "handle": ..., "next_offset": k};
+#   the model can read the rest with the `fetch_tool_result_page` tool.
+# - As a last resort the JSON is cut to `max_chars` (with a handle to the full text).
+#
+# The handle store is shared by all tool calls (several may run in parallel) and is
+# guarded by a lock; the oldest handles are evicted past `max_handles`.
+
+DEFAULT_LIMITS = {
+    "max_chars": 6000,        # hard cap on the serialized result
+    "max_items": 10,          # list head kept inline
+    "max_field_chars": 500,   # cap for any string field, applied only if the result is over max_chars
+    "field_limits": {},       # per-field caps, e.g. {"body": 200}
+    "drop_fields": [],        # fields removed from every record
+}
+
+# Per-tool overrides of DEFAULT_LIMITS
+TOOL_LIMITS = {
+    "list_all_emails": {"max_items": 10, "field_limits": {"body": 200}},
+    "list_unread_emails": {"max_items": 10, "field_limits": {"body": 200}},
+    "search_emails": {"max_items": 10, "field_limits": {"body": 200}},
+    "filter_emails": {"max_items": 10, "field_limits": {"body": 200}},
+    "search_unread_from_sender": {"max_items": 10, "field_limits": {"body": 200}},
+    "tavily_search_tool": {"max_items": 5, "field_limits": {"content": 600}},
+    "product_catalog_tool": {"max_items": 10, "field_limits": {"description": 200}},
+}
+
+
+def _truncate_text(value: str, limit: int, handle: str | None = None) -> str:
+    if limit is None or len(value) <= limit:
+        return value
+    more = f"; fetch_tool_result_page('{handle}', offset={limit}) returns the rest" if handle else ""
+    return value[:limit] + f"… [truncated {len(value) - limit} chars{more}]"
+
+
+class ToolResultGovernor:
+    """
+    Shrinks tool results according to per-tool limits and keeps the full lists
+    and texts it cuts, so the model can page through them by handle.
+    """
+
+    def __init__(self, defaults: dict | None = None, per_tool: dict | None = None, max_handles: int = 256):
+        self.defaults = {**DEFAULT_LIMITS, **(defaults or {})}
+        self.per_tool = TOOL_LIMITS if per_tool is None else per_tool
+        self.max_handles = max_handles
+        self._pages: OrderedDict[str, tuple[str, list | str]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def limits_for(self, tool_name: str) -> dict:
+        return {**self.defaults, **self.per_tool.get(tool_name, {})}
+
+    # --- shrinking ---
+    def _shrink_value(self, value: Any, limits: dict, field: str | None = None, tool_name: str = "",
+                      handles: dict | None = None) -> Any:
+        if isinstance(value, str):
+            limit = limits["field_limits"].get(field, limits["max_field_chars"])
+            if limit is None or len(value) <= limit:
+                return value
+            handles = {} if handles is None else handles  # one handle per text within a call
+            if id(value) not in handles:
+                handles[id(value)] = self._store(tool_name, value)
+            return _truncate_text(value, limit, handles[id(value)])
+        if isinstance(value, dict):
+            return {
+                k: self._shrink_value(v, limits, k, tool_name, handles)
+                for k, v in value.items()
+                if k not in limits["drop_fields"]
+            }
+        if isinstance(value, list):
+            return [self._shrink_value(v, limits, field, tool_name, handles) for v in value]
+        return value
+
+    def _shrink_to_fit(self, value: Any, limits: dict, tool_name: str, handles: dict) -> Any:
+        """Per-field limits only; the generic max_field_chars too if that is still over max_chars."""
+        shrunk = self._shrink_value(value, {**limits, "max_field_chars": None}, tool_name=tool_name, handles=handles)
+        if len(json.dumps(shrunk, default=str)) <= limits["max_chars"]:
+            return shrunk
+        return self._shrink_value(value, limits, tool_name=tool_name, handles=handles)
+
+    def _store(self, tool_name: str, content: list | str) -> str:
+        handle = f"res_{uuid.uuid4().hex[:8]}"
+        with self._lock:
+            self._pages[handle] = (tool_name, content)
+            while len(self._pages) > self.max_handles:
+                self._pages.popitem(last=False)
+        return handle
+
+    def govern(self, tool_name: str, result: Any) -> Any:
+        """Return a size-capped version of `result` (still JSON-serializable)."""
+        limits = self.limits_for(tool_name)
+        max_items = limits["max_items"]
+
+        if isinstance(result, list) and len(result) > max_items:
+            handle = self._store(tool_name, result)
+            text_handles: dict = {}
+            head = max_items
+            while True:
+                governed = {
+                    "items": self._shrink_to_fit(result[:head], limits, tool_name, text_handles),
+                    "total": len(result),
+                    "returned": head,
+                    "handle": handle,
+                    "next_offset": head,
+                    "note": "Result truncated. Call fetch_tool_result_page(handle, offset) for more items.",
+                }
+                if head <= 1 or len(json.dumps(governed, default=str)) <= limits["max_chars"]:
+                    break
+                head //= 2
+        else:
+            governed = self._shrink_to_fit(result, limits, tool_name, {})
+
+        text = json.dumps(governed, default=str)
+        if len(text) > limits["max_chars"]:
+            cut = limits["max_chars"] - 200  # room for the marker
+            return {"truncated_json": _truncate_text(text, cut, self._store(tool_name, text))}
+        return governed
+
+    def serialize(self, tool_name: str, result: Any) -> str:
+        """`govern` + `json.dumps`, ready for a tool message's `content`."""
+        return json.dumps(self.govern(tool_name, result), default=str)
+
+    # --- paging ---
+    def page(self, handle: str, offset: int = 0, limit: int | None = None) -> dict:
+        """Items (list results) or characters (text results) of a stored result, from `offset`."""
+        with self._lock:
+            if handle not in self._pages:
+                return {"error": f"Unknown or expired handle: {handle}"}
+            self._pages.move_to_end(handle)
+            tool_name, content = self._pages[handle]
+        limits = self.limits_for(tool_name)
+        offset = max(0, offset)
+
+        if isinstance(content, str):
+            page_chars = limits["max_chars"] // 2
+            limit = page_chars if limit is None else min(max(1, limit), limits["max_chars"] - 500)
+            chunk = content[offset:offset + limit]
+            next_offset = offset + len(chunk)
+            return {
+                "text": chunk,
+                "total_chars": len(content),
+                "offset": offset,
+                "handle": handle,
+                "next_offset": next_offset if next_offset < len(content) else None,
+            }
+
+        items = content
+        limit = limits["max_items"] if limit is None else max(1, limit)
+        while True:  # fewer items per page until the page fits max_chars, like `govern`
+            chunk = items[offset:offset + limit]
+            next_offset = offset + len(chunk)
+            paged = {
+                "items": self._shrink_to_fit(chunk, limits, tool_name, {}),
+                "total": len(items),
+                "offset": offset,
+                "handle": handle,
+                "next_offset": next_offset if next_offset < len(items) else None,
+            }
+            if limit <= 1 or len(json.dumps(paged, default=str)) <= limits["max_chars"]:
+                return paged
+            limit //= 2
+
+    def governed_tool(self, func: Callable) -> Callable:
+        """Wrap a tool so its return value is governed (for aisuite's `max_turns` runner)."""
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            return self.govern(func.__name__, func(*args, **kwargs))
+
+        return wrapper
+
+
+governor = ToolResultGovernor()
+
+
+def fetch_tool_result_page(handle: str, offset: int = 0, limit: int = None) -> dict:
+    """
+    Fetch more of a tool result that was truncated (a long list or a long text).
+
+    Args:
+        handle (str): The handle returned with the truncated result or text.
+        offset (int): Index of the first item / character to return (use `next_offset`).
+        limit (int): Maximum number of items (lists) or characters (texts) to return; omit for the default page size.
+
+    Returns:
+        dict: {"items", "total", ...} for lists or {"text", "total_chars", ...} for texts,
+        with "next_offset" (None on the last page).
+    """
+    return governor.page(handle, offset, limit)
+
+
+fetch_tool_result_page_def = {
+    "type": "function",
+    "function": {
+        "name": "fetch_tool_result_page",
+        "description": "Fetch more of a truncated tool result (list items or text) using its handle.",
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "handle": {"type": "string", "description": "Handle returned with the truncated result."},
+                "offset": {"type": "integer", "description": "Index of the first item or character to return.", "default": 0},
+                "limit": {"type": "integer", "description": "Maximum number of items (lists) or characters (texts) to return."}
+            },
+            "required": ["handle"]
+        }
+    }
+}
@@ -1,11 +1,14 @@
 import requests
 import os
 import json
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 from tavily import TavilyClient
 import pandas as pd
 
 from inventory_utils import create_inventory_dataframe
+import agent_accounting
+from tool_result_governor import governor, fetch_tool_result_page, fetch_tool_result_page_def
 
 # Session setup (optional)
 session = requests.Session()
@@ -17,22 +20,27 @@ load_dotenv()
 
 # 🔧 TOOL IMPLEMENTATIONS
 
-def tavily_search_tool(query: str, max_results: int = 5, include_images: bool = False) -> list[dict[str, str]]:
-    
-    params = {}
-    api_key = os.getenv("TAVILY_API_KEY")
-    if not api_key:
-        raise ValueError("TAVILY_API_KEY not found in environment variables.")
-    params['api_key'] = api_key
+# Tavily client: config resolved and client built once, on first use, then reused
+_tavily_client = None
+
 
-    #client = TavilyClient(api_key)
+def get_tavily_client() -> TavilyClient:
+    global _tavily_client
+    if _tavily_client is None:
+        api_key = os.getenv("TAVILY_API_KEY")
+        if not api_key:
+            raise ValueError("TAVILY_API_KEY not found in environment variables.")
+        params = {"api_key": api_key}
+        api_base_url = os.getenv("DLAI_TAVILY_BASE_URL")
+        if api_base_url:
+            params["api_base_url"] = api_base_url
+        _tavily_client = TavilyClient(**params)
+    return _tavily_client
 
-    api_base_url = os.getenv("DLAI_TAVILY_BASE_URL")
-    if api_base_url:
-        params['api_base_url'] = api_base_url
 
-    # client = TavilyClient(api_key=api_key, api_base_url=api_base_url)
-    client = TavilyClient(api_key=api_key)
+def tavily_search_tool(query: str, max_results: int = 5, include_images: bool = False) -> list[dict[str, str]]:
+    
+    client = get_tavily_client()
 
     try:
         response = client.search(
@@ -96,28 +104,68 @@ def get_available_tools():
                     }
                 }
             }
-        }
+        },
+        fetch_tool_result_page_def
     ]
 
 
 # 🔁 TOOL CALL DISPATCHER
 
-def handle_tool_call(tool_call):
+TOOLS_MAP = {
+    "tavily_search_tool": tavily_search_tool,
+    "product_catalog_tool": product_catalog_tool,
+    "fetch_tool_result_page": fetch_tool_result_page,
+}
+
+MAX_PARALLEL_TOOL_CALLS = 4
+
+
+def handle_tool_call(tool_call, tools_map: dict | None = None):
     function_name = tool_call.function.name
     arguments = json.loads(tool_call.function.arguments)
 
-    tools_map = {
-        "tavily_search_tool": tavily_search_tool,
-        "product_catalog_tool": product_catalog_tool,
-    }
+    tools_map = tools_map or TOOLS_MAP
 
     return tools_map[function_name](**arguments)
 
 
+def _safe_tool_call(tool_call, tools_map: dict | None = None, run=None):
+    try:
+        if run is not None:
+            return run.call_tool(tool_call.function.name, handle_tool_call, tool_call, tools_map)
+        return handle_tool_call(tool_call, tools_map)
+    except Exception as e:
+        return {"error": f"{tool_call.function.name} failed: {e}"}
+
+
+def handle_tool_calls(tool_calls, tools_map: dict | None = None, max_workers: int = MAX_PARALLEL_TOOL_CALLS) -> list:
+    """
+    Run all tool calls from one assistant turn concurrently.
+
+    Args:
+        tool_calls: The `tool_calls` of a single assistant message.
+        tools_map (dict): Tool name -> function (defaults to TOOLS_MAP).
+        max_workers (int): Maximum number of tool calls running at once.
+
+    Returns:
+        list: One result per tool call, in the same order as `tool_calls`.
+        A failing call yields {"error": "..."} without affecting the others.
+        Calls are timed into the current agent_accounting run, if one is open.
+    """
+    tool_calls = list(tool_calls or [])
+    run = agent_accounting.current_run()  # worker threads don't inherit the context
+    if len(tool_calls) <= 1 or max_workers <= 1:
+        return [_safe_tool_call(tc, tools_map, run) for tc in tool_calls]
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(tool_calls))) as pool:
+        return list(pool.map(lambda tc: _safe_tool_call(tc, tools_map, run), tool_calls))
+
+
 def create_tool_response_message(tool_call, tool_result):
     return {
         "role": "tool",
         "tool_call_id": tool_call.id,
         "name": tool_call.function.name,
-        "content": json.dumps(tool_result)
+        # Size-capped: long fields truncated, long lists paged behind a handle
+        "content": governor.serialize(tool_call.function.name, tool_result)
     }
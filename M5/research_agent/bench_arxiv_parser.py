@@ -0,0 +1,73 @@
+"""
+Memory/time benchmark: whole-document `ET.fromstring` vs streaming `parse_arxiv_feed`.
+
+Builds a synthetic arXiv Atom feed with N entries (no network) and reports the
+peak Python memory (tracemalloc) and time of both parsers. The streaming parser
+should stay roughly flat as N grows; the old one grows with the feed size.
+
+Usage (from this folder):
+    python bench_arxiv_parser.py --entries 1000
+"""
+import argparse
+import io
+import time
+import tracemalloc
+import xml.etree.ElementTree as ET
+
+import research_tools
+
+ENTRY = """
+  <entry>
+    <id>http://arxiv.org/abs/2401.{i:05d}v1</id>
+    <published>2024-01-01T00:00:00Z</published>
+    <title>Synthetic paper number {i} on black hole thermodynamics</title>
+    <summary>{summary}</summary>
+    <author><name>Author A{i}</name></author>
+    <author><name>Author B{i}</name></author>
+    <link href="http://arxiv.org/abs/2401.{i:05d}v1" rel="alternate" type="text/html"/>
+    <link title="pdf" href="http://arxiv.org/pdf/2401.{i:05d}v1" rel="related" type="application/pdf"/>
+  </entry>"""
+
+
+def make_feed(entries: int) -> bytes:
+    summary = "Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * 20
+    body = "".join(ENTRY.format(i=i, summary=summary) for i in range(entries))
+    return (f'<?xml version="1.0" encoding="UTF-8"?>\n'
+            f'<feed xmlns="http://www.w3.org/2005/Atom">{body}\n</feed>').encode("utf-8")
+
+
+def parse_fromstring(data: bytes) -> int:
+    root = ET.fromstring(data)
+    ns = {"atom": "http://www.w3.org/2005/Atom"}
+    return sum(1 for entry in root.findall("atom:entry", ns) if research_tools._parse_arxiv_entry(entry))
+
+
+def parse_streaming(data: bytes) -> int:
+    # Entries are consumed one by one, as an agent harvesting results would
+    return sum(1 for _ in research_tools.parse_arxiv_feed(io.BytesIO(data)))
+
+
+def measure(fn, data: bytes) -> tuple[int, float, float]:
+    tracemalloc.start()
+    start = time.perf_counter()
+    count = fn(data)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return count, elapsed, peak / 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--entries", type=int, default=1000)
+    args = parser.parse_args()
+
+    data = make_feed(args.entries)
+    print(f"feed: {args.entries} entries, {len(data) / 1e6:.1f} MB")
+    for name, fn in [("ET.fromstring", parse_fromstring), ("parse_arxiv_feed", parse_streaming)]:
+        count, elapsed, peak_mb = measure(fn, data)
+        print(f"{name:18s} entries={count:6d}  time={elapsed * 1000:8.1f} ms  peak={peak_mb:7.2f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Offline benchmark of the research tools replayed from a cassette.
+
+Record once (needs network and TAVILY_API_KEY):
+    python bench_cassette_replay.py --record
+
+Then replay anywhere, without network or keys, at several simulated latencies:
+    python bench_cassette_replay.py --latency none recorded 0.05
+
+The response cache and local index are disabled, so every call goes through
+the HTTP layer and hits the cassette.
+"""
+import argparse
+import os
+import time
+
+os.environ.setdefault("RESEARCH_CACHE", "0")
+os.environ.setdefault("RESEARCH_INDEX", "0")
+os.environ.setdefault("TAVILY_API_KEY", "tvly-replay")
+
+import research_tools
+from research_cassette import use_cassette
+
+DEFAULT_QUERIES = [
+    "black hole thermodynamics",
+    "recurrent novae radio observations",
+    "retrieval augmented generation evaluation",
+]
+
+
+def run_queries(queries: list[str]) -> int:
+    return sum(len(research_tools.multi_source_search(q)) for q in queries)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cassette", default="cassettes/bench_research.json.gz")
+    parser.add_argument("--record", action="store_true", help="Call the live APIs and (re)write the cassette.")
+    parser.add_argument("--latency", nargs="+", default=["none", "recorded"])
+    parser.add_argument("--queries", nargs="+", default=DEFAULT_QUERIES)
+    args = parser.parse_args()
+
+    if args.record:
+        start = time.perf_counter()
+        with use_cassette(args.cassette, mode="record") as cassette:
+            results = run_queries(args.queries)
+        print(f"recorded {cassette.stats['recorded']} interactions ({results} results) "
+              f"in {time.perf_counter() - start:.1f} s -> {args.cassette}")
+        return
+
+    research_tools.session.rate_limit = False
+    for latency in args.latency:
+        value = None if latency == "none" else latency if latency == "recorded" else float(latency)
+        start = time.perf_counter()
+        with use_cassette(args.cassette, mode="replay", latency=value) as cassette:
+            results = run_queries(args.queries)
+        elapsed = time.perf_counter() - start
+        print(f"latency={latency:9s} queries={len(args.queries)} results={results:3d} "
+              f"played={cassette.stats['played']:3d}  {elapsed:6.2f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Benchmark and check for search-result deduplication (`research_dedup.dedupe_results`).
+
+Builds a synthetic multi-source harvest (no network): arXiv papers published as
+numbered series with near-identical titles ("... Part I", "... Part II", ...),
+the same papers again from Tavily as pdf/versioned links, and blog copies with
+the paper title but no arXiv id. Reports time per call and checks that every
+distinct paper survives and every mirror is folded into its paper.
+
+Usage (from this folder):
+    python bench_dedup.py
+    python bench_dedup.py --series 100 --parts 4 --repeat 10
+"""
+import argparse
+import random
+import time
+
+from research_dedup import dedupe_results
+
+TOPICS = ["Black Hole Thermodynamics", "Quantum Error Correcting Codes", "Protein Folding Landscapes",
+          "Graph Neural Network Expressivity", "Dark Matter Halo Profiles", "Offline Reinforcement Learning"]
+ROMAN = ["I", "II", "III", "IV", "V", "VI", "VII", "VIII"]
+
+
+def make_harvest(series: int, parts: int, rng: random.Random) -> tuple[list[dict], int]:
+    papers = []
+    for s in range(series):
+        topic = f"{rng.choice(TOPICS)} in Regime {s}"
+        for p in range(parts):
+            papers.append({"source": "arxiv", "title": f"{topic} Part {ROMAN[p]}",
+                           "url": f"https://arxiv.org/abs/2401.{len(papers):05d}"})
+    mirrors = []
+    for paper in papers:
+        if rng.random() < 0.5:
+            mirrors.append({"source": "tavily", "title": paper["title"].lower(),
+                            "url": paper["url"].replace("/abs/", "/pdf/") + "v2"})
+        if rng.random() < 0.3:
+            mirrors.append({"source": "tavily", "title": paper["title"] + ".",
+                            "url": f"https://blog.example.com/{paper['url'].rsplit('/', 1)[1]}"})
+    return papers + mirrors, len(papers)  # ranked like multi_source_search: papers first
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--series", type=int, default=115)
+    parser.add_argument("--parts", type=int, default=2, choices=range(1, len(ROMAN) + 1))
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    results, distinct = make_harvest(args.series, args.parts, random.Random(0))
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        kept = dedupe_results(results)
+    elapsed = (time.perf_counter() - start) / args.repeat
+    print(f"results={len(results):6d}  papers={distinct:6d}  kept={len(kept):6d}  {elapsed * 1000:8.2f} ms/call")
+
+    assert len(kept) == distinct, f"expected {distinct} papers, kept {len(kept)}"
+    assert [r["url"] for r in kept] == [r["url"] for r in results[:distinct]], "papers were merged or lost"
+    folded = sum(len(r.get("also_at", [])) for r in kept)
+    assert folded == len(results) - distinct, f"{len(results) - distinct - folded} mirrors not folded"
+
+
+if __name__ == "__main__":
+    main()
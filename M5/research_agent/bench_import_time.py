@@ -0,0 +1,85 @@
+"""
+Startup-time budget for helper modules, measured with `python -X importtime`.
+
+Imports each module in a fresh interpreter (several runs, median), prints the
+cumulative import time and the heaviest top-level packages it pulled in, and
+fails if the median is over budget or a dependency that should be deferred
+(requests, tavily, numpy, pandas, ...) was imported eagerly.
+
+IPython.display is imported first when available, as in a notebook kernel, so
+only what the module itself adds is counted.
+
+Usage (from this folder):
+    python bench_import_time.py                              # research_tools
+    python bench_import_time.py --path ../../M2/M2_UGL_1 utils --budget-ms 60
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+
+DEFAULT_BUDGET_MS = 50
+PRELOAD = "IPython.display"  # already loaded in every notebook kernel
+DEFERRED = ["requests", "tavily", "dotenv", "numpy", "pandas", "matplotlib", "PIL",
+            "openai", "anthropic", "duckdb", "asyncio", "httpx"]
+
+
+def import_profile(module: str, path: str, preload: str | None) -> tuple[float, dict[str, float]]:
+    """Cumulative import time of `module` (ms) and self time per top-level package it added (ms)."""
+    code = f"import {module}"
+    if preload:
+        code = f"try:\n    import {preload}\nexcept ImportError:\n    pass\n{code}"
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=path, capture_output=True, text=True,
+    )
+    if proc.returncode:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1])
+
+    # Lines are printed as imports finish; a top-level (unindented) line closes a block
+    total, block = 0.0, defaultdict(float)
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        block[name.strip().split(".")[0]] += int(self_us) / 1000
+        if not name.startswith("  "):  # "| name" for top level, "|   name" when nested
+            if name.strip() == module:
+                total = int(cumulative_us) / 1000
+                return total, block
+            block = defaultdict(float)
+    return total, block
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("modules", nargs="*", default=["research_tools"])
+    parser.add_argument("--path", default=".")
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--no-preload", action="store_true", help=f"Do not import {PRELOAD} first.")
+    args = parser.parse_args()
+
+    failed = False
+    for module in args.modules:
+        runs = [import_profile(module, args.path, None if args.no_preload else PRELOAD) for _ in range(args.runs)]
+        median = statistics.median(total for total, _ in runs)
+        packages = runs[-1][1]
+        eager = [name for name in DEFERRED if name in packages]
+
+        ok = median <= args.budget_ms and not eager
+        failed |= not ok
+        print(f"{module} ({os.path.abspath(args.path)}): median {median:.1f} ms "
+              f"over {args.runs} runs, budget {args.budget_ms:.0f} ms -> {'OK' if ok else 'FAIL'}")
+        for name, ms in sorted(packages.items(), key=lambda kv: -kv[1])[:8]:
+            print(f"    {name:24s} {ms:7.1f} ms")
+        if eager:
+            print(f"    eagerly imported (should be deferred): {', '.join(eager)}")
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
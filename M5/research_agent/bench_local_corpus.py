@@ -0,0 +1,89 @@
+"""
+Query-latency benchmark for the local BM25 corpus (`research_index`).
+
+Indexes N synthetic abstracts (no network) into a temporary SQLite file,
+in batches the size of a harvested arXiv page, then runs a set of 1-4 term
+queries and reports ingest throughput and query latency percentiles.
+
+Usage (from this folder):
+    python bench_local_corpus.py --docs 100000 --queries 200
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+
+from research_index import CorpusIndex
+
+TOPICS = ["black hole", "quantum error correction", "protein folding", "graph neural network",
+          "dark matter", "reinforcement learning", "climate model", "large language model",
+          "superconductivity", "gene expression", "transformer attention", "galaxy formation"]
+
+
+def make_vocabulary(size: int, rng: random.Random) -> list[str]:
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    return ["".join(rng.choice(letters) for _ in range(rng.randint(4, 10))) for _ in range(size)]
+
+
+def make_docs(n: int, vocab: list[str], rng: random.Random):
+    # Zipf-like word frequencies, as in real abstracts
+    weights = [1 / (rank + 1) for rank in range(len(vocab))]
+    for i in range(n):
+        topic = rng.choice(TOPICS)
+        words = rng.choices(vocab, weights=weights, k=120)
+        yield {
+            "url": f"http://arxiv.org/abs/bench.{i:07d}",
+            "source": "arxiv" if i % 3 else "tavily",
+            "title": f"On {topic} {vocab[i % len(vocab)]}",
+            "published": "2024-01-01",
+            "text": f"We study {topic}. " + " ".join(words),
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--docs", type=int, default=100_000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--batch", type=int, default=100)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    vocab = make_vocabulary(20_000, rng)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        index = CorpusIndex(os.path.join(tmp, "bench_index.sqlite"))
+
+        start = time.perf_counter()
+        batch = []
+        for doc in make_docs(args.docs, vocab, rng):
+            batch.append(doc)
+            if len(batch) == args.batch:
+                index.add_documents(batch)
+                batch = []
+        index.add_documents(batch)
+        ingest = time.perf_counter() - start
+        size_mb = os.path.getsize(index.path) / 1e6
+        print(f"indexed {args.docs} docs in {ingest:.1f} s ({args.docs / ingest:,.0f} docs/s), "
+              f"{index.stats()['terms']} terms, {size_mb:.0f} MB on disk")
+
+        queries = []
+        for _ in range(args.queries):
+            words = rng.choice(TOPICS).split() + rng.sample(vocab[:2000], rng.randint(0, 2))
+            queries.append(" ".join(words))
+
+        latencies = []
+        for q in queries:
+            start = time.perf_counter()
+            index.search(q, top_k=10)
+            latencies.append((time.perf_counter() - start) * 1000)
+
+        latencies.sort()
+        p95 = latencies[int(0.95 * (len(latencies) - 1))]
+        print(f"queries: {len(latencies)}  mean={statistics.mean(latencies):.1f} ms  "
+              f"p50={statistics.median(latencies):.1f} ms  p95={p95:.1f} ms  max={latencies[-1]:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
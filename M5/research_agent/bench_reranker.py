@@ -0,0 +1,54 @@
+"""
+Throughput benchmark for the local reranker (`research_rerank.rerank`).
+
+Builds synthetic search results (title + abstract-sized text, no network) and
+reranks them against a query at several candidate-set sizes, reporting
+documents per second and time per call.
+
+Usage (from this folder):
+    python bench_reranker.py --sizes 10 100 1000 --repeat 20
+"""
+import argparse
+import random
+import time
+
+from research_rerank import rerank, RERANK_CONFIG
+
+TOPICS = ["black hole thermodynamics", "quantum error correction", "protein folding",
+          "graph neural networks", "dark matter halos", "reinforcement learning"]
+
+
+def make_results(n: int, rng: random.Random) -> list[dict]:
+    vocab = [f"term{i}" for i in range(5000)]
+    results = []
+    for i in range(n):
+        topic = rng.choice(TOPICS)
+        words = " ".join(rng.choices(vocab, k=150))
+        results.append({
+            "title": f"Paper {i} on {topic}",
+            "url": f"https://arxiv.org/abs/bench.{i:05d}",
+            "summary": f"We study {topic}. {words}",
+        })
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    config = RERANK_CONFIG["arxiv_search_tool"]
+    for size in args.sizes:
+        results = make_results(size, rng)
+        rerank(TOPICS[0], results, **config)  # warm the token-hash cache
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            kept = rerank(TOPICS[0], results, **config)
+        elapsed = (time.perf_counter() - start) / args.repeat
+        print(f"candidates={size:6d}  kept={len(kept):3d}  {elapsed * 1000:8.2f} ms/call  {size / elapsed:12,.0f} docs/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+Microbenchmark: per-call overhead of `tavily_search_tool` before and after client reuse.
+
+"before" repeats what the tool used to do on every call: read the env vars and
+build a new TavilyClient. "after" is the module-level client from
+`research_tools.get_tavily_client()`. The network call itself is replaced by a
+no-op, so only the per-call setup cost is measured.
+
+Usage (from this folder):
+    TAVILY_API_KEY=tvly-dummy python bench_tavily_client.py --calls 2000
+"""
+import argparse
+import os
+import time
+
+from tavily import TavilyClient
+
+import research_tools
+
+
+def per_call_before() -> TavilyClient:
+    api_key = os.getenv("TAVILY_API_KEY")
+    params = {"api_key": api_key}
+    api_base_url = os.getenv("DLAI_TAVILY_BASE_URL")
+    if api_base_url:
+        params["api_base_url"] = api_base_url
+    return TavilyClient(**params)
+
+
+def per_call_after() -> TavilyClient:
+    return research_tools.get_tavily_client()
+
+
+def bench(fn, calls: int) -> float:
+    start = time.perf_counter()
+    for _ in range(calls):
+        client = fn()
+        client.search  # attribute lookup only; no request is sent
+    return (time.perf_counter() - start) / calls
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=2000)
+    args = parser.parse_args()
+
+    os.environ.setdefault("TAVILY_API_KEY", "tvly-dummy")
+
+    before = bench(per_call_before, args.calls)
+    after = bench(per_call_after, args.calls)
+
+    print(f"calls:                {args.calls}")
+    print(f"per-call setup before: {before * 1e6:9.1f} µs (env lookup + new TavilyClient)")
+    print(f"per-call setup after:  {after * 1e6:9.1f} µs (reused client)")
+    print(f"speedup:               {before / after:9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
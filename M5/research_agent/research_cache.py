@@ -0,0 +1,199 @@
+# ================================
+# Standard library imports
+# ================================
+import functools
+import hashlib
+import inspect
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Callable
+
+# Persistent SQLite cache for research tool responses (arXiv, Tavily, Wikipedia).
+#
+# - Key: tool name + normalized query + remaining call parameters.
+# - Per-source TTL; after it expires an entry is still served for another `ttl` seconds
+#   while a background thread refreshes it (stale-while-revalidate).
+# - Size cap with least-recently-used eviction.
+# - Error results are never cached.
+# - Concurrent misses on the same key share one upstream call (single-flight).
+#
+# Env:
+#   RESEARCH_CACHE_PATH   location of the SQLite file (default: .research_cache.sqlite)
+#   RESEARCH_CACHE=0      disable the cache
+
+SOURCE_TTLS = {
+    "arxiv": 7 * 24 * 3600,
+    "tavily": 24 * 3600,
+    "wikipedia": 7 * 24 * 3600,
+}
+DEFAULT_TTL = 24 * 3600
+MAX_ENTRIES = 5000
+
+
+def normalize_query(query: str) -> str:
+    return " ".join(str(query).lower().split())
+
+
+def _is_error_result(value: Any) -> bool:
+    # Also true for partial results that end with an error entry
+    return isinstance(value, list) and any(isinstance(v, dict) and "error" in v for v in value)
+
+
+class ResponseCache:
+    def __init__(self, path: str | None = None, max_entries: int = MAX_ENTRIES, ttls: dict | None = None):
+        self.path = path or os.getenv("RESEARCH_CACHE_PATH", ".research_cache.sqlite")
+        self.max_entries = max_entries
+        self.ttls = {**SOURCE_TTLS, **(ttls or {})}
+        self.enabled = os.getenv("RESEARCH_CACHE", "1") != "0"
+        self.stats = {"hits": 0, "stale_hits": 0, "misses": 0, "refreshes": 0, "evictions": 0, "coalesced": 0}
+        self._lock = threading.Lock()
+        self._refreshing: set[str] = set()
+        self._inflight: dict[str, dict] = {}
+        self._conn = None
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    source TEXT,
+                    query TEXT,
+                    value TEXT,
+                    created REAL,
+                    accessed REAL
+                )""")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_accessed ON responses(accessed)")
+        return self._conn
+
+    @staticmethod
+    def make_key(tool: str, query: str, params: dict) -> str:
+        raw = json.dumps([tool, normalize_query(query), params], sort_keys=True, default=str)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def get(self, key: str, source: str) -> tuple[Any, str]:
+        """Return (value, state) with state one of 'fresh', 'stale', 'miss'."""
+        ttl = self.ttls.get(source, DEFAULT_TTL)
+        now = time.time()
+        with self._lock:
+            row = self._db().execute("SELECT value, created FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None, "miss"
+            age = now - row[1]
+            if age > 2 * ttl:
+                return None, "miss"
+            self._db().execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+            self._db().commit()
+        return json.loads(row[0]), ("fresh" if age <= ttl else "stale")
+
+    def set(self, key: str, source: str, query: str, value: Any) -> None:
+        now = time.time()
+        with self._lock:
+            db = self._db()
+            db.execute(
+                "INSERT OR REPLACE INTO responses (key, source, query, value, created, accessed) VALUES (?, ?, ?, ?, ?, ?)",
+                (key, source, normalize_query(query), json.dumps(value, default=str), now, now),
+            )
+            count = db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+            if count > self.max_entries:
+                excess = count - self.max_entries
+                db.execute(
+                    "DELETE FROM responses WHERE key IN (SELECT key FROM responses ORDER BY accessed ASC LIMIT ?)",
+                    (excess,),
+                )
+                self.stats["evictions"] += excess
+            db.commit()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._db().execute("DELETE FROM responses")
+            self._db().commit()
+
+    def _refresh(self, key: str, source: str, query: str, fetch: Callable[[], Any]) -> None:
+        try:
+            value = fetch()
+            if not _is_error_result(value):
+                self.set(key, source, query, value)
+                self.stats["refreshes"] += 1
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    def fetch(self, tool: str, source: str, query: str, params: dict, fetch: Callable[[], Any]) -> Any:
+        if not self.enabled:
+            return fetch()
+
+        key = self.make_key(tool, query, params)
+        value, state = self.get(key, source)
+        if state == "fresh":
+            self.stats["hits"] += 1
+            return value
+        if state == "stale":
+            self.stats["stale_hits"] += 1
+            with self._lock:
+                start_refresh = key not in self._refreshing
+                self._refreshing.add(key)
+            if start_refresh:
+                threading.Thread(target=self._refresh, args=(key, source, query, fetch), daemon=True).start()
+            return value
+
+        with self._lock:
+            flight = self._inflight.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._inflight[key] = {"done": threading.Event()}
+        if not leader:
+            self.stats["coalesced"] += 1
+            flight["done"].wait()
+            if "error" in flight:
+                raise flight["error"]
+            return flight["value"]
+
+        self.stats["misses"] += 1
+        try:
+            value = flight["value"] = fetch()
+            if not _is_error_result(value):
+                self.set(key, source, query, value)
+            return value
+        except Exception as e:
+            flight["error"] = e
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            flight["done"].set()
+
+
+cache = ResponseCache()
+
+
+def cached_tool(source: str, query_arg: str = "query") -> Callable:
+    """
+    Decorator for research tools. Keeps name, signature and docstring, so aisuite
+    can still build the tool schema from the wrapped function.
+    """
+    def decorator(func: Callable) -> Callable:
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            params = dict(bound.arguments)
+            query = params.pop(query_arg, "")
+            return cache.fetch(func.__name__, source, query, params, lambda: func(*args, **kwargs))
+
+        return wrapper
+
+    return decorator
+
+
+def cache_stats() -> dict:
+    """Hit/miss counters of the shared cache since import."""
+    total = cache.stats["hits"] + cache.stats["stale_hits"] + cache.stats["misses"]
+    hit_rate = (cache.stats["hits"] + cache.stats["stale_hits"]) / total if total else 0.0
+    return {**cache.stats, "hit_rate": round(hit_rate, 3)}
@@ -0,0 +1,219 @@
+# ================================
+# Standard library imports
+# ================================
+import functools
+import random
+import re
+import zlib
+from typing import Callable
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+# Normalization stage for search results, so the same paper or page reaches the
+# model once:
+#
+# - canonical URLs as the identity of a result: arXiv abs/pdf/html links -> the paper id,
+#   scheme and host normalized (www./m./mobile. stripped), tracking params and fragments
+#   removed. They are only used as dedup keys: results keep the `url` the source returned,
+#   which is what the model cites.
+# - near-duplicate titles via MinHash + LSH (banding), confirmed by exact Jaccard. Only
+#   used when one side has no strong id (arXiv id or DOI): two records with different
+#   strong ids are never merged ("... Part I" / "... Part II" stay separate)
+# - duplicates are merged into the first (best-ranked) result, which lists where
+#   else it was found in "also_in" / "also_at"
+
+TRACKING_PARAMS = {"fbclid", "gclid", "dclid", "msclkid", "igshid", "mc_cid", "mc_eid", "ref_src", "_hsenc", "_hsmi"}
+TRACKING_PREFIXES = ("utm_",)
+HOST_PREFIXES = ("www.", "m.", "mobile.")
+
+_ARXIV_RE = re.compile(
+    r"arxiv\.org/(?:abs|pdf|html|format)/([a-z\-]+(?:\.[a-z]{2})?/\d{7}|\d{4}\.\d{4,5})(?:v\d+)?",
+    re.IGNORECASE,
+)
+_DOI_RE = re.compile(r"(?:doi\.org/|/doi/(?:abs/|full/|pdf/)?)(10\.\d{4,9}/[^?#\s]+)", re.IGNORECASE)
+
+TITLE_SIMILARITY = 0.8   # Jaccard on character shingles to call two titles duplicates
+MIN_TITLE_CHARS = 16     # shorter titles ("Introduction") are too generic to compare
+NUM_PERM = 64
+LSH_BANDS = 16           # 16 bands x 4 rows: candidates from ~0.5 similarity upwards
+SHINGLE = 4
+_MERSENNE = (1 << 61) - 1
+_rng = random.Random(1)
+_PERMS = [(_rng.randrange(1, _MERSENNE), _rng.randrange(0, _MERSENNE)) for _ in range(NUM_PERM)]
+
+
+# --- URLs ---
+def arxiv_id(url: str) -> str | None:
+    """arXiv identifier (without version) in an abs/pdf/html URL, else None."""
+    match = _ARXIV_RE.search(url or "")
+    return match.group(1).lower() if match else None
+
+
+def canonical_url(url: str) -> str:
+    url = (url or "").strip()
+    if not url:
+        return url
+    paper = arxiv_id(url)
+    if paper:
+        return f"https://arxiv.org/abs/{paper}"
+
+    parts = urlsplit(url if "://" in url else f"https://{url}")
+    host = (parts.hostname or "").lower()
+    for prefix in HOST_PREFIXES:
+        if host.startswith(prefix):
+            host = host[len(prefix):]
+    # en.m.wikipedia.org -> en.wikipedia.org
+    host = host.replace(".m.", ".", 1) if ".m." in host else host
+    if parts.port and parts.port not in (80, 443):
+        host = f"{host}:{parts.port}"
+
+    query = [
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if k.lower() not in TRACKING_PARAMS and not k.lower().startswith(TRACKING_PREFIXES)
+    ]
+    path = parts.path.rstrip("/") or ""
+    return urlunsplit(("https", host, path, urlencode(sorted(query)), ""))
+
+
+def doi(value: str) -> str | None:
+    """DOI in a doi.org or publisher /doi/ URL (or a bare "10.x/y" string), lowercased, else None."""
+    value = (value or "").strip()
+    if value.lower().startswith("10."):
+        return value.rstrip("/").lower()
+    match = _DOI_RE.search(value)
+    return match.group(1).rstrip("/").lower() if match else None
+
+
+def strong_id(item: dict) -> str | None:
+    """Paper identity of a result ("arxiv:<id>" or "doi:<doi>", from its URL or `doi` field), else None."""
+    paper = arxiv_id(item.get("url"))
+    if paper:
+        return f"arxiv:{paper}"
+    found = doi(item.get("doi") or "") or doi(item.get("url") or "")
+    return f"doi:{found}" if found else None
+
+
+def url_key(url: str) -> str:
+    """Identity of a result: "arxiv:<id>" for papers, else the canonical URL."""
+    paper = arxiv_id(url)
+    return f"arxiv:{paper}" if paper else canonical_url(url)
+
+
+# --- titles ---
+def _shingles(title: str) -> set[str]:
+    text = " ".join(re.findall(r"[a-z0-9]+", title.lower()))
+    if len(text) < MIN_TITLE_CHARS:
+        return set()
+    return {text[i:i + SHINGLE] for i in range(len(text) - SHINGLE + 1)}
+
+
+def minhash(shingles: set[str]) -> list[int]:
+    hashes = [zlib.crc32(s.encode("utf-8")) for s in shingles]
+    return [min((a * h + b) % _MERSENNE for h in hashes) for a, b in _PERMS]
+
+
+class MinHashLSH:
+    """Banded LSH over MinHash signatures; `query` returns candidate ids sharing a band."""
+
+    def __init__(self, bands: int = LSH_BANDS):
+        self.bands = bands
+        self.rows = NUM_PERM // bands
+        self._buckets: list[dict[tuple, list]] = [{} for _ in range(bands)]
+
+    def _band_keys(self, signature: list[int]):
+        for band in range(self.bands):
+            yield band, tuple(signature[band * self.rows:(band + 1) * self.rows])
+
+    def add(self, item_id, signature: list[int]) -> None:
+        for band, key in self._band_keys(signature):
+            self._buckets[band].setdefault(key, []).append(item_id)
+
+    def query(self, signature: list[int]) -> list:
+        candidates = []
+        for band, key in self._band_keys(signature):
+            for item_id in self._buckets[band].get(key, ()):
+                if item_id not in candidates:
+                    candidates.append(item_id)
+        return candidates
+
+
+def _jaccard(a: set, b: set) -> float:
+    return len(a & b) / len(a | b) if a and b else 0.0
+
+
+# --- results ---
+def _merge(kept: dict, dup: dict) -> None:
+    if dup.get("source") and dup["source"] != kept.get("source"):
+        also_in = kept.setdefault("also_in", [])
+        if dup["source"] not in also_in:
+            also_in.append(dup["source"])
+    if dup.get("url") and dup["url"] != kept.get("url"):
+        also_at = kept.setdefault("also_at", [])
+        if dup["url"] not in also_at:
+            also_at.append(dup["url"])
+
+
+def dedupe_results(results: list, title_similarity: float = TITLE_SIMILARITY) -> list:
+    """
+    Merge duplicate results (same canonical URL, arXiv id or DOI, or near-identical title).
+    Order is kept; each duplicate is folded into the first occurrence, whose `url` is
+    left as returned. Titles only match when at least one side has no strong id, so
+    papers with different arXiv ids / DOIs are kept even if their titles are near-identical.
+    Error entries pass through unchanged; image entries are only deduplicated by URL.
+    """
+    if not isinstance(results, list):
+        return results
+
+    out, by_key, titles, strong = [], {}, {}, {}
+    lsh = MinHashLSH()
+    for item in results:
+        if isinstance(item, dict) and item.get("image_url") and not item.get("url"):
+            key = url_key(item["image_url"])
+            if key not in by_key:
+                by_key[key] = len(out)
+                out.append(item)
+            continue
+        if not isinstance(item, dict) or "error" in item or not item.get("url"):
+            out.append(item)
+            continue
+
+        item = dict(item)
+        key = url_key(item["url"])
+        ident = strong_id(item)
+        shingles = _shingles(item.get("title") or "")
+        signature = minhash(shingles) if shingles else None
+
+        index = by_key.get(key)
+        if index is None and ident:
+            index = by_key.get(ident)
+        if index is None and signature:
+            scored = [(_jaccard(shingles, titles[i]), i) for i in lsh.query(signature)
+                      if not (ident and strong.get(i))]  # different papers: never by title
+            best = max(scored, default=(0.0, None), key=lambda pair: (pair[0], -pair[1]))
+            index = best[1] if best[0] >= title_similarity else None
+        if index is not None:
+            by_key.setdefault(key, index)
+            if ident:
+                by_key.setdefault(ident, index)
+                strong.setdefault(index, ident)
+            _merge(out[index], item)
+            continue
+
+        index = len(out)
+        by_key[key] = index
+        if ident:
+            by_key.setdefault(ident, index)
+            strong[index] = ident
+        if signature:
+            titles[index] = shingles
+            lsh.add(index, signature)
+        out.append(item)
+    return out
+
+
+def deduplicated_tool(func: Callable) -> Callable:
+    """Decorator: pass a search tool's result list through `dedupe_results`."""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        return dedupe_results(func(*args, **kwargs))
+
+    return wrapper
@@ -1,64 +1,156 @@
 # --- Standard library ---
 import os
+import functools
+import threading
+import urllib.parse
 import xml.etree.ElementTree as ET
 
-# --- Third-party ---
-import requests
-from dotenv import load_dotenv
-from tavily import TavilyClient
-import wikipedia
+# --- Local / project ---
+from research_cache import cached_tool, cache_stats
+from research_dedup import dedupe_results, deduplicated_tool
+from research_rerank import reranked_tool
+from research_index import corpus, indexed_tool, local_corpus_search, local_corpus_search_tool_def
+
+# Heavy dependencies (requests, tavily, dotenv, numpy, asyncio) are imported on first
+# use, and the HTTP session is built on first request, so importing this module is cheap.
+# `research_tools.session` / `research_tools.cassette` still work (module __getattr__).
+_session_lock = threading.Lock()
+_session = None
+
+
+@functools.lru_cache(maxsize=1)
+def _init_env():
+    """Load .env and install the optional record/replay cassette (see research_cassette.py), once."""
+    from dotenv import load_dotenv
+    from research_cassette import install_from_env
+
+    load_dotenv()
+    return install_from_env()
+
+
+def get_session():
+    """Shared HTTP session, rate-limited per host (arXiv: 1 request / 3 s), with a user-agent for arXiv."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                cassette = _init_env()
+                from research_http import PoliteSession
+
+                session = PoliteSession()
+                session.headers.update({
+                    "User-Agent": "LF-ADP-Agent/1.0 (mailto:your.email@example.com)"
+                })
+                if cassette and cassette.mode == "replay":
+                    session.rate_limit = False
+                _session = session
+    return _session
+
+
+def __getattr__(name: str):
+    if name == "session":
+        return get_session()
+    if name == "cassette":
+        return _init_env()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+ARXIV_API_URL = "https://export.arxiv.org/api/query"
+ARXIV_PAGE_SIZE = 100     # results per request when harvesting large max_results
+_ATOM = "{http://www.w3.org/2005/Atom}"
+
+
+def _parse_arxiv_entry(entry: ET.Element) -> dict:
+    title = entry.find(f"{_ATOM}title").text.strip()
+    authors = [author.find(f"{_ATOM}name").text for author in entry.findall(f"{_ATOM}author")]
+    published = entry.find(f"{_ATOM}published").text[:10]
+    url_abstract = entry.find(f"{_ATOM}id").text
+    summary = entry.find(f"{_ATOM}summary").text.strip()
+
+    link_pdf = None
+    for link in entry.findall(f"{_ATOM}link"):
+        if link.attrib.get('title') == 'pdf':
+            link_pdf = link.attrib.get('href')
+            break
+
+    return {
+        "title": title,
+        "authors": authors,
+        "published": published,
+        "url": url_abstract,
+        "summary": summary,
+        "link_pdf": link_pdf
+    }
 
-# Init env
-load_dotenv()  # load variables 
 
-# Set user-agent for requests to arXiv
-session = requests.Session()
-session.headers.update({
-    "User-Agent": "LF-ADP-Agent/1.0 (mailto:your.email@example.com)"
-})
+def parse_arxiv_feed(stream):
+    """
+    Incrementally parse an arXiv Atom feed from a file-like object, yielding one
+    entry dict at a time. Each parsed <entry> is dropped from the tree, so memory
+    stays flat however many entries the feed has.
+    """
+    root = None
+    for event, elem in ET.iterparse(stream, events=("start", "end")):
+        if root is None and event == "start":
+            root = elem
+        elif event == "end" and elem.tag == f"{_ATOM}entry":
+            yield _parse_arxiv_entry(elem)
+            root.clear()
 
-def arxiv_search_tool(query: str, max_results: int = 5) -> list[dict]:
+
+def iter_arxiv_entries(query: str, max_results: int = 5, start: int = 0, page_size: int = ARXIV_PAGE_SIZE):
+    """
+    Yield arXiv entries for `query` as they arrive, paging through the API with
+    `start` in requests of at most `page_size` results.
+    """
+    fetched = 0
+    while fetched < max_results:
+        batch = min(page_size, max_results - fetched)
+        params = urllib.parse.urlencode({
+            "search_query": f"all:{query}",
+            "start": start + fetched,
+            "max_results": batch,
+        })
+        with get_session().get(f"{ARXIV_API_URL}?{params}", timeout=30, stream=True) as response:
+            response.raise_for_status()
+            response.raw.decode_content = True
+            received = 0
+            for entry in parse_arxiv_feed(response.raw):
+                received += 1
+                yield entry
+        fetched += received
+        if received < batch:  # no more results
+            break
+
+
+@reranked_tool()
+@cached_tool("arxiv")
+@indexed_tool("arxiv")
+@deduplicated_tool
+def arxiv_search_tool(query: str, max_results: int = 5, start: int = 0) -> list[dict]:
     """
     Searches arXiv for research papers matching the given query.
+
+    Args:
+        query (str): Search keywords.
+        max_results (int): Maximum number of results; larger values are fetched in pages.
+        start (int): Offset of the first result (for paging).
+
+    Returns:
+        list[dict]: title, authors, published, url, summary and link_pdf per paper.
     """
-    url = f"https://export.arxiv.org/api/query?search_query=all:{query}&start=0&max_results={max_results}"
+    import requests
 
+    results = []
     try:
-        response = session.get(url, timeout=60)
-        response.raise_for_status()
+        for entry in iter_arxiv_entries(query, max_results=max_results, start=start):
+            results.append(entry)
     except requests.exceptions.RequestException as e:
-        return [{"error": str(e)}]
-
-    try:
-        root = ET.fromstring(response.content)
-        ns = {'atom': 'http://www.w3.org/2005/Atom'}
-
-        results = []
-        for entry in root.findall('atom:entry', ns):
-            title = entry.find('atom:title', ns).text.strip()
-            authors = [author.find('atom:name', ns).text for author in entry.findall('atom:author', ns)]
-            published = entry.find('atom:published', ns).text[:10]
-            url_abstract = entry.find('atom:id', ns).text
-            summary = entry.find('atom:summary', ns).text.strip()
-
-            link_pdf = None
-            for link in entry.findall('atom:link', ns):
-                if link.attrib.get('title') == 'pdf':
-                    link_pdf = link.attrib.get('href')
-                    break
-
-            results.append({
-                "title": title,
-                "authors": authors,
-                "published": published,
-                "url": url_abstract,
-                "summary": summary,
-                "link_pdf": link_pdf
-            })
-
-        return results
+        return results + [{"error": str(e)}]
     except Exception as e:
-        return [{"error": f"Parsing failed: {str(e)}"}]
+        return results + [{"error": f"Parsing failed: {str(e)}"}]
+
+    return results
 
 
 arxiv_tool_def = {
@@ -77,6 +169,11 @@ arxiv_tool_def = {
                     "type": "integer",
                     "description": "Maximum number of results to return.",
                     "default": 5
+                },
+                "start": {
+                    "type": "integer",
+                    "description": "Offset of the first result, for paging.",
+                    "default": 0
                 }
             },
             "required": ["query"]
@@ -86,6 +183,65 @@ arxiv_tool_def = {
 
 
 
+# Tavily client: config resolved and client built once, on first use, then reused
+_tavily_lock = threading.Lock()
+_tavily_client = None
+_tavily_async_client = None
+
+
+@functools.lru_cache(maxsize=1)
+def _tavily_settings() -> dict:
+    _init_env()
+    api_key = os.getenv("TAVILY_API_KEY")
+    if not api_key:
+        raise ValueError("TAVILY_API_KEY not found in environment variables.")
+    settings = {"api_key": api_key}
+    api_base_url = os.getenv("DLAI_TAVILY_BASE_URL")
+    if api_base_url:
+        settings["api_base_url"] = api_base_url
+    return settings
+
+
+def get_tavily_client() -> "TavilyClient":
+    global _tavily_client
+    if _tavily_client is None:
+        with _tavily_lock:
+            if _tavily_client is None:
+                from tavily import TavilyClient
+                _tavily_client = TavilyClient(**_tavily_settings())
+    return _tavily_client
+
+
+def get_async_tavily_client() -> "AsyncTavilyClient":
+    global _tavily_async_client
+    if _tavily_async_client is None:
+        with _tavily_lock:
+            if _tavily_async_client is None:
+                from tavily import AsyncTavilyClient
+                _tavily_async_client = AsyncTavilyClient(**_tavily_settings())
+    return _tavily_async_client
+
+
+def _format_tavily_response(response: dict, include_images: bool) -> list[dict]:
+    results = []
+    for r in response.get("results", []):
+        results.append({
+            "title": r.get("title", ""),
+            "content": r.get("content", ""),
+            "url": r.get("url", "")
+        })
+
+    if include_images:
+        for img_url in response.get("images", []):
+            results.append({"image_url": img_url})
+
+    return results
+
+
+@reranked_tool()
+@cached_tool("tavily")
+@indexed_tool("tavily")
+@deduplicated_tool
 def tavily_search_tool(query: str, max_results: int = 5, include_images: bool = False) -> list[dict]:
     """
     Perform a search using the Tavily API.
@@ -98,44 +254,45 @@ def tavily_search_tool(query: str, max_results: int = 5, include_images: bool =
     Returns:
         list[dict]: A list of dictionaries with keys like 'title', 'content', and 'url'.
     """
-    params = {}
-    api_key = os.getenv("TAVILY_API_KEY")
-    if not api_key:
-        raise ValueError("TAVILY_API_KEY not found in environment variables.")
-    params['api_key'] = api_key
+    client = get_tavily_client()
 
-    #client = TavilyClient(api_key)
+    try:
+        response = client.search(
+            query=query,
+            max_results=max_results,
+            include_images=include_images
+        )
+        return _format_tavily_response(response, include_images)
 
-    api_base_url = os.getenv("DLAI_TAVILY_BASE_URL")
-    if api_base_url:
-        params['api_base_url'] = api_base_url
+    except Exception as e:
+        return [{"error": str(e)}]  # For LLM-friendly agents
 
-    client = TavilyClient(api_key=api_key, api_base_url=api_base_url)
 
+async def tavily_search_async(query: str, max_results: int = 5, include_images: bool = False) -> list[dict]:
+    """Async variant of `tavily_search_tool` sharing one AsyncTavilyClient (and its connections)."""
+    client = get_async_tavily_client()
     try:
-        response = client.search(
+        response = await client.search(
             query=query,
             max_results=max_results,
             include_images=include_images
         )
+        results = _format_tavily_response(response, include_images)
+        corpus.add_results("tavily", results)
+        return results
+    except Exception as e:
+        return [{"error": str(e)}]
 
-        results = []
-        for r in response.get("results", []):
-            results.append({
-                "title": r.get("title", ""),
-                "content": r.get("content", ""),
-                "url": r.get("url", "")
-            })
 
-        if include_images:
-            for img_url in response.get("images", []):
-                results.append({"image_url": img_url})
+def tavily_search_batch(queries: list[str], max_results: int = 5, include_images: bool = False) -> list[list[dict]]:
+    """Run several Tavily searches concurrently; returns one result list per query, in order."""
+    import asyncio
 
-        return results
+    async def run_all():
+        return await asyncio.gather(*(tavily_search_async(q, max_results, include_images) for q in queries))
+
+    return _run_coroutine(run_all())
 
-    except Exception as e:
-        return [{"error": str(e)}]  # For LLM-friendly agents
-    
 
 tavily_tool_def = {
     "type": "function",
@@ -167,6 +324,49 @@ tavily_tool_def = {
 
 ## Wikipedia search tool
 
+WIKIPEDIA_API_URL = "https://en.wikipedia.org/w/api.php"
+
+# One MediaWiki request returns title, intro extract, URL and the disambiguation flag
+_WIKIPEDIA_PAGE_PARAMS = {
+    "action": "query",
+    "format": "json",
+    "formatversion": 2,
+    "prop": "extracts|info|pageprops",
+    "exintro": 1,
+    "explaintext": 1,
+    "exlimit": "max",
+    "inprop": "url",
+    "ppprop": "disambiguation",
+    "redirects": 1,
+}
+
+
+# TextExtracts returns at most 20 intro extracts per request (exlimit caps at 20), even
+# though the API accepts 50 titles; batches are sized so every title gets its extract.
+WIKIPEDIA_BATCH_TITLES = 20
+
+
+def _wikipedia_query(params: dict) -> dict:
+    response = get_session().get(WIKIPEDIA_API_URL, params={**_WIKIPEDIA_PAGE_PARAMS, **params}, timeout=30)
+    response.raise_for_status()
+    return response.json().get("query", {})
+
+
+def _wikipedia_result(page: dict) -> dict:
+    return {
+        "title": page.get("title", ""),
+        "summary": page.get("extract", ""),
+        "url": page.get("fullurl", "")
+    }
+
+
+def _is_article(page: dict) -> bool:
+    return not page.get("missing") and not page.get("invalid") and "disambiguation" not in page.get("pageprops", {})
+
+
+@reranked_tool()
+@cached_tool("wikipedia")
+@deduplicated_tool
 def wikipedia_search_tool(query: str, sentences: int = 5) -> list[dict]:
     """
     Searches Wikipedia for a summary of the given query.
@@ -179,18 +379,63 @@ def wikipedia_search_tool(query: str, sentences: int = 5) -> list[dict]:
         list[dict]: A list with a single dictionary containing title, summary, and URL.
     """
     try:
-        page_title = wikipedia.search(query)[0]
-        page = wikipedia.page(page_title)
-        summary = wikipedia.summary(page_title, sentences=sentences)
-
-        return [{
-            "title": page.title,
-            "summary": summary,
-            "url": page.url
-        }]
+        # Search + extracts in one round trip; disambiguation pages are skipped
+        # in favour of the next best search hit instead of a follow-up request.
+        data = _wikipedia_query({
+            "generator": "search",
+            "gsrsearch": query,
+            "gsrlimit": 5,
+            "exsentences": sentences,
+        })
+        pages = sorted(data.get("pages", []), key=lambda p: p.get("index", 0))
+        if not pages:
+            return [{"error": f"No Wikipedia results for: {query}"}]
+        page = next((p for p in pages if _is_article(p)), pages[0])
+        return [_wikipedia_result(page)]
     except Exception as e:
         return [{"error": str(e)}]
 
+
+def wikipedia_search_batch(queries: list[str], sentences: int = 5) -> list[list[dict]]:
+    """
+    Resolve many queries at once. Queries that name an article (after redirects
+    and title normalization) are answered by a single request for all of them;
+    the rest fall back to `wikipedia_search_tool`, run concurrently.
+
+    Returns:
+        list[list[dict]]: One result list per query, in order.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    results: dict[int, list[dict]] = {}
+    try:
+        for offset in range(0, len(queries), WIKIPEDIA_BATCH_TITLES):
+            chunk = queries[offset:offset + WIKIPEDIA_BATCH_TITLES]
+            data = _wikipedia_query({"titles": "|".join(chunk), "exsentences": sentences})
+
+            resolve = {}
+            for step in data.get("normalized", []) + data.get("redirects", []):
+                resolve[step["from"]] = step["to"]
+            pages_by_title = {p.get("title"): p for p in data.get("pages", [])}
+
+            for i, q in enumerate(chunk, start=offset):
+                title = q
+                for _ in range(3):  # normalized -> redirect chains are short
+                    title = resolve.get(title, title)
+                page = pages_by_title.get(title)
+                if page and _is_article(page) and "extract" in page:  # no extract: search below
+                    results[i] = [_wikipedia_result(page)]
+    except Exception:
+        pass  # every unresolved query falls back to a search below
+
+    missing = [i for i in range(len(queries)) if i not in results]
+    if missing:
+        with ThreadPoolExecutor(max_workers=min(8, len(missing))) as pool:
+            for i, res in zip(missing, pool.map(lambda i: wikipedia_search_tool(queries[i], sentences), missing)):
+                results[i] = res
+
+    return [results[i] for i in range(len(queries))]
+
 # Tool definition
 wikipedia_tool_def = {
     "type": "function",
@@ -216,10 +461,195 @@ wikipedia_tool_def = {
 }
 
 
+## Multi-source search tool
+
+# Per-source timeout in seconds; a slow backend is skipped, the others are still returned
+SOURCES = ["arxiv", "tavily", "wikipedia"]
+SOURCE_TIMEOUTS = {"arxiv": 20, "tavily": 15, "wikipedia": 10}
+
+
+def _search_source(source: str, query: str, per_source: int) -> list[dict]:
+    if source == "arxiv":
+        return arxiv_search_tool(query, max_results=per_source)
+    if source == "tavily":
+        return tavily_search_tool(query, max_results=per_source)
+    if source == "wikipedia":
+        return wikipedia_search_tool(query)
+    raise ValueError(f"Unknown source: {source}")
+
+
+async def _gather_sources(query: str, sources: list[str], per_source: int) -> dict[str, list[dict]]:
+    import asyncio
+    from concurrent.futures import ThreadPoolExecutor
+
+    loop = asyncio.get_running_loop()
+    # Own executor, not waited on at shutdown, so a hung backend can't hold the call
+    pool = ThreadPoolExecutor(max_workers=len(sources))
+
+    async def one(source: str) -> list[dict]:
+        timeout = SOURCE_TIMEOUTS.get(source, 15)
+        try:
+            return await asyncio.wait_for(
+                loop.run_in_executor(pool, _search_source, source, query, per_source), timeout
+            )
+        except asyncio.TimeoutError:
+            return [{"error": f"timed out after {timeout}s"}]
+        except Exception as e:
+            return [{"error": str(e)}]
+
+    try:
+        results = await asyncio.gather(*(one(s) for s in sources))
+    finally:
+        pool.shutdown(wait=False)
+    return dict(zip(sources, results))
+
+
+def _run_coroutine(coro):
+    import asyncio
+    from concurrent.futures import ThreadPoolExecutor
+
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    # Inside Jupyter an event loop is already running in this thread
+    with ThreadPoolExecutor(max_workers=1) as runner:
+        return runner.submit(asyncio.run, coro).result()
+
+
+@reranked_tool(limit_arg=lambda args: args["per_source"] * len(args["sources"] or SOURCES))
+def multi_source_search(query: str, sources: list[str] | None = None, per_source: int = 3) -> list[dict]:
+    """
+    Searches several backends concurrently and returns one merged, deduplicated list.
+
+    Args:
+        query (str): Search query.
+        sources (list[str]): Backends to query (default: all of SOURCES).
+        per_source (int): Maximum results requested from each backend.
+
+    Returns:
+        list[dict]: Results interleaved by rank across sources, each tagged with "source".
+        Duplicates across sources are merged into the first hit ("also_in" / "also_at").
+        Backends that fail or time out add one {"source", "error"} entry at the end.
+    """
+    sources = [s for s in (sources or SOURCES) if s in SOURCES] or SOURCES
+    by_source = _run_coroutine(_gather_sources(query, sources, per_source))
+
+    merged, errors = [], []
+    ranked = {s: [r for r in res if "error" not in r] for s, res in by_source.items()}
+    for s, res in by_source.items():
+        errors.extend({"source": s, "error": r["error"]} for r in res if "error" in r)
+
+    for rank in range(max((len(r) for r in ranked.values()), default=0)):
+        for s in sources:
+            if rank < len(ranked[s]):
+                merged.append({"source": s, **ranked[s][rank]})
+
+    # Same paper/page from several backends (or near-identical titles) -> one entry
+    return dedupe_results(merged) + errors
+
+
+multi_source_search_tool_def = {
+    "type": "function",
+    "function": {
+        "name": "multi_source_search",
+        "description": "Searches all research backends (arXiv, web, Wikipedia) at once and returns merged, source-tagged results.",
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "query": {
+                    "type": "string",
+                    "description": "Search keywords."
+                },
+                "sources": {
+                    "type": "array",
+                    "items": {"type": "string", "enum": SOURCES},
+                    "description": "Backends to query (default: all)."
+                },
+                "per_source": {
+                    "type": "integer",
+                    "description": "Maximum results per backend.",
+                    "default": 3
+                }
+            },
+            "required": ["query"]
+        }
+    }
+}
+
+
+# Full text of arXiv papers: PDF download, extraction and chunking live in research_papers.py
+def fetch_paper_text(arxiv_id: str, offset: int = 0, max_chunks: int = 5) -> dict:
+    """
+    Downloads an arXiv paper's PDF (cached by content hash) and returns its text in chunks.
+
+    Args:
+        arxiv_id (str): arXiv id or abs/pdf URL, e.g. "2401.01234" or "https://arxiv.org/abs/2401.01234v2".
+        offset (int): Index of the first chunk to return (for paging through the paper).
+        max_chunks (int): Maximum number of chunks to return.
+
+    Returns:
+        dict: arxiv_id, pages, total_chunks, chunks (chunk, pages, text) and next_offset (None at the end).
+    """
+    import requests
+    from research_papers import normalize_arxiv_id, paper_chunks, read_chunks
+
+    try:
+        arxiv_id = normalize_arxiv_id(arxiv_id)
+        _, pages, chunks_path = paper_chunks(arxiv_id, get_session())
+        chunks, total = read_chunks(chunks_path, offset, max_chunks)
+    except requests.exceptions.RequestException as e:
+        return {"arxiv_id": arxiv_id, "error": str(e)}
+    except ImportError:
+        return {"arxiv_id": arxiv_id, "error": "PDF extraction needs pypdf (pip install pypdf)"}
+    except Exception as e:
+        return {"arxiv_id": arxiv_id, "error": f"Extraction failed: {str(e)}"}
+
+    end = offset + len(chunks)
+    return {
+        "arxiv_id": arxiv_id,
+        "pages": pages,
+        "total_chunks": total,
+        "chunks": chunks,
+        "next_offset": end if end < total else None,
+    }
+
+
+fetch_paper_text_tool_def = {
+    "type": "function",
+    "function": {
+        "name": "fetch_paper_text",
+        "description": "Fetches the full text of an arXiv paper (from its PDF) in chunks. Use after arxiv_search_tool to read a paper beyond its abstract.",
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "arxiv_id": {
+                    "type": "string",
+                    "description": "arXiv id or arXiv abs/pdf URL."
+                },
+                "offset": {
+                    "type": "integer",
+                    "description": "Index of the first chunk to return (use next_offset from the previous call).",
+                    "default": 0
+                },
+                "max_chunks": {
+                    "type": "integer",
+                    "description": "Maximum number of text chunks (~2000 characters each) to return.",
+                    "default": 5
+                }
+            },
+            "required": ["arxiv_id"]
+        }
+    }
+}
+
 
 # Tool mapping
 tool_mapping = {
     "tavily_search_tool": tavily_search_tool,
     "arxiv_search_tool": arxiv_search_tool,
-    "wikipedia_search_tool": wikipedia_search_tool
+    "wikipedia_search_tool": wikipedia_search_tool,
+    "multi_source_search": multi_source_search,
+    "local_corpus_search": local_corpus_search,
+    "fetch_paper_text": fetch_paper_text
 }
\ No newline at end of file